@@ -1,79 +1,146 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
-
-app = Flask(__name__)
-CORS(app)
-
-# Import your existing RAG system
-try:
-    from scripts.query import answer_query
-    print("✅ RAG system loaded successfully!")
-except ImportError as e:
-    print(f"❌ Error importing RAG system: {e}")
-    answer_query = None
-
-@app.route('/api/chat', methods=['POST'])
-def chat():
-    try:
-        data = request.json
-        user_message = data.get('message', '').strip()
-        
-        if not user_message:
-            return jsonify({
-                'success': False,
-                'error': 'Empty message'
-            }), 400
-        
-        print(f"📨 Received message: {user_message}")
-        
-        # Use your RAG model
-        if answer_query:
-            try:
-                rag_response = answer_query(user_message)
-                print("✅ Using RAG response")
-                return jsonify({
-                    'success': True,
-                    'response': rag_response,
-                    'source': 'rag'
-                })
-            except Exception as rag_error:
-                print(f"❌ RAG error: {rag_error}")
-                return jsonify({
-                    'success': False,
-                    'error': str(rag_error),
-                    'response': 'Sorry, our legal database is currently unavailable. Please try again later.'
-                }), 500
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'RAG system not loaded',
-                'response': 'System error: Legal database not available.'
-            }), 500
-        
-    except Exception as e:
-        print(f"💥 Server error: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'response': 'Sorry, I encountered a server error. Please try again.'
-        }), 500
-
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    return jsonify({
-        'status': 'healthy', 
-        'rag_loaded': answer_query is not None,
-        'service': 'Legal Chatbot API'
-    })
-
-if __name__ == '__main__':
-    print("🚀 Starting Legal Chatbot API...")
-    print("📊 Endpoints:")
-    print("   - POST http://localhost:5000/api/chat")
-    print("   - GET  http://localhost:5000/api/health")
+from flask import Flask, request, jsonify, Response, stream_with_context
+from flask_cors import CORS
+import os
+import json
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+app = Flask(__name__)
+CORS(app)
+
+# Import your existing RAG system. Importing is cheap; the knowledge base,
+# model and Gemini client load in a background thread so the port binds
+# immediately and /api/chat is gated on readiness.
+from scripts import query as rag
+
+rag.start_warm_up()
+
+def not_ready_response():
+    """Reply for /api/chat and /api/chat/stream before warm-up has finished
+
+    A failed warm-up is retried in the background and reported as a 500;
+    while it is still loading the client gets a retryable 503.
+    """
+    status = rag.get_status()
+    if status['state'] == 'failed':
+        rag.start_warm_up()  # retry in the background
+        return jsonify({
+            'success': False,
+            'error': f"RAG system failed to load: {status['error']}",
+            'response': 'System error: Legal database not available.'
+        }), 500
+    return jsonify({
+        'success': False,
+        'error': 'RAG system is still loading',
+        'response': 'The legal assistant is starting up. Please try again in a few seconds.',
+        'status': status
+    }), 503, {'Retry-After': '5'}
+
+@app.route('/api/chat', methods=['POST'])
+def chat():
+    try:
+        data = request.json
+        user_message = data.get('message', '').strip()
+        
+        if not user_message:
+            return jsonify({
+                'success': False,
+                'error': 'Empty message'
+            }), 400
+        
+        print(f"📨 Received message: {user_message}")
+        
+        # Gate on warm-up so requests during a (re)start get a retryable 503
+        if not rag.is_ready():
+            return not_ready_response()
+        
+        # Use your RAG model
+        try:
+            rag_response = rag.answer_query(user_message)
+            print("✅ Using RAG response")
+            return jsonify({
+                'success': True,
+                'response': rag_response,
+                'source': 'rag'
+            })
+        except Exception as rag_error:
+            print(f"❌ RAG error: {rag_error}")
+            return jsonify({
+                'success': False,
+                'error': str(rag_error),
+                'response': 'Sorry, our legal database is currently unavailable. Please try again later.'
+            }), 500
+        
+    except Exception as e:
+        print(f"💥 Server error: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e),
+            'response': 'Sorry, I encountered a server error. Please try again.'
+        }), 500
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+@app.route('/api/chat/stream', methods=['GET', 'POST'])
+def chat_stream():
+    """Server-Sent Events version of /api/chat.
+
+    Emits `context` (retrieved titles) as soon as retrieval finishes, then
+    `token` events as Gemini streams, then `done` (or `error`).
+    POST {"message": ...} from fetch(), or GET ?message=... for EventSource.
+    """
+    if request.method == 'POST':
+        user_message = (request.get_json(silent=True) or {}).get('message', '').strip()
+    else:
+        user_message = request.args.get('message', '').strip()
+    
+    if not user_message:
+        return jsonify({'success': False, 'error': 'Empty message'}), 400
+    
+    if not rag.is_ready():
+        return not_ready_response()
+    
+    print(f"📨 Received streaming message: {user_message}")
+    
+    def generate():
+        try:
+            for event, payload in rag.stream_answer(user_message):
+                if event == 'token':
+                    payload = {'text': payload}
+                yield _sse(event, payload)
+        except Exception as e:
+            print(f"❌ RAG stream error: {e}")
+            yield _sse('error', {
+                'error': str(e),
+                'response': 'Sorry, our legal database is currently unavailable. Please try again later.'
+            })
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # keep reverse proxies from buffering the stream
+    })
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Readiness probe: 503 until warm-up finishes, with load progress and timings"""
+    status = rag.get_status()
+    ready = status['state'] == 'ready'
+    return jsonify({
+        'status': 'healthy' if ready else status['state'],
+        'rag_loaded': ready,
+        'rag': status,
+        'embedding_model': rag.embedder.stats() if rag.embedder else None,
+        'answer_cache': rag.answer_cache.stats() if rag.answer_cache else None,
+        'service': 'Legal Chatbot API'
+    }), 200 if ready else 503
+
+if __name__ == '__main__':
+    print("🚀 Starting Legal Chatbot API...")
+    print("📊 Endpoints:")
+    print("   - POST http://localhost:5000/api/chat")
+    print("   - POST http://localhost:5000/api/chat/stream (SSE)")
+    print("   - GET  http://localhost:5000/api/health")
     app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
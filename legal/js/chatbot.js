@@ -1,97 +1,189 @@
-document.addEventListener('DOMContentLoaded', function() {
-    const chatMessages = document.getElementById('chatMessages');
-    const userInput = document.getElementById('userInput');
-    const sendBtn = document.getElementById('sendBtn');
-    
-    // API endpoint - points to your Flask server
-    const API_URL = 'http://localhost:5000/api/chat';
-    
-    async function sendMessage() {
-        const message = userInput.value.trim();
-        if (message === '') return;
-        
-        // Add user message to chat
-        addMessage(message, 'user');
-        userInput.value = '';
-        userInput.disabled = true;
-        sendBtn.disabled = true;
-        
-        // Show typing indicator
-        showTypingIndicator();
-        
-        try {
-            const response = await fetch(API_URL, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ message: message })
-            });
-            
-            const data = await response.json();
-            removeTypingIndicator();
-            
-            if (data.success) {
-                addMessage(data.response, 'bot');
-            } else {
-                addMessage(data.response || 'Sorry, I encountered an error. Please try again.', 'bot');
-            }
-            
-        } catch (error) {
-            removeTypingIndicator();
-            addMessage('Sorry, the chatbot service is currently unavailable. Please try again later.', 'bot');
-            console.error('Chatbot error:', error);
-        } finally {
-            // Re-enable input
-            userInput.disabled = false;
-            sendBtn.disabled = false;
-            userInput.focus();
-        }
-    }
-    
-    function addMessage(text, sender) {
-        const messageDiv = document.createElement('div');
-        messageDiv.className = `message ${sender}-message`;
-        messageDiv.textContent = text;
-        chatMessages.appendChild(messageDiv);
-        chatMessages.scrollTop = chatMessages.scrollHeight;
-    }
-    
-    function showTypingIndicator() {
-        const typingDiv = document.createElement('div');
-        typingDiv.id = 'typing-indicator';
-        typingDiv.className = 'message bot-message typing-indicator';
-        typingDiv.innerHTML = `
-            <div class="typing-content">
-                <span>AI is thinking</span>
-                <div class="typing-dots">
-                    <span></span>
-                    <span></span>
-                    <span></span>
-                </div>
-            </div>
-        `;
-        chatMessages.appendChild(typingDiv);
-        chatMessages.scrollTop = chatMessages.scrollHeight;
-    }
-    
-    function removeTypingIndicator() {
-        const typingIndicator = document.getElementById('typing-indicator');
-        if (typingIndicator) {
-            typingIndicator.remove();
-        }
-    }
-    
-    // Event listeners
-    sendBtn.addEventListener('click', sendMessage);
-    
-    userInput.addEventListener('keypress', function(e) {
-        if (e.key === 'Enter' && !e.shiftKey) {
-            e.preventDefault();
-            sendMessage();
-        }
-    });
-    
-    // Initial welcome message
-    addMessage('Hello! I am your AI Legal Assistant. I can help you with legal queries, case information, IPC sections, and legal procedures. How can I assist you today?', 'bot');
+document.addEventListener('DOMContentLoaded', function() {
+    const chatMessages = document.getElementById('chatMessages');
+    const userInput = document.getElementById('userInput');
+    const sendBtn = document.getElementById('sendBtn');
+    
+    // API endpoints - point to your Flask server
+    const API_URL = 'http://localhost:5000/api/chat';
+    const STREAM_URL = 'http://localhost:5000/api/chat/stream';
+    
+    async function sendMessage() {
+        const message = userInput.value.trim();
+        if (message === '') return;
+        
+        // Add user message to chat
+        addMessage(message, 'user');
+        userInput.value = '';
+        userInput.disabled = true;
+        sendBtn.disabled = true;
+        
+        // Show typing indicator
+        showTypingIndicator();
+        
+        try {
+            const streamed = await streamMessage(message);
+            if (!streamed) {
+                await sendNonStreaming(message);
+            }
+        } catch (error) {
+            removeTypingIndicator();
+            addMessage('Sorry, the chatbot service is currently unavailable. Please try again later.', 'bot');
+            console.error('Chatbot error:', error);
+        } finally {
+            // Re-enable input
+            userInput.disabled = false;
+            sendBtn.disabled = false;
+            userInput.focus();
+        }
+    }
+    
+    async function sendNonStreaming(message) {
+        const response = await fetch(API_URL, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ message: message })
+        });
+        
+        const data = await response.json();
+        removeTypingIndicator();
+        
+        if (data.success) {
+            addMessage(data.response, 'bot');
+        } else {
+            addMessage(data.response || 'Sorry, I encountered an error. Please try again.', 'bot');
+        }
+    }
+    
+    // Stream the answer over Server-Sent Events and render tokens as they arrive.
+    // Returns false if streaming is unavailable so the caller can fall back.
+    async function streamMessage(message) {
+        if (!window.ReadableStream || !window.TextDecoder) return false;
+        
+        const response = await fetch(STREAM_URL, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify({ message: message })
+        });
+        
+        const contentType = response.headers.get('Content-Type') || '';
+        if (!contentType.includes('text/event-stream')) {
+            // Not ready / error responses come back as JSON
+            const data = await response.json();
+            removeTypingIndicator();
+            addMessage(data.response || 'Sorry, I encountered an error. Please try again.', 'bot');
+            return true;
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let botMessage = null;
+        
+        const handleEvent = (event, data) => {
+            if (event === 'context') {
+                // Show sources immediately; keep the indicator until the first token
+                if (data.titles && data.titles.length) {
+                    removeTypingIndicator();
+                    addSources(data.titles);
+                    showTypingIndicator();
+                }
+            } else if (event === 'token') {
+                if (!botMessage) {
+                    removeTypingIndicator();
+                    botMessage = addMessage('', 'bot');
+                }
+                botMessage.textContent += data.text;
+                chatMessages.scrollTop = chatMessages.scrollHeight;
+            } else if (event === 'error') {
+                removeTypingIndicator();
+                addMessage(data.response || 'Sorry, I encountered an error. Please try again.', 'bot');
+            }
+        };
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            // SSE events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                let event = 'message';
+                let dataLines = [];
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) event = line.slice(6).trim();
+                    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+                });
+                if (dataLines.length) {
+                    handleEvent(event, JSON.parse(dataLines.join('\n')));
+                }
+            }
+        }
+        
+        removeTypingIndicator();
+        return true;
+    }
+    
+    function addSources(titles) {
+        const sourcesDiv = document.createElement('div');
+        sourcesDiv.className = 'message bot-message chat-sources';
+        sourcesDiv.textContent = 'Sources: ' + titles.join('; ');
+        chatMessages.appendChild(sourcesDiv);
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+    
+    function addMessage(text, sender) {
+        const messageDiv = document.createElement('div');
+        messageDiv.className = `message ${sender}-message`;
+        messageDiv.textContent = text;
+        chatMessages.appendChild(messageDiv);
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+        return messageDiv;
+    }
+    
+    function showTypingIndicator() {
+        const typingDiv = document.createElement('div');
+        typingDiv.id = 'typing-indicator';
+        typingDiv.className = 'message bot-message typing-indicator';
+        typingDiv.innerHTML = `
+            <div class="typing-content">
+                <span>AI is thinking</span>
+                <div class="typing-dots">
+                    <span></span>
+                    <span></span>
+                    <span></span>
+                </div>
+            </div>
+        `;
+        chatMessages.appendChild(typingDiv);
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+    
+    function removeTypingIndicator() {
+        const typingIndicator = document.getElementById('typing-indicator');
+        if (typingIndicator) {
+            typingIndicator.remove();
+        }
+    }
+    
+    // Event listeners
+    sendBtn.addEventListener('click', sendMessage);
+    
+    userInput.addEventListener('keypress', function(e) {
+        if (e.key === 'Enter' && !e.shiftKey) {
+            e.preventDefault();
+            sendMessage();
+        }
+    });
+    
+    // Initial welcome message
+    addMessage('Hello! I am your AI Legal Assistant. I can help you with legal queries, case information, IPC sections, and legal procedures. How can I assist you today?', 'bot');
 });
\ No newline at end of file
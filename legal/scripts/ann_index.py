@@ -0,0 +1,152 @@
+import os
+import json
+import math
+import numpy as np
+from scripts.vector_search import normalize_rows, cosine_top_k_batch
+from scripts.quantization import RESCORE_FACTOR, rescore_top_k
+from scripts.embedding_store import write_atomic
+
+try:
+    import faiss
+except ImportError:  # faiss-cpu missing: callers fall back to brute-force NumPy
+    faiss = None
+
+INDEX_FILE = os.path.join("vector_store", "faiss_index.bin")
+# {"kb_version", "index_type", "ntotal"} of the index file next to it
+INDEX_META_SUFFIX = ".json"
+
+# Index type and recall/latency knobs (see build_index / configure_search)
+INDEX_TYPE = os.getenv("FAISS_INDEX_TYPE", "flat")  # flat | ivf | hnsw
+IVF_NLIST = int(os.getenv("FAISS_IVF_NLIST", "0"))  # 0 = pick from corpus size
+IVF_NPROBE = int(os.getenv("FAISS_IVF_NPROBE", "8"))
+HNSW_M = int(os.getenv("FAISS_HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("FAISS_HNSW_EF_CONSTRUCTION", "200"))
+HNSW_EF_SEARCH = int(os.getenv("FAISS_HNSW_EF_SEARCH", "64"))
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "sq8", "fp16")
+
+
+def faiss_available():
+    return faiss is not None
+
+
+def default_nlist(n_vectors):
+    """Rule of thumb: ~4*sqrt(n) lists, keeping >= 39 training points per list"""
+    nlist = int(4 * math.sqrt(max(n_vectors, 1)))
+    return max(1, min(nlist, n_vectors // 39 or 1))
+
+
+def build_index(embeddings, index_type=INDEX_TYPE, nlist=IVF_NLIST, hnsw_m=HNSW_M,
+                ef_construction=HNSW_EF_CONSTRUCTION):
+    """Build an inner-product FAISS index over L2-normalized embeddings
+
+    - flat: exact search, O(n) per query
+    - ivf:  inverted lists; recall/latency tuned with nprobe at search time
+    - hnsw: graph search; recall/latency tuned with efSearch at search time
+    - sq8 / fp16: exact scan over int8 (per-dimension ranges) / float16 codes,
+      top candidates rescored in float32 by index_search
+    """
+    if faiss is None:
+        raise ImportError("faiss-cpu is required to build an ANN index")
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{index_type}'. Expected one of {INDEX_TYPES}")
+
+    vectors = normalize_rows(embeddings)
+    dim = vectors.shape[1]
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(dim)
+    elif index_type == "ivf":
+        nlist = nlist or default_nlist(len(vectors))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+    elif index_type in ("sq8", "fp16"):
+        qtype = faiss.ScalarQuantizer.QT_8bit if index_type == "sq8" else faiss.ScalarQuantizer.QT_fp16
+        index = faiss.IndexScalarQuantizer(dim, qtype, faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+    else:
+        index = faiss.IndexHNSWFlat(dim, hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction
+
+    index.add(vectors)
+    return index
+
+
+def configure_search(index, nprobe=IVF_NPROBE, ef_search=HNSW_EF_SEARCH):
+    """Apply search-time recall/latency settings for IVF and HNSW indexes"""
+    if faiss is None or index is None:
+        return index
+    ivf = faiss.try_extract_index_ivf(index) if hasattr(faiss, "try_extract_index_ivf") else None
+    if ivf is not None:
+        ivf.nprobe = min(nprobe, ivf.nlist)
+    if hasattr(index, "hnsw"):
+        index.hnsw.efSearch = ef_search
+    return index
+
+
+def _mmap_flag():
+    # IO_FLAG_MMAP_IFC maps flat / scalar-quantized codes (HNSW's storage too);
+    # older faiss only has IO_FLAG_MMAP, which maps IVF lists
+    return getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+
+
+def save_index(index, path=INDEX_FILE, meta=None):
+    """Write the index and its meta file, each atomically
+
+    The meta (store fingerprint the index was built from) is replaced first,
+    so a reader that sees the new index also sees its meta; the opposite
+    pairing only makes load_index reject an index that is stale anyway.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    meta = {**(meta or {}), 'ntotal': int(index.ntotal)}
+
+    def write_meta(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    write_atomic(path + INDEX_META_SUFFIX, write_meta)
+    write_atomic(path, lambda tmp_path: faiss.write_index(index, tmp_path))
+
+
+def load_index_meta(path=INDEX_FILE):
+    try:
+        with open(path + INDEX_META_SUFFIX, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_index(path=INDEX_FILE, expected_size=None, kb_version=None):
+    """Load a FAISS index, or return None if faiss, the file, or a matching index is unavailable
+
+    kb_version is the fingerprint of the loaded store: an index built from
+    another store version is rejected even when its row count matches (rows
+    replaced in place would map ids to the wrong metadata). The codes are
+    memory-mapped, so API workers share the pages.
+    """
+    if faiss is None or not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    index = faiss.read_index(path, _mmap_flag())
+    # Read after the index: save_index replaces the meta first
+    meta = load_index_meta(path)
+    if kb_version is not None and meta.get('kb_version') != kb_version:
+        print("⚠️ FAISS index was built from another knowledge store version; ignoring it")
+        return None
+    if expected_size is not None and index.ntotal != expected_size:
+        print(f"⚠️ FAISS index has {index.ntotal} vectors, expected {expected_size}; ignoring it")
+        return None
+    return configure_search(index)
+
+
+def index_search(index, embeddings, query_vectors, k):
+    """Top-k (indices, scores) for a batch of queries, via FAISS when an index is loaded"""
+    query_vectors = normalize_rows(query_vectors)
+    if index is None:
+        return cosine_top_k_batch(embeddings, query_vectors, k)
+    if faiss is not None and isinstance(index, faiss.IndexScalarQuantizer):
+        # Quantized scores only pick candidates; rank them on the float32 vectors
+        _, candidates = index.search(query_vectors, min(RESCORE_FACTOR * k, index.ntotal))
+        return rescore_top_k(embeddings, query_vectors, candidates, k)
+    scores, idx = index.search(query_vectors, min(k, index.ntotal))
+    return idx, scores
@@ -0,0 +1,203 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from scripts.embedding_service import normalize_query_text
+from scripts.vector_search import normalize_vector
+
+ANSWER_CACHE_PATH = os.getenv("ANSWER_CACHE_PATH", os.path.join("vector_store", "answer_cache.sqlite3"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+# Max cosine distance (1 - similarity) for the semantic tier; 0 disables it.
+# Keep this tight: "IPC 302" and "IPC 304" embed very close together.
+ANSWER_CACHE_SEMANTIC_DISTANCE = float(os.getenv("ANSWER_CACHE_SEMANTIC_DISTANCE", "0.05"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    key TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    context_hash TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    embedding BLOB,
+    kb_version TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_hit_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def context_hash(context):
+    return hashlib.sha256((context or "").encode("utf-8")).hexdigest()
+
+
+def exact_key(query, context, mode):
+    raw = "\x00".join([mode, normalize_query_text(query), context_hash(context)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """Persistent two-tier LLM answer cache
+
+    - exact tier: normalized query + retrieved-context hash + mode
+    - semantic tier: nearest cached query embedding within a cosine distance
+
+    Entries expire after `ttl` seconds, the table is capped at `max_entries`
+    (least recently hit evicted first), and everything written under a
+    different `kb_version` is dropped when the knowledge base is rebuilt.
+    """
+
+    def __init__(self, path=ANSWER_CACHE_PATH, kb_version="", ttl=ANSWER_CACHE_TTL,
+                 max_entries=ANSWER_CACHE_MAX_ENTRIES, semantic_distance=ANSWER_CACHE_SEMANTIC_DISTANCE):
+        self.path = path
+        self.kb_version = kb_version
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.semantic_distance = semantic_distance
+        self._lock = threading.Lock()
+        self.metrics = {'exact_hits': 0, 'semantic_hits': 0, 'misses': 0, 'stores': 0,
+                        'evictions': 0, 'invalidations': 0}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+        self._semantic_keys = []
+        self._semantic_modes = []
+        self._semantic_matrix = None
+        self.invalidate(keep_version=kb_version)
+
+    # -- maintenance -------------------------------------------------------
+
+    def invalidate(self, keep_version=None):
+        """Drop entries from other KB versions (or everything) and expired ones"""
+        with self._lock:
+            if keep_version is None:
+                cur = self._db.execute("DELETE FROM answers")
+            else:
+                cur = self._db.execute(
+                    "DELETE FROM answers WHERE kb_version != ? OR created_at < ?",
+                    (keep_version, time.time() - self.ttl))
+            self.metrics['invalidations'] += cur.rowcount
+            self._db.commit()
+            self._reload_semantic_tier()
+
+    def _reload_semantic_tier(self):
+        rows = self._db.execute(
+            "SELECT key, mode, embedding FROM answers WHERE embedding IS NOT NULL").fetchall()
+        self._semantic_keys = [r[0] for r in rows]
+        self._semantic_modes = [r[1] for r in rows]
+        self._semantic_matrix = (np.vstack([np.frombuffer(r[2], dtype=np.float32) for r in rows])
+                                 if rows else None)
+
+    def _evict_overflow(self):
+        count = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._db.execute(
+                "DELETE FROM answers WHERE key IN "
+                "(SELECT key FROM answers ORDER BY last_hit_at ASC LIMIT ?)", (overflow,))
+            self.metrics['evictions'] += overflow
+            return True
+        return False
+
+    # -- lookups -----------------------------------------------------------
+
+    def _fetch_live(self, key):
+        row = self._db.execute(
+            "SELECT answer, created_at FROM answers WHERE key = ? AND kb_version = ?",
+            (key, self.kb_version)).fetchone()
+        if row is None:
+            return None
+        if time.time() - row[1] > self.ttl:
+            self._db.execute("DELETE FROM answers WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        self._db.execute("UPDATE answers SET hits = hits + 1, last_hit_at = ? WHERE key = ?",
+                         (time.time(), key))
+        self._db.commit()
+        return row[0]
+
+    def get_exact(self, query, context, mode):
+        with self._lock:
+            answer = self._fetch_live(exact_key(query, context, mode))
+            if answer is not None:
+                self.metrics['exact_hits'] += 1
+            return answer
+
+    def get_semantic(self, query_embedding, mode):
+        """Answer of the closest cached query in the same mode, if within semantic_distance"""
+        if self.semantic_distance <= 0 or query_embedding is None:
+            return None
+        with self._lock:
+            if self._semantic_matrix is None:
+                return None
+            scores = self._semantic_matrix @ normalize_vector(query_embedding)
+            for idx in np.argsort(-scores)[:5]:
+                if 1.0 - scores[idx] > self.semantic_distance:
+                    break
+                if self._semantic_modes[idx] != mode:
+                    continue
+                answer = self._fetch_live(self._semantic_keys[idx])
+                if answer is not None:
+                    self.metrics['semantic_hits'] += 1
+                    return answer
+            return None
+
+    def lookup(self, query, context, mode, query_embedding=None):
+        """Exact tier first, then semantic; returns (answer, tier) or (None, None)"""
+        answer = self.get_exact(query, context, mode)
+        if answer is not None:
+            return answer, 'exact'
+        answer = self.get_semantic(query_embedding, mode)
+        if answer is not None:
+            return answer, 'semantic'
+        with self._lock:
+            self.metrics['misses'] += 1
+        return None, None
+
+    def store(self, query, context, mode, answer, query_embedding=None):
+        if not answer:
+            return
+        key = exact_key(query, context, mode)
+        blob = None
+        if query_embedding is not None:
+            blob = normalize_vector(query_embedding).astype(np.float32).tobytes()
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO answers "
+                "(key, query, mode, context_hash, answer, embedding, kb_version, created_at, last_hit_at, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, normalize_query_text(query), mode, context_hash(context), answer, blob,
+                 self.kb_version, now, now))
+            evicted = self._evict_overflow()
+            self._db.commit()
+            self.metrics['stores'] += 1
+            if evicted:
+                self._reload_semantic_tier()
+            elif blob is not None and key not in self._semantic_keys:
+                vector = np.frombuffer(blob, dtype=np.float32).reshape(1, -1)
+                self._semantic_matrix = (vector if self._semantic_matrix is None
+                                         else np.vstack([self._semantic_matrix, vector]))
+                self._semantic_keys.append(key)
+                self._semantic_modes.append(mode)
+
+    def stats(self):
+        with self._lock:
+            size = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            metrics = dict(self.metrics)
+        lookups = metrics['exact_hits'] + metrics['semantic_hits'] + metrics['misses']
+        hits = metrics['exact_hits'] + metrics['semantic_hits']
+        return {
+            **metrics,
+            'size': size,
+            'max_entries': self.max_entries,
+            'kb_version': self.kb_version,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,138 @@
+import os
+import re
+import json
+import numpy as np
+
+BM25_DIR = os.path.join("vector_store", "bm25")
+BM25_K1 = 1.5
+BM25_B = 0.75
+TITLE_WEIGHT = 2  # title tokens are counted this many times
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from how i if in is it me my of on or
+the to was what when where which who why will with you your under about
+""".split())
+
+
+def tokenize(text):
+    """Lowercased alphanumeric tokens without stopwords; numbers (e.g. 438) are kept"""
+    return [t for t in TOKEN_PATTERN.findall(str(text).lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """In-process BM25 inverted index stored as CSR postings
+
+    Term weights idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avglen))
+    are precomputed per posting at build time, so scoring a query is one
+    scatter-add per query term over that term's postings.
+    """
+
+    def __init__(self, vocab, offsets, doc_ids, weights, idf, n_docs, meta=None):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.idf = idf
+        self.n_docs = n_docs
+        self.meta = meta or {}
+
+    @classmethod
+    def build(cls, documents, k1=BM25_K1, b=BM25_B, meta=None):
+        """Index an iterable of document strings"""
+        postings = {}
+        doc_lens = []
+        for doc_id, text in enumerate(documents):
+            counts = {}
+            tokens = tokenize(text)
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                postings.setdefault(token, []).append((doc_id, tf))
+            doc_lens.append(len(tokens))
+
+        n_docs = len(doc_lens)
+        doc_lens = np.asarray(doc_lens, dtype=np.float32)
+        avg_len = float(doc_lens.mean()) if n_docs else 0.0
+
+        vocab = {}
+        offsets = [0]
+        doc_ids, weights, idf = [], [], []
+        for term_id, (term, plist) in enumerate(sorted(postings.items())):
+            vocab[term] = term_id
+            docs = np.fromiter((d for d, _ in plist), dtype=np.int32, count=len(plist))
+            tf = np.fromiter((t for _, t in plist), dtype=np.float32, count=len(plist))
+            term_idf = np.log1p((n_docs - len(plist) + 0.5) / (len(plist) + 0.5))
+            norm = k1 * (1 - b + b * doc_lens[docs] / (avg_len or 1.0))
+            doc_ids.append(docs)
+            weights.append((term_idf * tf * (k1 + 1) / (tf + norm)).astype(np.float32))
+            idf.append(term_idf)
+            offsets.append(offsets[-1] + len(plist))
+
+        return cls(
+            vocab,
+            np.asarray(offsets, dtype=np.int64),
+            np.concatenate(doc_ids) if doc_ids else np.empty(0, dtype=np.int32),
+            np.concatenate(weights) if weights else np.empty(0, dtype=np.float32),
+            np.asarray(idf, dtype=np.float32),
+            n_docs,
+            meta={**(meta or {}), 'k1': k1, 'b': b, 'n_docs': n_docs},
+        )
+
+    @classmethod
+    def from_titles_and_contents(cls, titles, contents, meta=None):
+        documents = ((f"{title} " * TITLE_WEIGHT) + str(content) for title, content in zip(titles, contents))
+        return cls.build(documents, meta=meta)
+
+    def save(self, path=BM25_DIR):
+        os.makedirs(path, exist_ok=True)
+        for name in ("offsets", "doc_ids", "weights", "idf"):
+            with open(os.path.join(path, f"{name}.npy"), "wb") as f:
+                np.save(f, getattr(self, name))
+        with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump({'vocab': self.vocab, 'meta': self.meta}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path=BM25_DIR):
+        """Load a saved index (postings memory-mapped), or None if missing"""
+        vocab_file = os.path.join(path, "vocab.json")
+        if not os.path.exists(vocab_file):
+            return None
+        with open(vocab_file, encoding="utf-8") as f:
+            data = json.load(f)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                  for name in ("offsets", "doc_ids", "weights", "idf")}
+        return cls(data['vocab'], n_docs=data['meta']['n_docs'], meta=data['meta'], **arrays)
+
+    def _postings(self, term_id):
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.doc_ids[start:end], self.weights[start:end]
+
+    def score(self, query):
+        """Dense BM25 score vector over all documents plus the known query term ids"""
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        term_ids = sorted({self.vocab[t] for t in tokenize(query) if t in self.vocab})
+        for term_id in term_ids:
+            docs, weights = self._postings(term_id)
+            scores[docs] += weights  # doc ids are unique within a posting list
+        return scores, term_ids
+
+    def coverage(self, query, doc_id):
+        """Share of the query's idf mass whose terms appear in doc_id (unknown terms count as missing)"""
+        tokens = set(tokenize(query))
+        if not tokens:
+            return 0.0
+        total = matched = 0.0
+        for token in tokens:
+            term_id = self.vocab.get(token)
+            if term_id is None:
+                # Unseen terms are maximally rare
+                total += float(np.log1p(self.n_docs + 0.5))
+                continue
+            term_idf = float(self.idf[term_id])
+            total += term_idf
+            docs, _ = self._postings(term_id)
+            pos = np.searchsorted(docs, doc_id)
+            if pos < len(docs) and docs[pos] == doc_id:
+                matched += term_idf
+        return matched / total if total else 0.0
@@ -1,47 +1,205 @@
-import os
-import pandas as pd
-import numpy as np
-from tqdm import tqdm
-from sentence_transformers import SentenceTransformer
-import pickle
-
-# Paths
-DATA_FILE = os.path.join("combined_knowledge.csv")
-EMB_FILE = os.path.join("embeddings.pkl")
-
-def build():
-    print(f"[INFO] Loading {DATA_FILE}")
-    df = pd.read_csv(DATA_FILE)
-
-    # Auto-detect text column
-    candidate_cols = ["chunk", "content", "text", "body"]
-    text_column = None
-    for col in candidate_cols:
-        if col in df.columns:
-            text_column = col
-            break
-
-    if text_column is None:
-        raise ValueError(
-            f"CSV must have one of these columns: {candidate_cols}. Found {list(df.columns)}"
-        )
-
-    texts = df[text_column].astype(str).tolist()
-    print(f"[INFO] Using '{text_column}' column as text source")
-    print(f"[INFO] Creating embeddings for {len(texts)} entries...")
-
-    # Load SentenceTransformer model
-    model = SentenceTransformer("all-MiniLM-L6-v2")  # 384-dim, ~90MB
-
-    # Generate embeddings
-    embeddings = model.encode(texts, convert_to_numpy=True, show_progress_bar=True)
-
-    # Save embeddings + dataframe
-    with open(EMB_FILE, "wb") as f:
-        pickle.dump((df, embeddings), f)
-
-    print(f"[INFO] Saved embeddings to {EMB_FILE}")
-
-
-if __name__ == "__main__":
-    build()
+import os
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import pandas as pd
+from scripts.embedding_service import EMBEDDING_BACKEND, get_embedding_service
+from scripts.embedding_store import (
+    KNOWLEDGE_STORE_DIR, StoreWriter, load_store, store_lock, store_fingerprint, hash_offsets, incremental_vectors,
+)
+from scripts.preprocess import CHUNK_ROWS, iter_knowledge_chunks, source_files, tee_csv
+from scripts.bm25_index import BM25_DIR, BM25Index
+from scripts.ann_index import INDEX_FILE, INDEX_TYPE, INDEX_TYPES, build_index, save_index, faiss_available, index_search
+from scripts.quantization import QUANTIZED_DTYPES, QuantizedMatrix, recall_report
+
+# Paths
+DATA_FILE = os.path.join("combined_knowledge.csv")
+STORE_DIR = KNOWLEDGE_STORE_DIR
+
+# Rows per encode batch / checkpoint, and encoder processes (1 = in-process)
+BUILD_BATCH_ROWS = int(os.getenv("BUILD_BATCH_ROWS", "1024"))
+BUILD_WORKERS = int(os.getenv("BUILD_WORKERS", "1"))
+
+TEXT_COLUMNS = ["chunk", "content", "text", "body"]
+
+def detect_text_column(columns):
+    """First of TEXT_COLUMNS present in `columns`"""
+    for col in TEXT_COLUMNS:
+        if col in columns:
+            return col
+    raise ValueError(
+        f"CSV must have one of these columns: {TEXT_COLUMNS}. Found {list(columns)}"
+    )
+
+def load_knowledge(path=DATA_FILE):
+    """Knowledge CSV (all fields as text) plus the name of its text column"""
+    df = pd.read_csv(path, dtype=str, na_filter=False)
+    return df, detect_text_column(df.columns)
+
+def _file_signature(paths):
+    """Changes whenever a source file is rewritten; used to decide if a checkpoint can resume"""
+    return [[os.path.basename(p), os.path.getsize(p), os.stat(p).st_mtime_ns] for p in paths]
+
+def iter_batches(chunks, batch_rows, skip=0):
+    """Re-chunk a stream of DataFrames into fixed-size batches, skipping the first `skip` rows"""
+    pending, pending_rows = [], 0
+    for chunk in chunks:
+        if skip:
+            dropped = min(skip, len(chunk))
+            chunk, skip = chunk.iloc[dropped:], skip - dropped
+        if not len(chunk):
+            continue
+        pending.append(chunk)
+        pending_rows += len(chunk)
+        while pending_rows >= batch_rows:
+            rows = pd.concat(pending, ignore_index=True)
+            yield rows.iloc[:batch_rows]
+            pending = [rows.iloc[batch_rows:]]
+            pending_rows -= batch_rows
+    if pending_rows:
+        yield pd.concat(pending, ignore_index=True)
+
+def _ordered_map(fn, items, executor, max_pending):
+    """executor.map that keeps at most `max_pending` items in flight (bounded memory)"""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _init_encode_worker(threads):
+    # One model per process; split the cores instead of oversubscribing them
+    if EMBEDDING_BACKEND == "torch":
+        import torch
+        torch.set_num_threads(threads)
+    else:
+        os.environ["ONNX_THREADS"] = str(threads)
+
+def _encode_texts(texts):
+    return get_embedding_service().encode(texts)
+
+def build(index_type=INDEX_TYPE, full=False, from_sources=False, batch_rows=BUILD_BATCH_ROWS,
+          workers=BUILD_WORKERS):
+    """Stream rows -> encode in batches -> append to the store, resuming from the last checkpoint
+
+    from_sources=True reads data/*.csv through preprocess.py (also rewriting
+    combined_knowledge.csv); otherwise combined_knowledge.csv is read in chunks.
+    Rows whose content hash is already in the current store are not re-encoded.
+    """
+    # One builder at a time: the store files and <store>/.partial checkpoint are shared
+    with store_lock(STORE_DIR):
+        if from_sources:
+            paths, columns, text_column = source_files(), ["type", "title", "content"], "content"
+        else:
+            paths = [DATA_FILE]
+            columns = list(pd.read_csv(DATA_FILE, nrows=0).columns)
+            text_column = detect_text_column(columns)
+        print(f"[INFO] Streaming {', '.join(paths)} using '{text_column}' as text source")
+
+        writer = StoreWriter(STORE_DIR, columns, signature={'sources': _file_signature(paths), 'full': full})
+        if writer.rows:
+            print(f"[INFO] Resuming from checkpoint: {writer.rows} rows already embedded")
+
+        # Only new or edited rows are encoded; unchanged rows reuse their stored vectors
+        previous = None if full else load_store(STORE_DIR)
+        offsets = hash_offsets(previous, previous.manifest.get('text_column', text_column)) if previous is not None else {}
+
+        if from_sources:
+            chunks = tee_csv(iter_knowledge_chunks(), DATA_FILE)
+        else:
+            chunks = pd.read_csv(DATA_FILE, dtype=str, na_filter=False, chunksize=CHUNK_ROWS)
+
+        encoders = ProcessPoolExecutor(workers, initializer=_init_encode_worker,
+                                       initargs=(max(1, (os.cpu_count() or 1) // workers),)) if workers > 1 else None
+        if encoders:
+            encode = lambda texts: encoders.submit(_encode_texts, texts).result()
+        else:
+            encode = get_embedding_service().encode
+
+        def embed(batch):
+            texts = batch[text_column].tolist()
+            vectors, row_hashes, stats = incremental_vectors(texts, previous, text_column, encode, offsets=offsets)
+            return batch, vectors, row_hashes, stats
+
+        totals = {'encoded': 0, 'reused': 0}
+        try:
+            # Threads only hand batches to the encoder processes, keeping batch order for the writer
+            with ThreadPoolExecutor(max(1, workers)) as pool:
+                for batch, vectors, row_hashes, stats in _ordered_map(
+                        embed, iter_batches(chunks, batch_rows, skip=writer.rows), pool, max_pending=2 * max(1, workers)):
+                    writer.append(vectors, batch[columns].itertuples(index=False, name=None), row_hashes)
+                    totals['encoded'] += stats['encoded']
+                    totals['reused'] += stats['reused']
+                    print(f"[INFO] {writer.rows} rows written ({totals['encoded']} encoded, {totals['reused']} reused)")
+        finally:
+            if encoders:
+                encoders.shutdown()
+
+        previous = None  # release the memory map so its version can be pruned
+        manifest = writer.finalize(extra={'text_column': text_column})
+        print(f"[INFO] Saved embedding store ({manifest['count']} rows) to {STORE_DIR}")
+
+        build_indexes(load_store(STORE_DIR), index_type=index_type)
+
+def build_indexes(store, index_type=INDEX_TYPE):
+    """BM25 and FAISS indexes over a finished store"""
+    text_column = store.manifest.get('text_column', "content")
+
+    # BM25 inverted index over titles + content for hybrid / lexical retrieval
+    titles = store.column("title") if "title" in store.metadata else [""] * len(store)
+    kb_version = store_fingerprint(store.manifest)
+    bm25 = BM25Index.from_titles_and_contents(titles, store.column(text_column), meta={'kb_version': kb_version})
+    bm25.save(BM25_DIR)
+    print(f"[INFO] Saved BM25 index ({len(bm25.vocab)} terms) to {BM25_DIR}")
+
+    # Build the ANN index used by scripts/query.py
+    index = None
+    if not faiss_available():
+        print("[WARN] faiss-cpu not installed; skipping ANN index (query.py will use brute force)")
+    else:
+        index = build_index(store.vectors, index_type=index_type)
+        save_index(index, INDEX_FILE, meta={'kb_version': kb_version, 'index_type': index_type})
+        print(f"[INFO] Saved {index_type} FAISS index ({index.ntotal} vectors) to {INDEX_FILE}")
+
+    print_recall_report(store, index, index_type)
+
+def print_recall_report(store, index=None, index_type=INDEX_TYPE, k=10):
+    """Recall@k and memory of the quantized copies (and FAISS index) against exact float32 search"""
+    searchers = {}
+    memory = {'float32': store.vectors.nbytes}
+    for dtype in QUANTIZED_DTYPES:
+        matrix = store.quantized_matrix(dtype)
+        approximate = QuantizedMatrix(matrix.codes, matrix.full, matrix.scales, rescore_factor=1)
+        searchers[dtype] = lambda q, k, m=approximate: m.search(q, k)[1]
+        searchers[f"{dtype} + rescore"] = lambda q, k, m=matrix: m.search(q, k)[1]
+        memory[dtype] = memory[f"{dtype} + rescore"] = matrix.nbytes
+    if index is not None:
+        searchers[f"faiss {index_type}"] = lambda q, k: index_search(index, store.vectors, q, k)[0]
+
+    report = recall_report(store.vectors, searchers, k=k)
+    print(f"[INFO] Recall@{k} vs float32 exact search ({min(200, len(store))} sampled rows as queries)")
+    print(f"       {'method':<20} {'recall':>8} {'ms/query':>9} {'vectors MB':>11}")
+    for name, row in report.items():
+        mb = f"{memory[name] / 2**20:.1f}" if name in memory else "-"
+        print(f"       {name:<20} {row['recall_at_k']:>8.4f} {row['ms_per_query']:>9.3f} {mb:>11}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build knowledge base embeddings and FAISS index")
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default=INDEX_TYPE,
+                        help="flat = exact, ivf = inverted lists (tune FAISS_IVF_NPROBE), "
+                             "hnsw = graph (tune FAISS_HNSW_EF_SEARCH)")
+    parser.add_argument("--full", action="store_true",
+                        help="re-encode every row instead of only new/changed ones")
+    parser.add_argument("--from-sources", action="store_true",
+                        help="preprocess data/*.csv on the fly instead of reading combined_knowledge.csv")
+    parser.add_argument("--batch-rows", type=int, default=BUILD_BATCH_ROWS,
+                        help="rows per encode batch and checkpoint")
+    parser.add_argument("--workers", type=int, default=BUILD_WORKERS,
+                        help="encoder processes (each loads its own model)")
+    args = parser.parse_args()
+    build(index_type=args.index_type, full=args.full, from_sources=args.from_sources,
+          batch_rows=args.batch_rows, workers=args.workers)
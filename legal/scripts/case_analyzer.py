@@ -1,283 +1,423 @@
-import pandas as pd
-from datetime import datetime, timedelta
-import json
-from sentence_transformers import SentenceTransformer
-import numpy as np
-from sklearn.cluster import DBSCAN
-
-class CaseAnalyzer:
-    def __init__(self, supabase_client):
-        self.supabase = supabase_client
-        self.embedder = SentenceTransformer("all-MiniLM-L6-v2")
-    
-    def analyze_case(self, case_data):
-        """Analyze a single case for priority and action items"""
-        analysis = {
-            'priority': 'medium',
-            'needs_attention': False,
-            'action_items': [],
-            'risk_level': 'moderate'
-        }
-        
-        # Priority based on incident type
-        high_priority_types = ['murder', 'kidnapping', 'rape', 'terrorism']
-        medium_priority_types = ['robbery', 'assault', 'fraud']
-        
-        incident_type = case_data.get('incident_type', '').lower()
-        
-        if incident_type in high_priority_types:
-            analysis['priority'] = 'high'
-            analysis['risk_level'] = 'high'
-            analysis['needs_attention'] = True
-        elif incident_type in medium_priority_types:
-            analysis['priority'] = 'medium'
-            analysis['risk_level'] = 'medium'
-        
-        # Check if case is old and needs follow-up
-        created_at = case_data.get('created_at')
-        if created_at:
-            case_age = (datetime.now() - datetime.fromisoformat(created_at)).days
-            if case_age > 7 and analysis['priority'] == 'high':
-                analysis['needs_attention'] = True
-                analysis['action_items'].append('Urgent follow-up required')
-            elif case_age > 30:
-                analysis['needs_attention'] = True
-                analysis['action_items'].append('Case review needed')
-        
-        # Check for incomplete information
-        if not case_data.get('investigating_officer'):
-            analysis['action_items'].append('Assign investigating officer')
-        
-        if not case_data.get('ipc_sections') or case_data.get('ipc_sections') == '[]':
-            analysis['action_items'].append('Review and apply IPC sections')
-        
-        return analysis
-    
-    def analyze_patterns(self, filters=None):
-        """Analyze criminal patterns across cases"""
-        try:
-            # Get cases based on filters
-            query = self.supabase.table("fir_records").select("*")
-            
-            if filters:
-                if filters.get('time_range'):
-                    start_date = (datetime.now() - timedelta(days=filters['time_range'])).strftime('%Y-%m-%d')
-                    query = query.gte('incident_date', start_date)
-            
-            response = query.execute()
-            cases = response.data
-            
-            if not cases:
-                return {'patterns': [], 'insights': []}
-            
-            # Analyze patterns
-            pattern_analysis = self._identify_patterns(cases)
-            insights = self._generate_insights(pattern_analysis)
-            
-            return {
-                'patterns': pattern_analysis,
-                'insights': insights,
-                'total_cases_analyzed': len(cases)
-            }
-            
-        except Exception as e:
-            return {'error': str(e)}
-    
-    def _identify_patterns(self, cases):
-        """Identify patterns in criminal cases"""
-        patterns = {
-            'time_patterns': self._analyze_time_patterns(cases),
-            'location_patterns': self._analyze_location_patterns(cases),
-            'type_patterns': self._analyze_type_patterns(cases),
-            'modus_operandi': self._analyze_mo_patterns(cases)
-        }
-        return patterns
-    
-    def _analyze_time_patterns(self, cases):
-        """Analyze temporal patterns"""
-        time_patterns = {
-            'hourly_distribution': {},
-            'daily_distribution': {},
-            'weekly_pattern': {}
-        }
-        
-        for case in cases:
-            if case.get('incident_time'):
-                hour = int(case['incident_time'].split(':')[0])
-                time_patterns['hourly_distribution'][hour] = time_patterns['hourly_distribution'].get(hour, 0) + 1
-            
-            if case.get('incident_date'):
-                date_obj = datetime.fromisoformat(case['incident_date'])
-                day_name = date_obj.strftime('%A')
-                time_patterns['daily_distribution'][day_name] = time_patterns['daily_distribution'].get(day_name, 0) + 1
-        
-        return time_patterns
-    
-    def _analyze_location_patterns(self, cases):
-        """Analyze geographical patterns"""
-        locations = {}
-        for case in cases:
-            location = case.get('incident_location', 'Unknown')
-            locations[location] = locations.get(location, 0) + 1
-        
-        # Return top 10 locations
-        return dict(sorted(locations.items(), key=lambda x: x[1], reverse=True)[:10])
-    
-    def _analyze_type_patterns(self, cases):
-        """Analyze incident type patterns"""
-        types = {}
-        for case in cases:
-            incident_type = case.get('incident_type', 'Unknown')
-            types[incident_type] = types.get(incident_type, 0) + 1
-        
-        return types
-    
-    def _analyze_mo_patterns(self, cases):
-        """Analyze modus operandi patterns using NLP"""
-        try:
-            descriptions = [case.get('incident_description', '') for case in cases if case.get('incident_description')]
-            if not descriptions:
-                return []
-            
-            # Use embeddings to find similar descriptions
-            embeddings = self.embedder.encode(descriptions)
-            
-            # Cluster similar descriptions
-            clustering = DBSCAN(eps=0.5, min_samples=2).fit(embeddings)
-            
-            patterns = []
-            for cluster_id in set(clustering.labels_):
-                if cluster_id != -1:  # -1 indicates outliers
-                    cluster_cases = [cases[i] for i in range(len(cases)) if clustering.labels_[i] == cluster_id]
-                    if len(cluster_cases) > 1:  # Only consider clusters with multiple cases
-                        patterns.append({
-                            'cluster_id': cluster_id,
-                            'case_count': len(cluster_cases),
-                            'common_elements': self._extract_common_elements(cluster_cases)
-                        })
-            
-            return patterns
-            
-        except Exception as e:
-            return [{'error': f'MO analysis failed: {str(e)}'}]
-    
-    def _extract_common_elements(self, cases):
-        """Extract common elements from similar cases"""
-        # Simple keyword extraction (can be enhanced)
-        common_keywords = {}
-        for case in cases:
-            description = case.get('incident_description', '').lower()
-            words = description.split()
-            for word in words:
-                if len(word) > 4:  # Filter short words
-                    common_keywords[word] = common_keywords.get(word, 0) + 1
-        
-        return dict(sorted(common_keywords.items(), key=lambda x: x[1], reverse=True)[:10])
-    
-    def _generate_insights(self, patterns):
-        """Generate actionable insights from patterns"""
-        insights = []
-        
-        # Time-based insights
-        hourly = patterns['time_patterns']['hourly_distribution']
-        if hourly:
-            peak_hour = max(hourly, key=hourly.get)
-            insights.append(f"Peak crime hours: {peak_hour}:00 ({hourly[peak_hour]} cases)")
-        
-        # Location-based insights
-        locations = patterns['location_patterns']
-        if locations:
-            hotspot = list(locations.keys())[0]
-            insights.append(f"Primary hotspot: {hotspot} ({locations[hotspot]} cases)")
-        
-        # Type-based insights
-        types = patterns['type_patterns']
-        if types:
-            common_type = max(types, key=types.get)
-            insights.append(f"Most common crime: {common_type} ({types[common_type]} cases)")
-        
-        return insights
-    
-    def identify_hotspots(self):
-        """Identify crime hotspots"""
-        try:
-            response = self.supabase.table("fir_records")\
-                .select("incident_location")\
-                .execute()
-            
-            locations = [case['incident_location'] for case in response.data if case.get('incident_location')]
-            location_counts = {}
-            
-            for location in locations:
-                location_counts[location] = location_counts.get(location, 0) + 1
-            
-            # Return hotspots with more than 2 cases
-            hotspots = {loc: count for loc, count in location_counts.items() if count > 2}
-            return dict(sorted(hotspots.items(), key=lambda x: x[1], reverse=True))
-            
-        except Exception as e:
-            return {'error': str(e)}
-    
-    def get_comprehensive_stats(self, time_range='month'):
-        """Get comprehensive statistics"""
-        try:
-            # Calculate date range
-            if time_range == 'day':
-                start_date = datetime.now() - timedelta(days=1)
-            elif time_range == 'week':
-                start_date = datetime.now() - timedelta(weeks=1)
-            elif time_range == 'month':
-                start_date = datetime.now() - timedelta(days=30)
-            else:  # year
-                start_date = datetime.now() - timedelta(days=365)
-            
-            start_date_str = start_date.strftime('%Y-%m-%d')
-            
-            # Get cases in time range
-            response = self.supabase.table("fir_records")\
-                .select("*")\
-                .gte('incident_date', start_date_str)\
-                .execute()
-            
-            cases = response.data
-            
-            stats = {
-                'total_cases': len(cases),
-                'time_range': time_range,
-                'case_types': {},
-                'resolution_rate': self._calculate_resolution_rate(cases),
-                'average_response_time': self._calculate_avg_response_time(cases),
-                'top_locations': self._analyze_location_patterns(cases),
-                'trend_comparison': self._compare_with_previous_period(time_range)
-            }
-            
-            # Count by type
-            for case in cases:
-                case_type = case.get('incident_type', 'Unknown')
-                stats['case_types'][case_type] = stats['case_types'].get(case_type, 0) + 1
-            
-            return stats
-            
-        except Exception as e:
-            return {'error': str(e)}
-    
-    def _calculate_resolution_rate(self, cases):
-        """Calculate case resolution rate"""
-        # Simple implementation - can be enhanced with actual status tracking
-        total = len(cases)
-        if total == 0:
-            return 0
-        # Assume cases older than 30 days are "resolved" for demo
-        resolved = sum(1 for case in cases if 
-                      (datetime.now() - datetime.fromisoformat(case['created_at'])).days > 30)
-        return (resolved / total) * 100
-    
-    def _calculate_avg_response_time(self, cases):
-        """Calculate average response time (simplified)"""
-        # This would normally use actual response time data
-        return "2.5 hours"  # Placeholder
-    
-    def _compare_with_previous_period(self, time_range):
-        """Compare with previous period for trends"""
-        # Implementation for trend analysis
-        return {'trend': 'stable', 'change_percentage': 0}
\ No newline at end of file
+import pandas as pd
+from datetime import datetime, timedelta
+import json
+import time
+import argparse
+import numpy as np
+from scripts.embedding_service import get_embedding_service
+from scripts.mo_clustering import MOClusterIndex, MO_MIN_CLUSTER_SIZE
+
+# Columns each analytics query actually reads (instead of select("*"))
+PATTERN_COLUMNS = ['fir_number', 'incident_date', 'incident_time', 'incident_location',
+                   'incident_type', 'incident_description']
+STATS_COLUMNS = ['incident_type', 'incident_location', 'created_at']
+
+
+def case_frame(cases, columns):
+    """Columnar view of FIR rows (list of dicts or DataFrame) with every column in `columns` present"""
+    if isinstance(cases, pd.DataFrame):
+        return cases.reindex(columns=columns)
+    return pd.DataFrame.from_records(cases, columns=columns)
+
+
+def _counts(values, limit=None):
+    """value -> count dict, most frequent first"""
+    counts = values.value_counts(sort=True)
+    if limit is not None:
+        counts = counts.head(limit)
+    return counts.to_dict()
+
+
+def _parsed_counts(values, parse):
+    """Count raw values first, then parse only the distinct ones and merge their counts
+
+    Dates and times repeat heavily, so this parses a few hundred strings
+    instead of one per FIR.
+    """
+    counts = values.dropna().value_counts(sort=False)
+    keys = parse(counts.index.to_series(index=counts.index))
+    return counts.groupby(keys.to_numpy()).sum().sort_values(ascending=False, kind='stable')
+
+
+class CaseAnalyzer:
+    def __init__(self, supabase_client, fir_vectors=None, mo_clusters=None, rollups=None, fir_client=None):
+        self.supabase = supabase_client
+        self.embedder = get_embedding_service()
+        # Description embeddings persisted at FIR creation (FIRVectorStore)
+        self.fir_vectors = fir_vectors
+        # Persistent incremental MO clusters (MOClusterIndex); in-memory per call if None
+        self.mo_clusters = mo_clusters
+        # Pre-aggregated counts (FIRRollups); raw fir_records are scanned until it is backfilled
+        self.rollups = rollups
+        # SupabaseFIRClient, for grouped counts computed in SQL (rpc); preferred over rollups
+        self.fir_client = fir_client
+    
+    def analyze_case(self, case_data):
+        """Analyze a single case for priority and action items"""
+        analysis = {
+            'priority': 'medium',
+            'needs_attention': False,
+            'action_items': [],
+            'risk_level': 'moderate'
+        }
+        
+        # Priority based on incident type
+        high_priority_types = ['murder', 'kidnapping', 'rape', 'terrorism']
+        medium_priority_types = ['robbery', 'assault', 'fraud']
+        
+        incident_type = case_data.get('incident_type', '').lower()
+        
+        if incident_type in high_priority_types:
+            analysis['priority'] = 'high'
+            analysis['risk_level'] = 'high'
+            analysis['needs_attention'] = True
+        elif incident_type in medium_priority_types:
+            analysis['priority'] = 'medium'
+            analysis['risk_level'] = 'medium'
+        
+        # Check if case is old and needs follow-up
+        created_at = case_data.get('created_at')
+        if created_at:
+            case_age = (datetime.now() - datetime.fromisoformat(created_at)).days
+            if case_age > 7 and analysis['priority'] == 'high':
+                analysis['needs_attention'] = True
+                analysis['action_items'].append('Urgent follow-up required')
+            elif case_age > 30:
+                analysis['needs_attention'] = True
+                analysis['action_items'].append('Case review needed')
+        
+        # Check for incomplete information
+        if not case_data.get('investigating_officer'):
+            analysis['action_items'].append('Assign investigating officer')
+        
+        if not case_data.get('ipc_sections') or case_data.get('ipc_sections') == '[]':
+            analysis['action_items'].append('Review and apply IPC sections')
+        
+        return analysis
+    
+    def analyze_patterns(self, filters=None):
+        """Analyze criminal patterns across cases"""
+        try:
+            # Get cases based on filters
+            query = self.supabase.table("fir_records").select(",".join(PATTERN_COLUMNS))
+            
+            if filters:
+                if filters.get('time_range'):
+                    start_date = (datetime.now() - timedelta(days=filters['time_range'])).strftime('%Y-%m-%d')
+                    query = query.gte('incident_date', start_date)
+            
+            response = query.execute()
+            if not response.data:
+                return {'patterns': [], 'insights': []}
+            cases = case_frame(response.data, PATTERN_COLUMNS)
+            
+            # Analyze patterns
+            pattern_analysis = self._identify_patterns(cases)
+            insights = self._generate_insights(pattern_analysis)
+            
+            return {
+                'patterns': pattern_analysis,
+                'insights': insights,
+                'total_cases_analyzed': len(cases)
+            }
+            
+        except Exception as e:
+            return {'error': str(e)}
+    
+    def _identify_patterns(self, cases):
+        """Identify patterns in criminal cases"""
+        patterns = {
+            'time_patterns': self._analyze_time_patterns(cases),
+            'location_patterns': self._analyze_location_patterns(cases),
+            'type_patterns': self._analyze_type_patterns(cases),
+            'modus_operandi': self._analyze_mo_patterns(cases)
+        }
+        return patterns
+    
+    def _analyze_time_patterns(self, cases):
+        """Analyze temporal patterns"""
+        cases = case_frame(cases, PATTERN_COLUMNS)
+        
+        # "HH:MM[:SS]" -> hour and ISO date -> weekday, parsed once per distinct value
+        hours = _parsed_counts(cases['incident_time'], lambda times: pd.to_numeric(
+            times.astype('string').str.split(':', n=1).str[0], errors='coerce'))
+        days = _parsed_counts(cases['incident_date'], lambda dates: pd.to_datetime(
+            dates, errors='coerce', format='ISO8601').dt.day_name())
+        
+        return {
+            'hourly_distribution': {int(hour): int(count) for hour, count in hours.items()},
+            'daily_distribution': {day: int(count) for day, count in days.items()},
+            'weekly_pattern': {}
+        }
+    
+    def _analyze_location_patterns(self, cases):
+        """Analyze geographical patterns"""
+        locations = case_frame(cases, PATTERN_COLUMNS)['incident_location'].fillna('Unknown')
+        
+        # Return top 10 locations
+        return _counts(locations, limit=10)
+    
+    def _analyze_type_patterns(self, cases):
+        """Analyze incident type patterns"""
+        return _counts(case_frame(cases, PATTERN_COLUMNS)['incident_type'].fillna('Unknown'))
+    
+    def _analyze_mo_patterns(self, cases):
+        """Analyze modus operandi patterns using NLP"""
+        try:
+            cases = case_frame(cases, PATTERN_COLUMNS)
+            described = cases[cases['incident_description'].fillna('').astype(bool)]
+            described_cases = described[['fir_number', 'incident_description']].to_dict('records')
+            if not described_cases:
+                return []
+            
+            clusters = self.mo_clusters or MOClusterIndex(path=None)
+            if self.mo_clusters:
+                # Unnumbered records would open a new persistent cluster on every refresh
+                described_cases = [case for case in described_cases if case.get('fir_number')]
+                clusters.refresh()
+            labels = [clusters.cluster_of(case.get('fir_number')) for case in described_cases]
+            
+            # Only FIRs not yet in a cluster need a vector (stored ones are not re-encoded)
+            pending = [i for i, label in enumerate(labels) if label is None]
+            if pending:
+                pending_cases = [described_cases[i] for i in pending]
+                if self.fir_vectors:
+                    embeddings = self.fir_vectors.vectors_for(pending_cases, self.embedder.encode)
+                else:
+                    embeddings = self.embedder.encode([case['incident_description'] for case in pending_cases])
+                assigned = clusters.assign([case.get('fir_number') for case in pending_cases], embeddings)
+                for i, label in zip(pending, assigned):
+                    labels[i] = label
+            
+            cluster_cases = {}
+            for case, label in zip(described_cases, labels):
+                cluster_cases.setdefault(label, []).append(case)
+            
+            patterns = []
+            for cluster_id, members in sorted(cluster_cases.items()):
+                if len(members) >= MO_MIN_CLUSTER_SIZE:  # Only consider clusters with multiple cases
+                    patterns.append({
+                        'cluster_id': int(cluster_id),
+                        'case_count': len(members),
+                        'common_elements': self._extract_common_elements(members)
+                    })
+            
+            return patterns
+            
+        except Exception as e:
+            return [{'error': f'MO analysis failed: {str(e)}'}]
+    
+    def _extract_common_elements(self, cases):
+        """Extract common elements from similar cases"""
+        # Simple keyword extraction (can be enhanced)
+        descriptions = case_frame(cases, ['incident_description'])['incident_description'].fillna('')
+        words = descriptions.str.lower().str.split().explode().dropna()
+        words = words[words.str.len() > 4]  # Filter short words
+        return _counts(words, limit=10)
+    
+    def _generate_insights(self, patterns):
+        """Generate actionable insights from patterns"""
+        insights = []
+        
+        # Time-based insights
+        hourly = patterns['time_patterns']['hourly_distribution']
+        if hourly:
+            peak_hour = max(hourly, key=hourly.get)
+            insights.append(f"Peak crime hours: {peak_hour}:00 ({hourly[peak_hour]} cases)")
+        
+        # Location-based insights
+        locations = patterns['location_patterns']
+        if locations:
+            hotspot = list(locations.keys())[0]
+            insights.append(f"Primary hotspot: {hotspot} ({locations[hotspot]} cases)")
+        
+        # Type-based insights
+        types = patterns['type_patterns']
+        if types:
+            common_type = max(types, key=types.get)
+            insights.append(f"Most common crime: {common_type} ({types[common_type]} cases)")
+        
+        return insights
+    
+    def identify_hotspots(self):
+        """Identify crime hotspots"""
+        try:
+            # SQL aggregates are authoritative; the local rollups may lag behind other hosts
+            if self.fir_client:
+                result = self.fir_client.get_location_counts(min_count=3)
+                return result['locations'] if result['success'] else {'error': result['error']}
+            if self.rollups and self.rollups.ready:
+                return {loc: count for loc, count in self.rollups.location_counts(min_count=3).items() if loc}
+            
+            response = self.supabase.table("fir_records")\
+                .select("incident_location")\
+                .execute()
+            
+            locations = case_frame(response.data, ['incident_location'])['incident_location']
+            location_counts = locations[locations.fillna('').astype(bool)].value_counts()
+            
+            # Return hotspots with more than 2 cases
+            return location_counts[location_counts > 2].to_dict()
+            
+        except Exception as e:
+            return {'error': str(e)}
+    
+    def get_comprehensive_stats(self, time_range='month'):
+        """Get comprehensive statistics"""
+        try:
+            # Calculate date range
+            if time_range == 'day':
+                start_date = datetime.now() - timedelta(days=1)
+            elif time_range == 'week':
+                start_date = datetime.now() - timedelta(weeks=1)
+            elif time_range == 'month':
+                start_date = datetime.now() - timedelta(days=30)
+            else:  # year
+                start_date = datetime.now() - timedelta(days=365)
+            
+            start_date_str = start_date.strftime('%Y-%m-%d')
+            if self.fir_client:
+                return self._sql_stats(time_range, start_date_str)
+            if self.rollups and self.rollups.ready:
+                return self._rollup_stats(time_range, start_date_str)
+            
+            # Get cases in time range
+            response = self.supabase.table("fir_records")\
+                .select(",".join(STATS_COLUMNS))\
+                .gte('incident_date', start_date_str)\
+                .execute()
+            
+            cases = case_frame(response.data, STATS_COLUMNS)
+            
+            stats = {
+                'total_cases': len(cases),
+                'time_range': time_range,
+                'case_types': _counts(cases['incident_type'].fillna('Unknown')),
+                'resolution_rate': self._calculate_resolution_rate(cases),
+                'average_response_time': self._calculate_avg_response_time(cases),
+                'top_locations': self._analyze_location_patterns(cases),
+                'trend_comparison': self._compare_with_previous_period(time_range)
+            }
+            
+            return stats
+            
+        except Exception as e:
+            return {'error': str(e)}
+    
+    def _rollup_stats(self, time_range, start_date_str):
+        """get_comprehensive_stats answered from the rollups"""
+        total = self.rollups.total(start_date_str)
+        # Rollups are keyed by incident day, so "older than 30 days" uses the incident date
+        resolved = self.rollups.total(start_date_str, (datetime.now() - timedelta(days=31)).strftime('%Y-%m-%d'))
+        locations = self.rollups.location_counts(start_date_str, limit=10)
+        return {
+            'total_cases': total,
+            'time_range': time_range,
+            'case_types': {t or 'Unknown': n for t, n in self.rollups.grouped_counts('incident_type', start_date_str).items()},
+            'resolution_rate': (resolved / total) * 100 if total else 0,
+            'average_response_time': self._calculate_avg_response_time(None),
+            'top_locations': {loc or 'Unknown': n for loc, n in locations.items()},
+            'trend_comparison': self._compare_with_previous_period(time_range)
+        }
+    
+    def _sql_stats(self, time_range, start_date_str):
+        """get_comprehensive_stats from grouped counts computed in SQL"""
+        result = self.fir_client.get_grouped_counts(start_date_str)
+        if not result['success']:
+            return {'error': result['error']}
+        counts = result['counts']
+        total = counts['total']
+        return {
+            'total_cases': total,
+            'time_range': time_range,
+            'case_types': counts['incident_type'],
+            'resolution_rate': (counts['older_than_30_days'] / total) * 100 if total else 0,
+            'average_response_time': self._calculate_avg_response_time(None),
+            'top_locations': dict(list(counts['incident_location'].items())[:10]),
+            'trend_comparison': self._compare_with_previous_period(time_range)
+        }
+    
+    def _calculate_resolution_rate(self, cases):
+        """Calculate case resolution rate"""
+        # Simple implementation - can be enhanced with actual status tracking
+        total = len(cases)
+        if total == 0:
+            return 0
+        # Assume cases older than 30 days are "resolved" for demo
+        created = pd.to_datetime(case_frame(cases, ['created_at'])['created_at'], errors='coerce', utc=True, format='ISO8601')
+        resolved = int(((pd.Timestamp.now(tz='UTC') - created).dt.days > 30).sum())
+        return (resolved / total) * 100
+    
+    def _calculate_avg_response_time(self, cases):
+        """Calculate average response time (simplified)"""
+        # This would normally use actual response time data
+        return "2.5 hours"  # Placeholder
+    
+    def _compare_with_previous_period(self, time_range):
+        """Compare with previous period for trends"""
+        # Implementation for trend analysis
+        return {'trend': 'stable', 'change_percentage': 0}
+
+def _row_by_row_patterns(cases):
+    """Previous dict-per-row implementation, kept as the benchmark baseline"""
+    hourly, daily, locations, types = {}, {}, {}, {}
+    for case in cases:
+        if case.get('incident_time'):
+            hour = int(case['incident_time'].split(':')[0])
+            hourly[hour] = hourly.get(hour, 0) + 1
+        if case.get('incident_date'):
+            day_name = datetime.fromisoformat(case['incident_date']).strftime('%A')
+            daily[day_name] = daily.get(day_name, 0) + 1
+        location = case.get('incident_location', 'Unknown')
+        locations[location] = locations.get(location, 0) + 1
+        incident_type = case.get('incident_type', 'Unknown')
+        types[incident_type] = types.get(incident_type, 0) + 1
+    top_locations = dict(sorted(locations.items(), key=lambda x: x[1], reverse=True)[:10])
+    return hourly, daily, top_locations, types
+
+
+def synthetic_cases(n, seed=0):
+    """Synthetic fir_records rows (PATTERN_COLUMNS only) as a DataFrame"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    return pd.DataFrame({
+        'fir_number': [f"PS/2024/{i:07d}" for i in range(n)],
+        'incident_date': dates.strftime('%Y-%m-%d'),
+        'incident_time': pd.Series(rng.integers(0, 24, n)).map('{:02d}:30'.format),
+        'incident_location': pd.Series(rng.integers(0, 500, n)).map('Ward {}'.format),
+        'incident_type': rng.choice(['theft', 'assault', 'fraud', 'burglary', 'cybercrime', 'other'], n),
+        'incident_description': 'synthetic incident description',
+    })
+
+
+def benchmark(sizes=(10000, 100000, 1000000)):
+    """Time/location/type distributions: row-by-row dicts vs the columnar implementation"""
+    analyzer = CaseAnalyzer.__new__(CaseAnalyzer)
+    print(f"{'cases':>9} {'rows s':>8} {'frame s':>8} {'columnar s':>11} {'speedup':>8}")
+    for n in sizes:
+        frame = synthetic_cases(n)
+        records = frame.to_dict('records')  # what supabase returns
+
+        start = time.perf_counter()
+        hourly, daily, top_locations, types = _row_by_row_patterns(records)
+        row_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cases = case_frame(records, PATTERN_COLUMNS)
+        frame_seconds = time.perf_counter() - start
+        time_patterns = analyzer._analyze_time_patterns(cases)
+        columnar = (time_patterns['hourly_distribution'], time_patterns['daily_distribution'],
+                    analyzer._analyze_location_patterns(cases), analyzer._analyze_type_patterns(cases))
+        columnar_seconds = time.perf_counter() - start
+
+        assert all(a == b for a, b in zip((hourly, daily, top_locations, types), columnar)), "results differ"
+        # columnar time includes building the frame from the records
+        print(f"{n:>9} {row_seconds:>8.3f} {frame_seconds:>8.3f} {columnar_seconds:>11.3f} "
+              f"{row_seconds / columnar_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark CaseAnalyzer pattern analytics")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    benchmark(sizes=args.sizes)
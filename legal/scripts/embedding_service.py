@@ -0,0 +1,228 @@
+import os
+import re
+import sys
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+from scripts.encode_scheduler import ENCODE_SCHEDULER, EncodeScheduler
+
+# Every consumer (chatbot, FIR RAG, case analyzer, criminal matcher) must use
+# the same model so that stored vectors and query vectors stay comparable.
+MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+DEFAULT_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096"))
+# torch = SentenceTransformer (PyTorch); onnx / onnx-int8 = exported model on ONNX Runtime
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def normalize_query_text(text):
+    """Cache key for a query: case-folded with whitespace collapsed"""
+    return re.sub(r"\s+", " ", str(text)).strip().casefold()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query vectors keyed on normalized text"""
+
+    def __init__(self, max_entries=QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, key, vector):
+        if self.max_entries <= 0:
+            return
+        vector = np.array(vector, dtype=np.float32)
+        vector.flags.writeable = False  # shared between callers
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': int(sum(v.nbytes for v in self._entries.values())),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _load_onnx_encoder(model_name, quantized):
+    """ONNX Runtime encoder for `model_name`, exported on first use (needs torch once)"""
+    from scripts.onnx_encoder import OnnxEncoder, CONFIG_FILE, INT8_FILE, export_onnx, model_dir
+
+    path = model_dir(model_name)
+    missing = not os.path.exists(os.path.join(path, CONFIG_FILE))
+    if missing or (quantized and not os.path.exists(os.path.join(path, INT8_FILE))):
+        print(f"⚠️ No ONNX export of {model_name} in {path}; exporting it now")
+        export_onnx(model_name, path, quantize=True)
+    return OnnxEncoder(path, quantized=quantized)
+
+
+class EmbeddingService:
+    """Single shared sentence encoder used by every component in the process"""
+
+    def __init__(self, model_name=MODEL_NAME, backend=EMBEDDING_BACKEND):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend '{backend}'. Expected one of {BACKENDS}")
+
+        self.model_name = model_name
+        self.backend = backend
+        start = time.perf_counter()
+        if backend == "torch":
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(model_name)
+            # get_sentence_embedding_dimension() is deprecated in favour of get_embedding_dimension()
+            self.dimension = (self.model.get_embedding_dimension() if hasattr(self.model, "get_embedding_dimension")
+                              else self.model.get_sentence_embedding_dimension())
+        else:
+            self.model = _load_onnx_encoder(model_name, quantized=(backend == "onnx-int8"))
+            self.dimension = self.model.dimension
+        self.load_seconds = time.perf_counter() - start
+        self.encode_calls = 0
+        self.encoded_texts = 0
+        self.query_cache = QueryEmbeddingCache()
+        # Concurrent query misses are coalesced into one batched encode
+        self.scheduler = EncodeScheduler(self.encode) if ENCODE_SCHEDULER else None
+
+    def encode(self, texts, batch_size=DEFAULT_BATCH_SIZE, convert_to_numpy=True,
+               normalize=False, show_progress_bar=False):
+        """Encode one text or a list of texts in batches, returning float32 vectors"""
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        self.encode_calls += 1
+        self.encoded_texts += len(texts)
+
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        if self.backend != "torch":
+            vectors = self.model.encode(list(texts), batch_size=batch_size, normalize=normalize)
+            return vectors[0] if single else vectors
+
+        vectors = self.model.encode(
+            list(texts),
+            batch_size=batch_size,
+            convert_to_numpy=convert_to_numpy,
+            normalize_embeddings=normalize,
+            show_progress_bar=show_progress_bar,
+        )
+        if convert_to_numpy:
+            vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors[0] if single else vectors
+
+    def encode_query(self, text):
+        """Encode a single query, served from the LRU cache when possible"""
+        return self.encode_queries([text])[0]
+
+    def encode_queries(self, texts):
+        """Encode queries through the cache; misses go to the model via the micro-batching scheduler"""
+        keys = [normalize_query_text(t) for t in texts]
+        vectors = [self.query_cache.get(key) for key in keys]
+
+        missing = {}
+        for i, (key, vector) in enumerate(zip(keys, vectors)):
+            if vector is None:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            miss_keys = list(missing)
+            miss_texts = [texts[missing[key][0]] for key in miss_keys]
+            encoded = self.scheduler.encode(miss_texts) if self.scheduler else self.encode(miss_texts)
+            for key, vector in zip(miss_keys, encoded):
+                self.query_cache.put(key, vector)
+                for i in missing[key]:
+                    vectors[i] = vector
+
+        if not vectors:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def memory_footprint(self):
+        """Report model weight size and current process RSS in bytes"""
+        if self.backend == "torch":
+            param_bytes = sum(p.numel() * p.element_size() for p in self.model.parameters())
+            buffer_bytes = sum(b.numel() * b.element_size() for b in self.model.buffers())
+        else:
+            param_bytes, buffer_bytes = self.model.weight_bytes, 0
+        return {
+            'model_name': self.model_name,
+            'backend': self.backend,
+            'parameter_bytes': int(param_bytes),
+            'buffer_bytes': int(buffer_bytes),
+            'model_mb': round((param_bytes + buffer_bytes) / (1024 * 1024), 2),
+            'process_rss_mb': round(_process_rss_bytes() / (1024 * 1024), 2),
+            'load_seconds': round(self.load_seconds, 3),
+        }
+
+    def stats(self):
+        """Usage counters for health endpoints"""
+        return {
+            'model_name': self.model_name,
+            'backend': self.backend,
+            'dimension': self.dimension,
+            'encode_calls': self.encode_calls,
+            'encoded_texts': self.encoded_texts,
+            'query_cache': self.query_cache.stats(),
+            'scheduler': self.scheduler.stats() if self.scheduler else None,
+        }
+
+
+def _process_rss_bytes():
+    """Current resident set size of this process (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes on Linux
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_embedding_service():
+    """Return the process-wide embedding service, loading the model on first use"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = EmbeddingService()
+    return _service
+
+
+def is_embedding_service_loaded():
+    """True once the shared model has been loaded in this process"""
+    return _service is not None
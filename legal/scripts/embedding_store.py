@@ -0,0 +1,536 @@
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import numpy as np
+from scripts.embedding_service import MODEL_NAME
+from scripts.vector_search import normalize_rows
+from scripts.quantization import QUANTIZED_DTYPES, BLOCK_ROWS, QuantizedMatrix, int8_scales, quantize_block
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# On-disk layout of a store version:
+#   vectors.npy    - L2-normalized float32 matrix, opened with np.memmap (mmap_mode="r")
+#   metadata.json  - columnar row metadata, e.g. {"title": [...], "content": [...]}
+#   <name>.npy     - optional per-row arrays (e.g. row -> section code), also memory-mapped
+#   row_hash.npy   - content hash of the text behind each row; row i is vector offset i
+#   vectors_float16.npy / vectors_int8.npy - quantized copies (int8 scales live in the manifest)
+#   manifest.json  - format version, model, shape and column names; written last
+#
+# A store directory keeps each build in versions/<id>/ and names the live one
+# in CURRENT, which is replaced atomically once the build is complete, so a
+# reader opens one whole version and never a mix of two builds' files.
+# Stores written before versioning (the files directly in the store
+# directory) are still read until the next build replaces them.
+VECTORS_FILE = "vectors.npy"
+METADATA_FILE = "metadata.json"
+MANIFEST_FILE = "manifest.json"
+CURRENT_FILE = "CURRENT"
+VERSIONS_DIR = "versions"
+# The live version plus the one before it, for readers that resolved CURRENT just before a swap
+KEEP_VERSIONS = 2
+FORMAT_VERSION = 1
+ROW_HASH_ARRAY = "row_hash"
+CONTENT_HASH = "blake2b-128"
+
+# EMBEDDINGS_AUTO_REBUILD=1: loaders re-encode changed rows at startup when the
+# source CSV no longer matches. Off by default so API workers only read stores;
+# rebuild with `python -m scripts.build_embeddings` / `python -m scripts.fir_rag --train`.
+AUTO_REBUILD = os.getenv("EMBEDDINGS_AUTO_REBUILD", "0") == "1"
+
+KNOWLEDGE_STORE_DIR = os.path.join("vector_store", "knowledge")
+FIR_STORE_DIR = os.path.join("models", "fir_store")
+
+
+class EmbeddingStore:
+    """Read-only view over a store directory; vectors are shared pages via mmap"""
+
+    def __init__(self, path, vectors, metadata, manifest, arrays=None, quantized=None):
+        self.path = path
+        self.vectors = vectors
+        self.metadata = metadata
+        self.manifest = manifest
+        self.arrays = arrays or {}
+        self.quantized = quantized or {}
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    def column(self, name):
+        return self.metadata[name]
+
+    def quantized_matrix(self, dtype):
+        """QuantizedMatrix over the stored float16/int8 copy (None for float32)
+
+        Stores written before quantized copies existed are quantized in memory.
+        """
+        if dtype == "float32":
+            return None
+        if dtype not in self.quantized:
+            print(f"⚠️ No {dtype} vectors in {self.path}; quantizing in memory (rebuild the store to persist them)")
+            scales = int8_scales(self.vectors) if dtype == "int8" else None
+            self.quantized[dtype] = (quantize_block(self.vectors, dtype, scales), scales)
+        codes, scales = self.quantized[dtype]
+        return QuantizedMatrix(codes, self.vectors, scales)
+
+
+def current_version_dir(path):
+    """Directory holding the live store files: the CURRENT version, or `path` itself for unversioned stores"""
+    try:
+        with open(os.path.join(path, CURRENT_FILE), encoding="utf-8") as f:
+            return os.path.join(path, VERSIONS_DIR, f.read().strip())
+    except FileNotFoundError:
+        return path
+
+
+def store_exists(path):
+    return os.path.exists(os.path.join(current_version_dir(path), MANIFEST_FILE))
+
+
+_store_locks = {}
+_store_locks_guard = threading.Lock()
+
+
+def _lock_file(f):
+    if fcntl:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print(f"[INFO] Waiting for another process to finish writing {f.name}")
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+    else:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:  # LK_LOCK gives up after ~10s
+                continue
+
+
+def _unlock_file(f):
+    if fcntl:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def store_lock(path):
+    """Exclusive lock on <path>.lock held while a store is rebuilt
+
+    Serializes rebuilds across processes (API workers, CLI) and threads;
+    re-entrant within a thread, so build helpers can lock around each other.
+    """
+    lock_path = os.path.abspath(path) + ".lock"
+    with _store_locks_guard:
+        entry = _store_locks.setdefault(lock_path, {'lock': threading.RLock(), 'depth': 0, 'file': None})
+    with entry['lock']:
+        if entry['depth'] == 0:
+            os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+            entry['file'] = open(lock_path, "a+")
+            _lock_file(entry['file'])
+        entry['depth'] += 1
+        try:
+            yield
+        finally:
+            entry['depth'] -= 1
+            if entry['depth'] == 0:
+                _unlock_file(entry['file'])
+                entry['file'].close()
+                entry['file'] = None
+
+
+def write_atomic(path, write):
+    """write(tmp_path) to a unique temp file next to `path`, then rename it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".",
+                                    suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _new_version_dir(path):
+    """Empty directory for the next build under <path>/versions; ids sort in build order"""
+    root = os.path.join(path, VERSIONS_DIR)
+    os.makedirs(root, exist_ok=True)
+    return tempfile.mkdtemp(dir=root, prefix=datetime.now().strftime("%Y%m%dT%H%M%S%f."))
+
+
+def _publish_version(path, version_dir):
+    """Make a finished version live, then drop versions (and unversioned files) readers no longer need
+
+    Caller holds store_lock(path), so no other build is writing a version.
+    """
+    version = os.path.basename(version_dir)
+
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(version)
+    write_atomic(os.path.join(path, CURRENT_FILE), write)
+
+    root = os.path.join(path, VERSIONS_DIR)
+    older = sorted((name for name in os.listdir(root) if name != version), reverse=True)
+    for name in older[KEEP_VERSIONS - 1:]:
+        # Best effort: open memory maps keep the data alive on POSIX; Windows may refuse
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    for name in os.listdir(path):
+        if name in (MANIFEST_FILE, METADATA_FILE) or name.endswith(".npy"):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+
+
+def _save_npy(path, array):
+    with open(path, "wb") as f:
+        np.save(f, array)
+
+
+def _manifest(model_name, count, dimension, columns, arrays, extra=None):
+    return {
+        'format_version': FORMAT_VERSION,
+        'model_name': model_name,
+        'count': int(count),
+        'dimension': int(dimension),
+        'dtype': 'float32',
+        'normalized': True,
+        'columns': list(columns),
+        'arrays': {name: f"{name}.npy" for name in arrays},
+        'vectors_file': VECTORS_FILE,
+        'metadata_file': METADATA_FILE,
+        'created_at': datetime.now().isoformat(),
+        **(extra or {}),
+    }
+
+
+def _write_manifest(path, manifest):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    write_atomic(os.path.join(path, MANIFEST_FILE), write)
+
+
+def _write_quantized(path, vectors):
+    """Write float16 and int8 copies of `vectors` block by block; returns the manifest entry"""
+    entry = {}
+    for dtype in QUANTIZED_DTYPES:
+        scales = int8_scales(vectors) if dtype == "int8" else None
+
+        def write(tmp_path, dtype=dtype, scales=scales):
+            out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=vectors.shape)
+            for start in range(0, len(vectors), BLOCK_ROWS):
+                out[start:start + BLOCK_ROWS] = quantize_block(vectors[start:start + BLOCK_ROWS], dtype, scales)
+            out.flush()
+            del out
+
+        filename = f"vectors_{dtype}.npy"
+        write_atomic(os.path.join(path, filename), write)
+        entry[dtype] = {'file': filename}
+        if scales is not None:
+            entry[dtype]['scales'] = scales.tolist()
+    return entry
+
+
+def save_store(path, vectors, metadata, model_name=MODEL_NAME, extra=None, arrays=None):
+    """Write vectors (normalized float32), columnar metadata, per-row arrays and manifest as the new version of `path`"""
+    vectors = normalize_rows(vectors)
+    arrays = {name: np.ascontiguousarray(values) for name, values in (arrays or {}).items()}
+    for name, values in [*metadata.items(), *arrays.items()]:
+        if len(values) != len(vectors):
+            raise ValueError(f"Column '{name}' has {len(values)} rows, expected {len(vectors)}")
+
+    def write_metadata(tmp_path):
+        columns = {name: [None if v is None else str(v) for v in values] for name, values in metadata.items()}
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(columns, f, ensure_ascii=False, separators=(",", ":"))
+
+    manifest = _manifest(model_name, vectors.shape[0], vectors.shape[1], list(metadata.keys()), list(arrays), extra)
+
+    with store_lock(path):
+        version_dir = _new_version_dir(path)
+        try:
+            write_atomic(os.path.join(version_dir, VECTORS_FILE), lambda tmp_path: _save_npy(tmp_path, vectors))
+            write_atomic(os.path.join(version_dir, METADATA_FILE), write_metadata)
+            for name, values in arrays.items():
+                write_atomic(os.path.join(version_dir, f"{name}.npy"),
+                             lambda tmp_path, values=values: _save_npy(tmp_path, values))
+            manifest['quantized'] = _write_quantized(version_dir, vectors)
+            _write_manifest(version_dir, manifest)
+        except BaseException:
+            shutil.rmtree(version_dir, ignore_errors=True)
+            raise
+        _publish_version(path, version_dir)
+    return manifest
+
+
+def _open_store(directory):
+    if not os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+        return None
+
+    with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported embedding store version {manifest.get('format_version')} in {directory}")
+
+    vectors = np.load(os.path.join(directory, manifest['vectors_file']), mmap_mode="r")
+    with open(os.path.join(directory, manifest['metadata_file']), encoding="utf-8") as f:
+        metadata = json.load(f)
+
+    arrays = {name: np.load(os.path.join(directory, filename), mmap_mode="r")
+              for name, filename in manifest.get('arrays', {}).items()}
+    quantized = {dtype: (np.load(os.path.join(directory, entry['file']), mmap_mode="r"), entry.get('scales'))
+                 for dtype, entry in manifest.get('quantized', {}).items()}
+
+    if vectors.shape[0] != manifest['count']:
+        raise ValueError(f"Embedding store {directory} is inconsistent: manifest says {manifest['count']} rows, found {vectors.shape[0]}")
+    return EmbeddingStore(directory, vectors, metadata, manifest, arrays, quantized)
+
+
+def load_store(path):
+    """Open the live version of a store with memory-mapped vectors; returns None if it does not exist
+
+    No lock is needed: a version's files never change once CURRENT names it.
+    """
+    for _ in range(3):
+        directory = current_version_dir(path)
+        try:
+            return _open_store(directory)
+        except FileNotFoundError:
+            # Pruned by builds published since CURRENT was read; resolve it again
+            if current_version_dir(path) == directory:
+                raise
+    return _open_store(current_version_dir(path))
+
+
+def store_fingerprint(manifest):
+    """Identifier that changes whenever the store is rebuilt"""
+    return f"{manifest.get('model_name')}:{manifest.get('count')}:{manifest.get('created_at')}"
+
+
+def content_hashes(texts):
+    """Hex blake2b-128 digest of each text, as a fixed-width bytes array"""
+    return np.array([hashlib.blake2b(str(text).encode("utf-8"), digest_size=16).hexdigest() for text in texts],
+                    dtype="S32")
+
+
+def stored_hashes(store, text_column):
+    """Row hashes of a store; recomputed from its text column for stores written before row_hash"""
+    if ROW_HASH_ARRAY in store.arrays:
+        return np.asarray(store.arrays[ROW_HASH_ARRAY])
+    return content_hashes(store.column(text_column))
+
+
+def is_stale(store, texts, text_column, model_name=MODEL_NAME):
+    """True if the store was built with another model or from texts other than `texts`"""
+    if store.manifest.get('model_name') != model_name:
+        return True
+    current = content_hashes(texts)
+    return len(current) != len(store) or not np.array_equal(current, stored_hashes(store, text_column))
+
+
+def hash_offsets(store, text_column, model_name=MODEL_NAME):
+    """Row hash -> vector offset for a store built with `model_name` (empty otherwise)"""
+    if store is None or store.manifest.get('model_name') != model_name:
+        return {}
+    return {row_hash: offset for offset, row_hash in enumerate(stored_hashes(store, text_column))}
+
+
+def incremental_vectors(texts, store, text_column, encode, model_name=MODEL_NAME, offsets=None):
+    """Vectors for `texts`, encoding only rows whose content hash is not already in `store`
+
+    Rows are matched by hash rather than position, so inserted or reordered
+    rows keep their vectors and deleted rows are simply not carried over.
+    Pass `offsets` (see hash_offsets) when calling this once per batch.
+    Returns (normalized vectors, row hashes, {'reused', 'encoded', 'dropped'}).
+    """
+    hashes = content_hashes(texts)
+    if offsets is None:
+        offsets = hash_offsets(store, text_column, model_name)
+
+    reuse = np.array([offsets.get(row_hash, -1) for row_hash in hashes], dtype=np.int64)
+    kept = np.flatnonzero(reuse >= 0)
+    changed = np.flatnonzero(reuse < 0)
+
+    encoded = normalize_rows(encode([texts[i] for i in changed])) if len(changed) else None
+    dimension = encoded.shape[1] if encoded is not None else store.vectors.shape[1]
+    vectors = np.empty((len(texts), dimension), dtype=np.float32)
+    if len(kept):
+        vectors[kept] = store.vectors[reuse[kept]]
+    if encoded is not None:
+        vectors[changed] = encoded
+
+    stats = {
+        'reused': int(len(kept)),
+        'encoded': int(len(changed)),
+        'dropped': int(len(store) - len(np.unique(reuse[kept]))) if store is not None else 0,
+    }
+    return vectors, hashes, stats
+
+
+class StoreWriter:
+    """Builds a store row batch by row batch with bounded memory, resumable after a crash
+
+    Batches are appended to raw files under <path>/.partial and a checkpoint
+    is written after each one. A writer opened with the same `signature`
+    (e.g. source file sizes/mtimes) continues after the last checkpointed
+    row; otherwise the partial build is discarded. finalize() converts the
+    partial files into a new store version and publishes it.
+    """
+
+    PARTIAL_DIR = ".partial"
+    COPY_ROWS = 65536
+
+    def __init__(self, path, columns, signature, model_name=MODEL_NAME):
+        self.path = path
+        self.columns = list(columns)
+        self.model_name = model_name
+        self.partial = os.path.join(path, self.PARTIAL_DIR)
+        self.state = {'signature': signature, 'model_name': model_name, 'columns': self.columns,
+                      'rows': 0, 'dimension': None, 'metadata_bytes': 0}
+
+        checkpoint = self._read_checkpoint()
+        if checkpoint and all(checkpoint.get(k) == self.state[k] for k in ('signature', 'model_name', 'columns')):
+            self.state = checkpoint
+        elif os.path.exists(self.partial):
+            shutil.rmtree(self.partial)
+        os.makedirs(self.partial, exist_ok=True)
+        self._truncate_to_checkpoint()
+
+    @property
+    def rows(self):
+        return self.state['rows']
+
+    def _file(self, name):
+        return os.path.join(self.partial, name)
+
+    def _read_checkpoint(self):
+        try:
+            with open(self._file("checkpoint.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _truncate_to_checkpoint(self):
+        """Drop anything written after the last checkpoint (an interrupted append)"""
+        dimension = self.state['dimension'] or 0
+        sizes = {
+            "vectors.f32": self.rows * dimension * 4,
+            "row_hash.bin": self.rows * 32,
+            "metadata.jsonl": self.state['metadata_bytes'],
+        }
+        for name, size in sizes.items():
+            with open(self._file(name), "ab") as f:
+                f.truncate(size)
+
+    def append(self, vectors, metadata_rows, row_hashes):
+        """Append one batch: (n, dim) vectors, n metadata tuples in column order, n row hashes"""
+        vectors = normalize_rows(vectors)
+        if self.state['dimension'] is None:
+            self.state['dimension'] = int(vectors.shape[1])
+        lines = "".join(json.dumps([None if v is None else str(v) for v in row], ensure_ascii=False) + "\n"
+                        for row in metadata_rows).encode("utf-8")
+
+        for name, data in (("vectors.f32", vectors.tobytes()),
+                           ("row_hash.bin", np.asarray(row_hashes, dtype="S32").tobytes()),
+                           ("metadata.jsonl", lines)):
+            with open(self._file(name), "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.state['rows'] += len(vectors)
+        self.state['metadata_bytes'] += len(lines)
+        def write_checkpoint(tmp_path):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+        write_atomic(self._file("checkpoint.json"), write_checkpoint)
+
+    def iter_metadata(self):
+        """Metadata tuples written so far, in row order"""
+        with open(self._file("metadata.jsonl"), encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _copy_to_npy(self, raw_name, dtype, shape, target_dir, target):
+        raw = np.memmap(self._file(raw_name), dtype=dtype, mode="r", shape=shape)
+
+        def write(tmp_path):
+            out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=dtype, shape=shape)
+            for start in range(0, shape[0], self.COPY_ROWS):
+                out[start:start + self.COPY_ROWS] = raw[start:start + self.COPY_ROWS]
+            out.flush()
+            del out
+
+        write_atomic(os.path.join(target_dir, target), write)
+        del raw
+
+    def finalize(self, extra=None):
+        """Write vectors.npy, row_hash.npy, metadata.json and the manifest as a new version, publish it, then drop the partial files"""
+        count, dimension = self.rows, self.state['dimension']
+        if not count:
+            raise ValueError(f"No rows were written to {self.path}")
+
+        # Columnar JSON streamed one column at a time
+        def write_metadata(tmp_path):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("{")
+                for j, name in enumerate(self.columns):
+                    f.write(("," if j else "") + json.dumps(name) + ":[")
+                    for i, row in enumerate(self.iter_metadata()):
+                        f.write(("," if i else "") + json.dumps(row[j], ensure_ascii=False))
+                    f.write("]")
+                f.write("}")
+
+        with store_lock(self.path):
+            version_dir = _new_version_dir(self.path)
+            try:
+                self._copy_to_npy("vectors.f32", np.float32, (count, dimension), version_dir, VECTORS_FILE)
+                self._copy_to_npy("row_hash.bin", "S32", (count,), version_dir, f"{ROW_HASH_ARRAY}.npy")
+                write_atomic(os.path.join(version_dir, METADATA_FILE), write_metadata)
+                manifest = _manifest(self.model_name, count, dimension, self.columns, [ROW_HASH_ARRAY],
+                                     {'content_hash': CONTENT_HASH, **(extra or {})})
+                vectors = np.load(os.path.join(version_dir, VECTORS_FILE), mmap_mode="r")
+                manifest['quantized'] = _write_quantized(version_dir, vectors)
+                del vectors
+                _write_manifest(version_dir, manifest)
+            except BaseException:
+                shutil.rmtree(version_dir, ignore_errors=True)
+                raise
+            _publish_version(self.path, version_dir)
+        shutil.rmtree(self.partial)
+        return manifest
+
+
+def dataframe_columns(df):
+    """Columnar metadata dict from a DataFrame, with NaN mapped to empty strings"""
+    return {col: df[col].fillna("").astype(str).tolist() for col in df.columns}
+
+
+def migrate_pickle(pickle_path, store_path, to_metadata):
+    """One-off conversion of a legacy (data, embeddings) pickle into a store"""
+    if not os.path.exists(pickle_path):
+        return None
+    with store_lock(store_path):
+        if not store_exists(store_path):
+            print(f"[INFO] Migrating {pickle_path} to {store_path}")
+            with open(pickle_path, "rb") as f:
+                data, embeddings = pickle.load(f)
+            save_store(store_path, embeddings, to_metadata(data), extra={'migrated_from': pickle_path})
+    return load_store(store_path)
@@ -0,0 +1,133 @@
+import os
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+
+# A batch is flushed after ENCODE_BATCH_WAIT_MS (counted from its first request)
+# or once it holds ENCODE_BATCH_MAX_ITEMS texts, whichever comes first.
+ENCODE_SCHEDULER = os.getenv("ENCODE_SCHEDULER", "1") != "0"
+ENCODE_BATCH_WAIT_MS = float(os.getenv("ENCODE_BATCH_WAIT_MS", "3"))
+ENCODE_BATCH_MAX_ITEMS = int(os.getenv("ENCODE_BATCH_MAX_ITEMS", "64"))
+METRIC_SAMPLES = 1024
+
+
+class _Request:
+    __slots__ = ("texts", "future", "enqueued_at")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class EncodeScheduler:
+    """Micro-batches concurrent encode requests into single model calls
+
+    Request threads submit() texts and block on a Future; one daemon worker
+    drains the queue into batches and runs `encode_batch` once per batch, so
+    N concurrent single-sentence requests cost one forward pass instead of N.
+    """
+
+    def __init__(self, encode_batch, max_wait_ms=ENCODE_BATCH_WAIT_MS, max_items=ENCODE_BATCH_MAX_ITEMS):
+        self.encode_batch = encode_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_items = max_items
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+        self._metrics_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.texts = 0
+        self.errors = 0
+        self._batch_sizes = deque(maxlen=METRIC_SAMPLES)
+        self._wait_ms = deque(maxlen=METRIC_SAMPLES)
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="encode-scheduler", daemon=True)
+                    self._worker.start()
+
+    def submit(self, texts):
+        """Queue texts for the next batch; the Future resolves to their (n, dim) vectors"""
+        self._ensure_worker()
+        request = _Request(list(texts))
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, texts):
+        return self.submit(texts).result()
+
+    def _collect(self):
+        """Block for one request, then gather more until the size or time limit is hit"""
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = batch[0].enqueued_at + self.max_wait
+        while size < self.max_items:
+            remaining = deadline - time.perf_counter()
+            try:
+                # Past the deadline, still take whatever is already queued
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            texts = [text for request in batch for text in request.texts]
+
+            with self._metrics_lock:
+                self.batches += 1
+                self.requests += len(batch)
+                self.texts += len(texts)
+                self._batch_sizes.append(len(texts))
+                self._wait_ms.extend(1000 * (started - request.enqueued_at) for request in batch)
+
+            try:
+                vectors = np.asarray(self.encode_batch(texts), dtype=np.float32)
+            except Exception as e:
+                with self._metrics_lock:
+                    self.errors += 1
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            offset = 0
+            for request in batch:
+                request.future.set_result(vectors[offset:offset + len(request.texts)])
+                offset += len(request.texts)
+
+    def stats(self):
+        """Batch size and queue wait metrics over the last METRIC_SAMPLES batches / requests"""
+        with self._metrics_lock:
+            sizes = np.array(self._batch_sizes, dtype=np.float64)
+            waits = np.array(self._wait_ms, dtype=np.float64)
+            stats = {
+                'max_wait_ms': self.max_wait * 1000,
+                'max_items': self.max_items,
+                'batches': self.batches,
+                'requests': self.requests,
+                'texts': self.texts,
+                'errors': self.errors,
+                'queued': self._queue.qsize(),
+            }
+        if len(sizes):
+            stats.update({
+                'batch_size_mean': round(float(sizes.mean()), 2),
+                'batch_size_p95': float(np.percentile(sizes, 95)),
+                'batch_size_max': int(sizes.max()),
+                'queue_wait_ms_p50': round(float(np.percentile(waits, 50)), 3),
+                'queue_wait_ms_p95': round(float(np.percentile(waits, 95)), 3),
+                'queue_wait_ms_max': round(float(waits.max()), 3),
+            })
+        return stats
@@ -1,260 +1,371 @@
-import os
-import re
-import pickle
-import numpy as np
-import ssl
-import urllib.request
-from sentence_transformers import SentenceTransformer
-from google import genai
-from google.genai.types import GenerateContentConfig
-from dotenv import load_dotenv
-import pandas as pd
-
-# Fix SSL certificate issues
-try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
-    pass
-else:
-    ssl._create_default_https_context = _create_unverified_https_context
-
-# Load .env
-load_dotenv()
-
-def make_json_safe(record: dict):
-    """Convert numpy types to native Python types for JSON serialization"""
-    safe_record = {}
-    for k, v in record.items():
-        if isinstance(v, (np.int32, np.int64)):
-            safe_record[k] = int(v)
-        elif isinstance(v, (np.float32, np.float64)):
-            safe_record[k] = float(v)
-        else:
-            safe_record[k] = v
-    return safe_record
-
-class FIRRAGModel:
-    def __init__(self, sections_csv_path):
-        self.sections_df = pd.read_csv(sections_csv_path)
-        self.embedder = SentenceTransformer("all-MiniLM-L6-v2")
-        
-        # Initialize Gemini client with error handling
-        try:
-            api_key = os.getenv("GEMINI_API_KEY")
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY not found in environment variables")
-            
-            self.client = genai.Client(api_key=api_key)
-            self.gemini_available = True
-            print("✅ Gemini client initialized successfully")
-        except Exception as e:
-            print(f"❌ Gemini initialization failed: {e}")
-            self.client = None
-            self.gemini_available = False
-        
-        self.embeddings = None
-        self.knowledge_base = None
-        
-    def prepare_knowledge_base(self):
-        """Create a comprehensive knowledge base from sections data"""
-        knowledge_items = []
-        
-        for _, row in self.sections_df.iterrows():
-            # Create multiple context variations for better matching
-            item1 = f"IPC Section {row['section_number']}: {row['section_title']}. Description: {row['description']}"
-            item2 = f"Punishment: {row['punishment']}. Use cases: {row['example_use_cases']}"
-            item3 = f"Legal section {row['section_number']} applies to {row['example_use_cases']}"
-            
-            knowledge_items.extend([item1, item2, item3])
-        
-        self.knowledge_base = knowledge_items
-        return knowledge_items
-    
-    def train_embeddings(self, save_path="models/fir_embeddings.pkl"):
-        """Train and save embeddings"""
-        if self.knowledge_base is None:
-            self.prepare_knowledge_base()
-        
-        print("Training FIR embeddings...")
-        self.embeddings = self.embedder.encode(self.knowledge_base, convert_to_numpy=True)
-        
-        # Save embeddings and knowledge base
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        with open(save_path, 'wb') as f:
-            pickle.dump((self.knowledge_base, self.embeddings), f)
-        
-        print(f"FIR embeddings trained and saved to {save_path}")
-        return self.embeddings
-    
-    def load_embeddings(self, embeddings_path="models/fir_embeddings.pkl"):
-        """Load pre-trained embeddings"""
-        try:
-            with open(embeddings_path, 'rb') as f:
-                self.knowledge_base, self.embeddings = pickle.load(f)
-            print("✅ FIR embeddings loaded successfully!")
-            return True
-        except FileNotFoundError:
-            print("❌ FIR embeddings not found. Please train first.")
-            return False
-    
-    def search_sections(self, incident_description, top_k=3, threshold=0.4):
-        """Search for relevant IPC sections based on incident description"""
-        if self.embeddings is None:
-            if not self.load_embeddings():
-                return []
-        
-        query_embedding = self.embedder.encode([incident_description], convert_to_numpy=True)[0]
-        
-        # Calculate cosine similarities
-        similarities = np.dot(self.embeddings, query_embedding) / (
-            np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
-        )
-        
-        # Get top matches
-        top_indices = np.argsort(similarities)[::-1][:top_k]
-        
-        results = []
-        for idx in top_indices:
-            if similarities[idx] > threshold:
-                # Extract section number from knowledge text
-                knowledge_text = self.knowledge_base[idx]
-                section_match = re.search(r'Section\s+(\d+[A-Z]*)', knowledge_text)
-                section_num = section_match.group(1) if section_match else "Unknown"
-                
-                # Get section details from CSV
-                section_details = self.get_section_details([section_num])
-                if section_details:
-                    record = {
-                        'section_number': section_num,
-                        'section_title': section_details[0]['section_title'],
-                        'description': section_details[0]['description'],
-                        'punishment': section_details[0]['punishment'],
-                        'confidence': float(similarities[idx]),
-                        'source_index': int(idx)
-                    }
-                    results.append(make_json_safe(record))
-        
-        return results
-    
-    def get_section_details(self, section_numbers):
-        """Get detailed information for specific section numbers"""
-        details = []
-        for section_num in section_numbers:
-            section_data = self.sections_df[
-                self.sections_df['section_number'].astype(str) == str(section_num)
-            ]
-            if not section_data.empty:
-                record = section_data.iloc[0].to_dict()
-                details.append(make_json_safe(record))
-        return details
-    
-    def direct_keyword_matching(self, incident_description):
-        """Direct keyword matching for common crimes"""
-        keywords_to_sections = {
-            'theft': ['378', '379'],
-            'robbery': ['390', '392'],
-            'murder': ['300', '302'],
-            'assault': ['351', '352'],
-            'cheating': ['415', '420'],
-            'fraud': ['415', '420'],
-            'rape': ['375', '376'],
-            'kidnapping': ['359', '363'],
-            'cyber crime': ['66C', '66D'],
-            'bribery': ['171E', '171F'],
-            'threat': ['503', '506'],
-            'harassment': ['354', '509'],
-            'burglary': ['445', '447'],
-            'forgery': ['463', '465'],
-            'extortion': ['383', '384']
-        }
-        
-        incident_lower = incident_description.lower()
-        matched_sections = []
-        
-        for keyword, sections in keywords_to_sections.items():
-            if keyword in incident_lower:
-                for section_num in sections:
-                    section_details = self.get_section_details([section_num])
-                    if section_details:
-                        record = make_json_safe(section_details[0])
-                        record['confidence'] = 0.9  # High confidence for direct match
-                        matched_sections.append(record)
-        
-        return matched_sections
-    
-    def suggest_sections(self, incident_description):
-        """Main function to suggest IPC sections for an incident"""
-        # First, try direct keyword matching
-        direct_matches = self.direct_keyword_matching(incident_description)
-        if direct_matches:
-            return direct_matches
-        
-        # Then use semantic search
-        search_results = self.search_sections(incident_description, top_k=5, threshold=0.3)
-        
-        # Remove duplicates and sort by confidence
-        unique_sections = {}
-        for section in search_results:
-            section_num = section['section_number']
-            if section_num not in unique_sections or section['confidence'] > unique_sections[section_num]['confidence']:
-                unique_sections[section_num] = section
-        
-        return list(unique_sections.values())
-    
-    def gemini_fallback(self, incident_description):
-        """Fallback to Gemini if RAG doesn't find good matches"""
-        if not self.gemini_available:
-            return "AI service temporarily unavailable. Please try basic keyword search or consult legal resources."
-        
-        prompt = f"""
-        You are a legal expert. Based on this incident description, suggest appropriate IPC sections:
-        
-        Incident: {incident_description}
-        
-        Provide response in this format:
-        Section XXXX: [Title] - [Brief explanation why it applies]
-        Section YYYY: [Title] - [Brief explanation why it applies]
-        
-        Suggest 2-3 most relevant sections. Be concise and accurate.
-        """
-        
-        try:
-            response = self.client.models.generate_content(
-                model="models/gemini-2.5-flash",
-                contents=prompt,
-                config=GenerateContentConfig(temperature=0.2),
-            )
-            return response.text
-        except Exception as e:
-            return f"AI service error: {str(e)}. Please try basic keyword search or consult legal resources."
-
-# Simple test function
-def test_model():
-    """Test the FIR RAG model"""
-    rag_model = FIRRAGModel("data/section.csv")
-    
-    # Load or train embeddings
-    if not rag_model.load_embeddings():
-        print("Training new embeddings...")
-        rag_model.train_embeddings()
-    
-    # Test queries
-    test_queries = [
-        "Someone stole my phone",
-        "A person threatened me with a knife",
-        "I received a fake job offer"
-    ]
-    
-    for query in test_queries:
-        print(f"\n🔍 Query: {query}")
-        suggestions = rag_model.suggest_sections(query)
-        if suggestions:
-            for section in suggestions[:3]:  # Show top 3
-                print(f"✅ Section {section['section_number']}: {section['section_title']} (Confidence: {section.get('confidence', 0):.2f})")
-        else:
-            print("❌ No sections found. Using fallback...")
-            fallback = rag_model.gemini_fallback(query)
-            print(f"🤖 {fallback}")
-
-if __name__ == "__main__":
-    test_model()
+import os
+import re
+import argparse
+import numpy as np
+import ssl
+import urllib.request
+from google import genai
+from google.genai.types import GenerateContentConfig
+from dotenv import load_dotenv
+import pandas as pd
+from scripts.embedding_service import get_embedding_service
+from scripts.vector_search import normalize_rows, normalize_vector, top_k_indices
+from scripts.embedding_store import (
+    AUTO_REBUILD, FIR_STORE_DIR, ROW_HASH_ARRAY, CONTENT_HASH,
+    load_store, save_store, store_lock, migrate_pickle, is_stale, incremental_vectors,
+)
+from scripts.section_index import normalize_section_id
+from scripts.quantization import EMBEDDING_DTYPE
+from scripts.keyword_matcher import KeywordMatcher
+
+# Fix SSL certificate issues
+try:
+    _create_unverified_https_context = ssl._create_unverified_context
+except AttributeError:
+    pass
+else:
+    ssl._create_default_https_context = _create_unverified_https_context
+
+# Load .env
+load_dotenv()
+
+LEGACY_FIR_EMB_FILE = os.path.join("models", "fir_embeddings.pkl")
+
+def make_json_safe(record: dict):
+    """Convert numpy types to native Python types for JSON serialization"""
+    safe_record = {}
+    for k, v in record.items():
+        if isinstance(v, (np.int32, np.int64)):
+            safe_record[k] = int(v)
+        elif isinstance(v, (np.float32, np.float64)):
+            safe_record[k] = float(v)
+        else:
+            safe_record[k] = v
+    return safe_record
+
+class FIRRAGModel:
+    def __init__(self, sections_csv_path):
+        self.sections_df = pd.read_csv(sections_csv_path)
+        self.section_index = self._build_section_index()
+        # Compiled once from data/keyword_sections.csv (keyword, sections, synonyms, context rules)
+        self.keyword_matcher = KeywordMatcher.from_csv(
+            os.path.join(os.path.dirname(sections_csv_path), "keyword_sections.csv"))
+        self.embedder = get_embedding_service()
+        
+        # Initialize Gemini client with error handling
+        try:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                raise ValueError("GEMINI_API_KEY not found in environment variables")
+            
+            self.client = genai.Client(api_key=api_key)
+            self.gemini_available = True
+            print("✅ Gemini client initialized successfully")
+        except Exception as e:
+            print(f"❌ Gemini initialization failed: {e}")
+            self.client = None
+            self.gemini_available = False
+        
+        self.embeddings = None
+        self.quantized = None
+        self.knowledge_base = None
+        self.row_sections = None
+        
+    def prepare_knowledge_base(self):
+        """Create a comprehensive knowledge base from sections data"""
+        knowledge_items = []
+        row_sections = []
+        
+        for _, row in self.sections_df.iterrows():
+            # Create multiple context variations for better matching
+            item1 = f"IPC Section {row['section_number']}: {row['section_title']}. Description: {row['description']}"
+            item2 = f"Punishment: {row['punishment']}. Use cases: {row['example_use_cases']}"
+            item3 = f"Legal section {row['section_number']} applies to {row['example_use_cases']}"
+            
+            knowledge_items.extend([item1, item2, item3])
+            row_sections.extend([normalize_section_id(row['section_number'])] * 3)
+        
+        self.knowledge_base = knowledge_items
+        self.row_sections = row_sections
+        return knowledge_items
+    
+    def train_embeddings(self, save_path=FIR_STORE_DIR, full=False):
+        """Encode new/changed knowledge rows (all of them if full=True) and save the store"""
+        if self.knowledge_base is None:
+            self.prepare_knowledge_base()
+        
+        print("Training FIR embeddings...")
+        with store_lock(save_path):
+            previous = None if full else load_store(save_path)
+            embeddings, row_hashes, stats = incremental_vectors(
+                self.knowledge_base, previous, 'text', lambda texts: self.embedder.encode(texts, convert_to_numpy=True))
+            previous = None  # release the memory map before its files are replaced
+            print(f"{stats['encoded']} rows encoded, {stats['reused']} reused, {stats['dropped']} dropped")
+            
+            # Save normalized vectors + knowledge text + row -> section code as a memory-mappable store
+            section_ids = list(dict.fromkeys(self.row_sections))
+            code_of = {section_id: code for code, section_id in enumerate(section_ids)}
+            row_section = np.array([code_of[sid] for sid in self.row_sections], dtype=np.int32)
+            save_store(save_path, embeddings, {'text': self.knowledge_base},
+                       extra={'section_ids': section_ids, 'content_hash': CONTENT_HASH},
+                       arrays={'row_section': row_section, ROW_HASH_ARRAY: row_hashes})
+        self._set_row_sections(row_section, section_ids)
+        store = load_store(save_path)
+        self.embeddings = store.vectors
+        self.quantized = store.quantized_matrix(EMBEDDING_DTYPE)
+        
+        print(f"FIR embeddings trained and saved to {save_path}")
+        return self.embeddings
+    
+    def load_embeddings(self, embeddings_path=FIR_STORE_DIR):
+        """Load pre-trained embeddings (memory-mapped, already L2-normalized)"""
+        store = load_store(embeddings_path)
+        if store is None:
+            store = migrate_pickle(LEGACY_FIR_EMB_FILE, embeddings_path, lambda kb: {'text': list(kb)})
+        if store is None:
+            print("❌ FIR embeddings not found. Please train first.")
+            return False
+        
+        # section.csv edited since the store was built: re-encode only the changed rows
+        if AUTO_REBUILD and is_stale(store, self.prepare_knowledge_base(), 'text'):
+            print("⚠️ section.csv changed since the last training; updating FIR embeddings")
+            store = None
+            with store_lock(embeddings_path):
+                # Another worker may have retrained while we waited for the lock
+                store = load_store(embeddings_path)
+                if is_stale(store, self.knowledge_base, 'text'):
+                    store = None
+                    self.train_embeddings(embeddings_path)
+                    return True
+        
+        self.knowledge_base = store.column('text')
+        self.embeddings = store.vectors
+        self.quantized = store.quantized_matrix(EMBEDDING_DTYPE)
+        if 'row_section' in store.arrays:
+            self._set_row_sections(store.arrays['row_section'], store.manifest['section_ids'])
+        else:
+            self._set_row_sections(*self._row_sections_from_text(self.knowledge_base))
+        print("✅ FIR embeddings loaded successfully!")
+        return True
+    
+    @staticmethod
+    def _row_sections_from_text(knowledge_base):
+        """Recover row -> section codes for stores written before row_section existed.
+        
+        Rows come in per-section groups that start with "IPC Section <id>: ..."
+        (see prepare_knowledge_base); the following rows belong to that section.
+        """
+        section_ids, codes, current = [], [], -1
+        for text in knowledge_base:
+            match = re.match(r'IPC Section\s+(\d+[A-Z]*):', text, re.IGNORECASE)
+            if match:
+                section_ids.append(normalize_section_id(match.group(1)))
+                current = len(section_ids) - 1
+            codes.append(current)
+        return np.array(codes, dtype=np.int32), section_ids
+    
+    def _set_row_sections(self, row_section, section_ids):
+        """Precompute the group-by layout used to pool row scores per section"""
+        row_section = np.asarray(row_section, dtype=np.int32)
+        order = np.argsort(row_section, kind='stable')
+        sorted_codes = row_section[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        
+        # Rows are normally already grouped by section, which skips a gather per query
+        self._row_order = None if np.array_equal(order, np.arange(len(order))) else order
+        self._group_starts = starts
+        self._group_ends = np.r_[starts[1:], len(order)]
+        self._group_section_ids = [section_ids[c] if c >= 0 else None for c in sorted_codes[starts]]
+    
+    def _row_scores(self, query_embeddings, top_k):
+        """(queries, rows) similarities; with EMBEDDING_DTYPE=float16/int8 only the best rows are exact"""
+        if self.quantized is not None:
+            # Up to 3 knowledge rows per section
+            return self.quantized.scores(query_embeddings, 3 * top_k)
+        return query_embeddings @ self.embeddings.T
+    
+    def _section_scores(self, scores):
+        """Per-section max of row scores (last axis) in one np.maximum.reduceat pass"""
+        if self._row_order is not None:
+            scores = scores[..., self._row_order]
+        return np.maximum.reduceat(scores, self._group_starts, axis=-1)
+    
+    def search_sections(self, incident_description, top_k=3, threshold=0.4):
+        """Search for the top distinct IPC sections based on incident description"""
+        if self.embeddings is None:
+            if not self.load_embeddings():
+                return []
+        
+        query_embedding = normalize_vector(self.embedder.encode_query(incident_description))
+        
+        # Row similarities (one mat-vec) pooled to one score per section
+        row_scores = self._row_scores(query_embedding[None, :], top_k)[0]
+        section_scores = self._section_scores(row_scores)
+        top_groups = top_k_indices(section_scores, top_k)
+        
+        return self._section_hits(top_groups, section_scores[top_groups], row_scores, threshold)
+    
+    def search_sections_many(self, incident_descriptions, top_k=3, threshold=0.4):
+        """Batched search_sections: one encode call and one matrix multiply for all descriptions"""
+        if not incident_descriptions:
+            return []
+        if self.embeddings is None:
+            if not self.load_embeddings():
+                return [[] for _ in incident_descriptions]
+        
+        query_embeddings = normalize_rows(self.embedder.encode_queries(list(incident_descriptions)))
+        row_scores = self._row_scores(query_embeddings, top_k)
+        section_scores = self._section_scores(row_scores)
+        top_groups = top_k_indices(section_scores, top_k)
+        
+        return [self._section_hits(groups, scores[groups], rows, threshold)
+                for groups, scores, rows in zip(top_groups, section_scores, row_scores)]
+    
+    def _section_hits(self, top_groups, top_scores, row_scores, threshold):
+        """Turn ranked section groups into section records above threshold"""
+        results = []
+        for group, score in zip(top_groups, top_scores):
+            section_num = self._group_section_ids[group]
+            if score <= threshold or section_num is None:
+                continue
+            
+            section_details = self.get_section_details([section_num])
+            if section_details:
+                # Best-scoring knowledge row within this section
+                rows = np.arange(self._group_starts[group], self._group_ends[group])
+                if self._row_order is not None:
+                    rows = self._row_order[rows]
+                best_row = rows[np.argmax(row_scores[rows])]
+                
+                record = {
+                    'section_number': section_num,
+                    'section_title': section_details[0]['section_title'],
+                    'description': section_details[0]['description'],
+                    'punishment': section_details[0]['punishment'],
+                    'confidence': float(score),
+                    'source_index': int(best_row)
+                }
+                results.append(make_json_safe(record))
+        
+        return results
+    
+    def _build_section_index(self):
+        """Section id -> JSON-safe record, built once (first row wins, as before)"""
+        index = {}
+        for record in self.sections_df.to_dict('records'):
+            key = normalize_section_id(record['section_number'])
+            if key not in index:
+                index[key] = make_json_safe(record)
+        return index
+    
+    def get_section_details(self, section_numbers):
+        """Get detailed information for specific section numbers"""
+        details = []
+        for section_num in section_numbers:
+            record = self.section_index.get(normalize_section_id(section_num))
+            if record is not None:
+                details.append(dict(record))
+        return details
+    
+    def direct_keyword_matching(self, incident_description):
+        """Direct keyword matching for common crimes (single pass, word-bounded)"""
+        matched_sections = []
+        
+        for section_num, keyword in self.keyword_matcher.match_sections(incident_description).items():
+            section_details = self.get_section_details([section_num])
+            if section_details:
+                record = section_details[0]
+                record['confidence'] = 0.9  # High confidence for direct match
+                record['matched_keyword'] = keyword
+                matched_sections.append(record)
+        
+        return matched_sections
+    
+    def suggest_sections(self, incident_description):
+        """Main function to suggest IPC sections for an incident"""
+        # First, try direct keyword matching
+        direct_matches = self.direct_keyword_matching(incident_description)
+        if direct_matches:
+            return direct_matches
+        
+        # Then use semantic search (already one result per section)
+        return self.search_sections(incident_description, top_k=5, threshold=0.3)
+    
+    def suggest_sections_many(self, incident_descriptions):
+        """Batched suggest_sections; returns one suggestion list per description"""
+        suggestions = [self.direct_keyword_matching(d) for d in incident_descriptions]
+        
+        # Everything without a direct keyword hit goes through one batched semantic search
+        pending = [i for i, matches in enumerate(suggestions) if not matches]
+        if pending:
+            batch_results = self.search_sections_many(
+                [incident_descriptions[i] for i in pending], top_k=5, threshold=0.3)
+            for i, search_results in zip(pending, batch_results):
+                suggestions[i] = search_results
+        
+        return suggestions
+    
+    def gemini_fallback(self, incident_description):
+        """Fallback to Gemini if RAG doesn't find good matches"""
+        if not self.gemini_available:
+            return "AI service temporarily unavailable. Please try basic keyword search or consult legal resources."
+        
+        prompt = f"""
+        You are a legal expert. Based on this incident description, suggest appropriate IPC sections:
+        
+        Incident: {incident_description}
+        
+        Provide response in this format:
+        Section XXXX: [Title] - [Brief explanation why it applies]
+        Section YYYY: [Title] - [Brief explanation why it applies]
+        
+        Suggest 2-3 most relevant sections. Be concise and accurate.
+        """
+        
+        try:
+            response = self.client.models.generate_content(
+                model="models/gemini-2.5-flash",
+                contents=prompt,
+                config=GenerateContentConfig(temperature=0.2),
+            )
+            return response.text
+        except Exception as e:
+            return f"AI service error: {str(e)}. Please try basic keyword search or consult legal resources."
+
+# Simple test function
+def test_model():
+    """Test the FIR RAG model"""
+    rag_model = FIRRAGModel("data/section.csv")
+    
+    # Load or train embeddings
+    if not rag_model.load_embeddings():
+        print("Training new embeddings...")
+        rag_model.train_embeddings()
+    
+    # Test queries
+    test_queries = [
+        "Someone stole my phone",
+        "A person threatened me with a knife",
+        "I received a fake job offer"
+    ]
+    
+    for query in test_queries:
+        print(f"\n🔍 Query: {query}")
+        suggestions = rag_model.suggest_sections(query)
+        if suggestions:
+            for section in suggestions[:3]:  # Show top 3
+                print(f"✅ Section {section['section_number']}: {section['section_title']} (Confidence: {section.get('confidence', 0):.2f})")
+        else:
+            print("❌ No sections found. Using fallback...")
+            fallback = rag_model.gemini_fallback(query)
+            print(f"🤖 {fallback}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or test the FIR RAG model")
+    parser.add_argument("--train", action="store_true", help="update the FIR embedding store from data/section.csv")
+    parser.add_argument("--full", action="store_true", help="with --train, re-encode every row")
+    args = parser.parse_args()
+    if args.train:
+        FIRRAGModel("data/section.csv").train_embeddings(full=args.full)
+    else:
+        test_model()
@@ -0,0 +1,332 @@
+import os
+import time
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+FIR_ROLLUP_DB = os.getenv("FIR_ROLLUP_DB", os.path.join("models", "fir_rollups.sqlite3"))
+BACKFILL_PAGE_SIZE = 1000
+# Rollups only see writes made through this service, so they are re-derived from
+# fir_records every RECONCILE_SECONDS (deletes and direct edits included) and stop
+# being `ready` once the last full pass is older than MAX_AGE_SECONDS
+RECONCILE_SECONDS = int(os.getenv("FIR_ROLLUP_RECONCILE_SECONDS", "3600"))
+MAX_AGE_SECONDS = int(os.getenv("FIR_ROLLUP_MAX_AGE_SECONDS", str(2 * RECONCILE_SECONDS)))
+
+# fir_records columns a rollup row is derived from
+ROLLUP_COLUMNS = ['id', 'fir_number', 'incident_date', 'incident_time', 'police_station', 'district',
+                  'incident_type', 'incident_location', 'status']
+WEEKDAYS = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+# Group-by expressions callers may ask for (never interpolate anything else into SQL)
+GROUPS = {
+    'day': "day",
+    'hour': "hour",
+    'weekday': "CAST(strftime('%w', day) AS INTEGER)",
+    'police_station': "police_station",
+    'district': "district",
+    'incident_type': "incident_type",
+    'status': "status",
+}
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    # Counts per day x station x district x type x hour x status; '' / -1 stand for missing values
+    """CREATE TABLE IF NOT EXISTS fir_rollup (
+        day TEXT NOT NULL, police_station TEXT NOT NULL, district TEXT NOT NULL,
+        incident_type TEXT NOT NULL, hour INTEGER NOT NULL, status TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (day, police_station, district, incident_type, hour, status)
+    )""",
+    """CREATE TABLE IF NOT EXISTS location_rollup (
+        day TEXT NOT NULL, police_station TEXT NOT NULL, district TEXT NOT NULL,
+        incident_location TEXT NOT NULL, count INTEGER NOT NULL,
+        PRIMARY KEY (day, police_station, district, incident_location)
+    )""",
+    # What each FIR currently contributes, so re-recording it (status change,
+    # backfill over live data) moves its count instead of adding a second one
+    """CREATE TABLE IF NOT EXISTS rollup_firs (
+        fir_number TEXT PRIMARY KEY, day TEXT NOT NULL, police_station TEXT NOT NULL,
+        district TEXT NOT NULL, incident_type TEXT NOT NULL, hour INTEGER NOT NULL,
+        status TEXT NOT NULL, incident_location TEXT NOT NULL
+    )""",
+]
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def _hour(incident_time):
+    try:
+        return int(_text(incident_time).split(':')[0])
+    except ValueError:
+        return -1
+
+
+def rollup_key(record):
+    """fir_records row -> (day, police_station, district, incident_type, hour, status, incident_location)"""
+    return (_text(record.get('incident_date'))[:10], _text(record.get('police_station')),
+            _text(record.get('district')), _text(record.get('incident_type')),
+            _hour(record.get('incident_time')), _text(record.get('status')),
+            _text(record.get('incident_location')))
+
+
+class FIRRollups:
+    """Pre-aggregated FIR counts for dashboard statistics (sqlite, local to the FIR service)
+
+    Updated on every FIR insert and status change, so reads scan a few
+    cells per day in the requested range instead of every FIR. Until a
+    backfill has run the tables only cover FIRs created since, and `ready`
+    is False so callers keep querying fir_records directly. Changes made
+    elsewhere (other hosts, deletes, edits in Supabase) are only picked up
+    by the next backfill, so `ready` also lapses when that is overdue.
+    """
+
+    def __init__(self, path=FIR_ROLLUP_DB, max_age=MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # fir_numbers recorded live while a backfill is running (not in its pages)
+        self._recorded_live = None
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Several API workers may share the file; writers queue on sqlite's lock
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+    @property
+    def ready(self):
+        age = self.age()
+        return age is not None and age <= self.max_age
+
+    def age(self):
+        """Seconds since the last completed backfill, None if there never was one"""
+        backfilled_at = self._meta('backfilled_at')
+        if backfilled_at is None:
+            return None
+        return (datetime.now() - datetime.fromisoformat(backfilled_at)).total_seconds()
+
+    def _meta(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # -- writes --------------------------------------------------------------
+
+    @contextmanager
+    def _write(self):
+        """One write transaction, holding sqlite's write lock from the first read
+
+        Recording reads a FIR's previous key and applies a delta; another
+        process doing the same for that FIR in between would apply it twice.
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+
+    def _add(self, key, delta):
+        day, station, district, incident_type, hour, status, location = key
+        self._db.execute(
+            "INSERT INTO fir_rollup (day, police_station, district, incident_type, hour, status, count) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (day, police_station, district, incident_type, hour, status) "
+            "DO UPDATE SET count = count + excluded.count",
+            (day, station, district, incident_type, hour, status, delta))
+        self._db.execute(
+            "INSERT INTO location_rollup (day, police_station, district, incident_location, count) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (day, police_station, district, incident_location) "
+            "DO UPDATE SET count = count + excluded.count",
+            (day, station, district, location, delta))
+
+    def record_many(self, records, live=True):
+        """Add or re-count fir_records rows (insert, status change or backfill); returns rows that changed"""
+        changed = 0
+        with self._write():
+            for record in records:
+                fir_number = record.get('fir_number')
+                if not fir_number:
+                    continue
+                if live and self._recorded_live is not None:
+                    self._recorded_live.add(fir_number)
+                key = rollup_key(record)
+                previous = self._db.execute(
+                    "SELECT day, police_station, district, incident_type, hour, status, incident_location "
+                    "FROM rollup_firs WHERE fir_number = ?", (fir_number,)).fetchone()
+                if previous == key:
+                    continue
+                if previous:
+                    self._add(previous, -1)
+                self._add(key, 1)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO rollup_firs (fir_number, day, police_station, district, "
+                    "incident_type, hour, status, incident_location) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (fir_number, *key))
+                changed += 1
+            if changed:
+                self._db.execute("DELETE FROM fir_rollup WHERE count <= 0")
+                self._db.execute("DELETE FROM location_rollup WHERE count <= 0")
+        return changed
+
+    def record(self, record):
+        return self.record_many([record])
+
+    def backfill(self, supabase, page_size=BACKFILL_PAGE_SIZE):
+        """Re-derive the rollups from every fir_records row, paging on id
+
+        Rows that changed are re-counted and FIRs no longer in fir_records are
+        subtracted, so this doubles as reconciliation. Safe to run while FIRs
+        are being added: ones recorded live during the pass are kept.
+        """
+        last_id, total, started = None, 0, time.time()
+        seen = set()
+        with self._lock:
+            self._recorded_live = set()
+        try:
+            while True:
+                query = supabase.table("fir_records").select(",".join(ROLLUP_COLUMNS))
+                if last_id is not None:
+                    query = query.gt('id', last_id)
+                rows = query.order('id').limit(page_size).execute().data or []
+                if not rows:
+                    break
+                self.record_many(rows, live=False)
+                seen.update(row.get('fir_number') for row in rows)
+                total += len(rows)
+                last_id = rows[-1]['id']
+                print(f"[INFO] Rolled up {total} FIRs")
+
+            with self._write():
+                keep = seen | self._recorded_live
+                gone = [row for row in self._db.execute(
+                    "SELECT fir_number, day, police_station, district, incident_type, hour, status, incident_location "
+                    "FROM rollup_firs").fetchall() if row[0] not in keep]
+                for row in gone:
+                    self._add(row[1:], -1)
+                self._db.executemany("DELETE FROM rollup_firs WHERE fir_number = ?", [(row[0],) for row in gone])
+                self._db.execute("DELETE FROM fir_rollup WHERE count <= 0")
+                self._db.execute("DELETE FROM location_rollup WHERE count <= 0")
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('backfilled_at', ?)",
+                                 (datetime.now().isoformat(),))
+        finally:
+            with self._lock:
+                self._recorded_live = None
+        print(f"✅ Backfilled rollups from {total} FIRs in {time.time() - started:.1f}s ({len(gone)} removed)")
+        return total
+
+    def start_reconciler(self, supabase, interval=RECONCILE_SECONDS):
+        """Daemon thread re-running backfill() whenever the last one is older than `interval`
+
+        Workers sharing the sqlite file see each other's backfilled_at, so
+        normally only one of them does the pass.
+        """
+        def run():
+            while True:
+                try:
+                    age = self.age()
+                    if age is None or age >= interval:
+                        self.backfill(supabase)
+                except Exception as e:
+                    print(f"❌ Rollup reconciliation failed: {e}")
+                time.sleep(max(60, interval // 10))
+
+        thread = threading.Thread(target=run, name="rollup-reconciler", daemon=True)
+        thread.start()
+        return thread
+
+    # -- reads ---------------------------------------------------------------
+
+    @staticmethod
+    def _where(start_date=None, end_date=None, filters=None):
+        clauses, params = [], []
+        if start_date:
+            clauses.append("day >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append("day <= ?")
+            params.append(end_date)
+        for column, value in (filters or {}).items():
+            if column not in ('police_station', 'district', 'incident_type', 'status'):
+                raise ValueError(f"Cannot filter rollups on '{column}'")
+            clauses.append(f"{column} = ?")
+            params.append(_text(value))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def total(self, start_date=None, end_date=None, **filters):
+        where, params = self._where(start_date, end_date, filters)
+        with self._lock:
+            return self._db.execute(f"SELECT COALESCE(SUM(count), 0) FROM fir_rollup{where}", params).fetchone()[0]
+
+    def grouped_counts(self, by, start_date=None, end_date=None, **filters):
+        """{value: count} grouped by one of GROUPS, most frequent first"""
+        if by not in GROUPS:
+            raise ValueError(f"Unknown rollup group '{by}'. Expected one of {list(GROUPS)}")
+        where, params = self._where(start_date, end_date, filters)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {GROUPS[by]} AS value, SUM(count) AS n FROM fir_rollup{where} "
+                f"GROUP BY value ORDER BY n DESC", params).fetchall()
+        if by == 'weekday':
+            return {WEEKDAYS[value]: n for value, n in rows if value is not None}
+        if by == 'hour':
+            return {value: n for value, n in rows if value >= 0}
+        return {value: n for value, n in rows}
+
+    def location_counts(self, start_date=None, end_date=None, min_count=1, limit=None,
+                        police_station=None, district=None):
+        """{incident_location: count} for locations with at least min_count FIRs, most frequent first"""
+        filters = {k: v for k, v in (('police_station', police_station), ('district', district)) if v is not None}
+        where, params = self._where(start_date, end_date, filters)
+        sql = (f"SELECT incident_location, SUM(count) AS n FROM location_rollup{where} "
+               f"GROUP BY incident_location HAVING n >= ? ORDER BY n DESC")
+        params.append(min_count)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            return dict(self._db.execute(sql, params).fetchall())
+
+    def crime_statistics(self, start_date, end_date):
+        """Same payload as SupabaseFIRClient.get_crime_statistics, answered from the rollups"""
+        type_counts = self.grouped_counts('incident_type', start_date, end_date)
+        return {
+            "success": True,
+            "type_counts": type_counts,
+            "total_records": sum(type_counts.values()),
+            "date_range": {"start": start_date, "end": end_date},
+            "source": "rollup"
+        }
+
+    def stats(self):
+        with self._lock:
+            firs = self._db.execute("SELECT COUNT(*) FROM rollup_firs").fetchone()[0]
+            cells = self._db.execute("SELECT COUNT(*) FROM fir_rollup").fetchone()[0]
+            locations = self._db.execute("SELECT COUNT(*) FROM location_rollup").fetchone()[0]
+        return {'firs': firs, 'cells': cells, 'location_cells': locations,
+                'backfilled_at': self._meta('backfilled_at'), 'ready': self.ready}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain FIR dashboard rollups")
+    sub = parser.add_subparsers(dest="command", required=True)
+    backfill_cmd = sub.add_parser("backfill", help="count all existing fir_records rows")
+    backfill_cmd.add_argument("--page-size", type=int, default=BACKFILL_PAGE_SIZE)
+    sub.add_parser("stats", help="print rollup table sizes")
+    args = parser.parse_args()
+
+    rollups = FIRRollups()
+    if args.command == "backfill":
+        from scripts.supabase_client import SupabaseFIRClient
+        rollups.backfill(SupabaseFIRClient().supabase, page_size=args.page_size)
+    else:
+        print(rollups.stats())
@@ -0,0 +1,100 @@
+import os
+import time
+import sqlite3
+import threading
+import numpy as np
+from scripts.embedding_service import MODEL_NAME
+from scripts.embedding_store import content_hashes
+
+FIR_VECTOR_DB = os.getenv("FIR_VECTOR_DB", os.path.join("models", "fir_vectors.sqlite3"))
+SQLITE_MAX_PARAMS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fir_vectors (
+    fir_number TEXT PRIMARY KEY,
+    description_hash TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def description_hash(description):
+    return content_hashes([description or ""])[0].decode("ascii")
+
+
+class FIRVectorStore:
+    """Incident-description embeddings keyed by FIR number (sqlite, local to the FIR service)
+
+    Vectors are written once when the FIR is generated (encoded outside the
+    query cache). Each row keeps the description hash and model name, so an
+    edited description or a model change is treated as missing and
+    re-encoded on the next read.
+    """
+
+    def __init__(self, path=FIR_VECTOR_DB, model_name=MODEL_NAME):
+        self.path = path
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self.metrics = {'stored': 0, 'loaded': 0, 'encoded_on_read': 0}
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def put_many(self, rows):
+        """Store (fir_number, description, vector) rows, replacing older vectors"""
+        now = time.time()
+        records = [(fir_number, description_hash(description), self.model_name,
+                    np.asarray(vector, dtype=np.float32).tobytes(), now)
+                   for fir_number, description, vector in rows]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO fir_vectors (fir_number, description_hash, model_name, vector, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)", records)
+            self._db.commit()
+            self.metrics['stored'] += len(records)
+
+    def put(self, fir_number, description, vector):
+        self.put_many([(fir_number, description, vector)])
+
+    def get_many(self, fir_descriptions):
+        """{fir_number: vector} for FIRs whose stored vector matches the current description and model"""
+        wanted = {fir_number: description_hash(description) for fir_number, description in fir_descriptions}
+        numbers = list(wanted)
+        found = {}
+        with self._lock:
+            for start in range(0, len(numbers), SQLITE_MAX_PARAMS):
+                chunk = numbers[start:start + SQLITE_MAX_PARAMS]
+                rows = self._db.execute(
+                    f"SELECT fir_number, description_hash, vector FROM fir_vectors "
+                    f"WHERE model_name = ? AND fir_number IN ({','.join('?' * len(chunk))})",
+                    [self.model_name, *chunk]).fetchall()
+                for fir_number, stored_hash, blob in rows:
+                    if stored_hash == wanted[fir_number]:
+                        found[fir_number] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def vectors_for(self, cases, encode):
+        """(n, dim) vectors for case dicts, in order; missing or stale ones are encoded in one batch and stored"""
+        keyed = [(case.get('fir_number'), case.get('incident_description') or "") for case in cases]
+        stored = self.get_many([(fir, text) for fir, text in keyed if fir])
+
+        missing = [i for i, (fir, _) in enumerate(keyed) if fir not in stored]
+        encoded = encode([keyed[i][1] for i in missing]) if missing else []
+        self.put_many([(keyed[i][0], keyed[i][1], vector) for i, vector in zip(missing, encoded) if keyed[i][0]])
+
+        with self._lock:
+            self.metrics['loaded'] += len(keyed) - len(missing)
+            self.metrics['encoded_on_read'] += len(missing)
+
+        vectors = dict(zip(missing, encoded))
+        return np.vstack([stored[fir] if fir in stored else vectors[i] for i, (fir, _) in enumerate(keyed)])
+
+    def stats(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM fir_vectors").fetchone()[0]
+            return {**self.metrics, 'size': count, 'model_name': self.model_name}
@@ -0,0 +1,129 @@
+import re
+import csv
+from bisect import bisect_right
+
+# Light stemming for single English words: "threat" also matches "threats",
+# "forge" matches "forged"/"forges". Irregular forms go in the synonyms column.
+INFLECTION_SUFFIX = r"(?:s|es|d|ed|ing)?"
+# Short consonant-vowel-consonant endings double before -ed/-ing: "stab" -> "stabbed"
+DOUBLED_FINAL = re.compile(r"(?:^|[^aeiou])[aeiou]([b-df-hj-np-tvz])$")
+# Context rules look at the sentence around a hit, not the whole description
+SENTENCE_BREAK = re.compile(r"[.!?;\n]+")
+
+
+def _term_pattern(term, stem=True):
+    """Regex for one keyword/synonym: word-bounded, flexible inner whitespace"""
+    words = term.lower().split()
+    body = r"\s+".join(re.escape(w) for w in words)
+    if stem and len(words) == 1 and words[0].isalpha():
+        doubled = DOUBLED_FINAL.search(words[0])
+        if doubled:
+            body += rf"(?:s|es|d|ed|ing|{doubled.group(1)}(?:ed|ing))?"
+        else:
+            body += INFLECTION_SUFFIX
+    return rf"\b{body}\b"
+
+
+def _any_term(terms, stem=True):
+    """One case-insensitive regex matching any of the terms, or None for an empty list"""
+    if not terms:
+        return None
+    return re.compile("|".join(_term_pattern(t, stem) for t in terms), re.IGNORECASE)
+
+
+def _sentence_starts(text):
+    return [0] + [m.end() for m in SENTENCE_BREAK.finditer(text)]
+
+
+def _split_list(value):
+    return [s.strip() for s in (value or "").split("|") if s.strip()]
+
+
+class KeywordMatcher:
+    """Single-pass matcher over a keyword -> sections map
+
+    All keywords and synonyms are compiled into one alternation regex (one
+    named group per distinct term, longest terms first), so matching cost
+    depends on the text length rather than the number of keywords.
+
+    A term may be listed under several keywords ("killed" under homicide,
+    death by negligence and killing of an animal); context rules pick which
+    of them apply. `requires[keyword]` terms must occur in the same sentence
+    as the hit, `unless[keyword]` terms must not.
+    """
+
+    def __init__(self, keyword_sections, synonyms=None, stem=True, requires=None, unless=None):
+        self.keyword_sections = {k.lower(): list(v) for k, v in keyword_sections.items()}
+        self._group_keywords = {}
+
+        terms = {}
+        for keyword in self.keyword_sections:
+            for term in [keyword, *(synonyms or {}).get(keyword, [])]:
+                entry = terms.setdefault(_term_pattern(term, stem), [0, []])
+                entry[0] = max(entry[0], len(term))
+                if keyword not in entry[1]:
+                    entry[1].append(keyword)
+
+        # Longest terms first so "identity theft" wins over "theft" at the same position
+        alternatives = []
+        for i, (pattern, (_, keywords)) in enumerate(sorted(terms.items(), key=lambda t: -t[1][0])):
+            group = f"t{i}"
+            self._group_keywords[group] = keywords
+            alternatives.append(f"(?P<{group}>{pattern})")
+
+        self.pattern = re.compile("|".join(alternatives), re.IGNORECASE) if alternatives else None
+        self._requires = {k.lower(): _any_term(v, stem) for k, v in (requires or {}).items() if v}
+        self._unless = {k.lower(): _any_term(v, stem) for k, v in (unless or {}).items() if v}
+
+    def _in_context(self, keyword, sentence):
+        required = self._requires.get(keyword)
+        if required is not None and not required.search(sentence):
+            return False
+        excluded = self._unless.get(keyword)
+        return excluded is None or not excluded.search(sentence)
+
+    @classmethod
+    def from_csv(cls, path, stem=True):
+        """Load `keyword,sections,synonyms[,requires,unless]` rows; list fields are '|' separated"""
+        keyword_sections, synonyms, requires, unless = {}, {}, {}, {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                keyword = row['keyword'].strip().lower()
+                if not keyword:
+                    continue
+                keyword_sections[keyword] = _split_list(row['sections'])
+                synonyms[keyword] = _split_list(row.get('synonyms'))
+                requires[keyword] = _split_list(row.get('requires'))
+                unless[keyword] = _split_list(row.get('unless'))
+        return cls(keyword_sections, synonyms, stem=stem, requires=requires, unless=unless)
+
+    def find(self, text):
+        """All keyword hits in one pass: [{'keyword', 'matched', 'span', 'sections'}]"""
+        if self.pattern is None or not text:
+            return []
+        hits = []
+        starts = _sentence_starts(text) if self._requires or self._unless else None
+        for match in self.pattern.finditer(text):
+            sentence = None
+            if starts is not None:
+                i = bisect_right(starts, match.start())
+                end = starts[i] if i < len(starts) else len(text)
+                sentence = text[starts[i - 1]:end]
+            for keyword in self._group_keywords[match.lastgroup]:
+                if sentence is not None and not self._in_context(keyword, sentence):
+                    continue
+                hits.append({
+                    'keyword': keyword,
+                    'matched': match.group(0),
+                    'span': match.span(),
+                    'sections': self.keyword_sections[keyword],
+                })
+        return hits
+
+    def match_sections(self, text):
+        """Distinct section ids hit by the text, in first-hit order, with the keyword that hit them"""
+        sections = {}
+        for hit in self.find(text):
+            for section in hit['sections']:
+                sections.setdefault(section, hit['keyword'])
+        return sections
@@ -0,0 +1,273 @@
+import os
+import time
+import sqlite3
+import argparse
+import threading
+import numpy as np
+from scripts.embedding_service import MODEL_NAME
+from scripts.vector_search import normalize_rows
+
+MO_CLUSTER_DB = os.getenv("MO_CLUSTER_DB", os.path.join("models", "mo_clusters.sqlite3"))
+# Cosine similarity needed to join a cluster. 0.875 on unit vectors is the
+# same neighbourhood as the old DBSCAN eps=0.5 (|a - b|^2 = 2 - 2 cos).
+MO_CLUSTER_SIMILARITY = float(os.getenv("MO_CLUSTER_SIMILARITY", "0.875"))
+MO_MIN_CLUSTER_SIZE = 2
+ASSIGN_BATCH = 1024
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS clusters (cluster_id INTEGER PRIMARY KEY, size INTEGER NOT NULL, vector_sum BLOB NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS assignments (fir_number TEXT PRIMARY KEY, cluster_id INTEGER NOT NULL)",
+]
+
+
+class MOClusterIndex:
+    """Incremental (leader / online-centroid) clustering of FIR description embeddings
+
+    Each FIR joins the cluster with the most similar centroid if the cosine
+    similarity is at least `similarity`, otherwise it starts a new cluster.
+    Work per FIR is one mat-vec against the current centroids, so
+    nothing is quadratic in the number of cases, and already-assigned FIRs
+    are never revisited. Centroid sums and FIR -> cluster assignments persist
+    in sqlite, so new FIRs are assigned as they arrive and a dashboard refresh
+    only reads labels.
+    """
+
+    def __init__(self, path=MO_CLUSTER_DB, model_name=MODEL_NAME, similarity=MO_CLUSTER_SIMILARITY):
+        self.path = path or ":memory:"
+        self.similarity = similarity
+        self._lock = threading.Lock()
+
+        if path and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Several API workers may share the file; writers queue on sqlite's lock
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        for statement in _SCHEMA:
+            self._db.execute(statement)
+        self._db.commit()
+
+        # Clusters built with another model or threshold are not comparable
+        self._db.execute("BEGIN IMMEDIATE")
+        meta = dict(self._db.execute("SELECT key, value FROM meta WHERE key != 'revision'").fetchall())
+        expected = {'model_name': model_name, 'similarity': repr(similarity)}
+        if meta != expected:
+            self._db.execute("DELETE FROM clusters")
+            self._db.execute("DELETE FROM assignments")
+            self._db.execute("DELETE FROM meta")
+            self._db.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", expected.items())
+        self._db.commit()
+
+        self._revision = None
+        self._assignments_rowid = 0
+        self.assignments = {}
+        self._sync()
+
+    def _sync(self):
+        """Pick up clusters and assignments other processes sharing the file have written
+
+        Every write bumps meta.revision; when it moved, centroid sums and sizes
+        are reloaded wholesale (they may have grown anywhere). Assignments never
+        change once written, so only rows added since the last sync are read.
+        """
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        revision = row[0] if row else '0'
+        if revision != self._revision:
+            self._count = 0
+            self._sizes = np.zeros(0, dtype=np.int64)
+            self._sums = None
+            self._centroids = None
+            rows = self._db.execute("SELECT cluster_id, size, vector_sum FROM clusters ORDER BY cluster_id").fetchall()
+            for cluster_id, size, blob in rows:
+                self._append_cluster(np.frombuffer(blob, dtype=np.float32), size)
+            self._revision = revision
+        rows = self._db.execute("SELECT rowid, fir_number, cluster_id FROM assignments WHERE rowid > ? ORDER BY rowid",
+                                (self._assignments_rowid,)).fetchall()
+        for rowid, fir_number, cluster_id in rows:
+            self.assignments[fir_number] = cluster_id
+            self._assignments_rowid = rowid
+
+    def refresh(self):
+        with self._lock:
+            self._sync()
+            self._db.commit()
+
+    @property
+    def n_clusters(self):
+        return self._count
+
+    def cluster_of(self, fir_number):
+        return self.assignments.get(fir_number)
+
+    def unassigned(self, fir_numbers):
+        return [fir_number for fir_number in fir_numbers if fir_number not in self.assignments]
+
+    def cluster_sizes(self):
+        return self._sizes[:self._count].copy()
+
+    # -- centroid bookkeeping ---------------------------------------------
+
+    def _append_cluster(self, vector_sum, size):
+        if self._sums is None:
+            self._sums = np.zeros((64, len(vector_sum)), dtype=np.float32)
+            self._centroids = np.zeros_like(self._sums)
+            self._sizes = np.zeros(64, dtype=np.int64)
+        if self._count == len(self._sums):
+            # Grow capacity geometrically so appends stay amortized O(1)
+            self._sums = np.vstack([self._sums, np.zeros_like(self._sums)])
+            self._centroids = np.vstack([self._centroids, np.zeros_like(self._centroids)])
+            self._sizes = np.concatenate([self._sizes, np.zeros_like(self._sizes)])
+        cluster_id = self._count
+        self._sums[cluster_id] = vector_sum
+        self._sizes[cluster_id] = size
+        self._centroids[cluster_id] = normalize_rows(vector_sum)[0]
+        self._count += 1
+        return cluster_id
+
+    def _refresh_centroids(self, cluster_ids):
+        cluster_ids = np.asarray(sorted(cluster_ids), dtype=np.int64)
+        if len(cluster_ids):
+            self._centroids[cluster_ids] = normalize_rows(self._sums[cluster_ids])
+
+    def _assign_batch(self, batch, touched):
+        labels = np.full(len(batch), -1, dtype=np.int64)
+        existing = self._count
+
+        # Join existing clusters in one matrix multiply
+        if existing:
+            scores = batch @ self._centroids[:existing].T
+            best = scores.argmax(axis=1)
+            joined = scores[np.arange(len(batch)), best] >= self.similarity
+            labels[joined] = best[joined]
+            np.add.at(self._sums, best[joined], batch[joined])
+            np.add.at(self._sizes, best[joined], 1)
+            touched.update(best[joined].tolist())
+            self._refresh_centroids(set(best[joined].tolist()))
+
+        # The rest are clustered among the clusters opened in this batch
+        for i in np.flatnonzero(labels < 0):
+            if self._count > existing:
+                scores = self._centroids[existing:self._count] @ batch[i]
+                j = int(scores.argmax())
+                if scores[j] >= self.similarity:
+                    cluster_id = existing + j
+                    self._sums[cluster_id] += batch[i]
+                    self._sizes[cluster_id] += 1
+                    self._refresh_centroids([cluster_id])
+                    labels[i] = cluster_id
+                    touched.add(cluster_id)
+                    continue
+            labels[i] = self._append_cluster(batch[i], 1)
+            touched.add(int(labels[i]))
+        return labels
+
+    # -- public API --------------------------------------------------------
+
+    def assign(self, fir_numbers, vectors):
+        """Cluster ids for new FIRs (already assigned ones keep theirs); None keys are not persisted
+
+        Runs inside one write transaction: state written by other processes is
+        reloaded first, so new cluster ids continue after theirs and centroid
+        sums include their members.
+        """
+        vectors = normalize_rows(vectors)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                labels = np.empty(len(fir_numbers), dtype=np.int64)
+                fresh = []
+                for i, fir_number in enumerate(fir_numbers):
+                    if fir_number is not None and fir_number in self.assignments:
+                        labels[i] = self.assignments[fir_number]
+                    else:
+                        fresh.append(i)
+
+                touched = set()
+                for start in range(0, len(fresh), ASSIGN_BATCH):
+                    rows = np.asarray(fresh[start:start + ASSIGN_BATCH], dtype=np.int64)
+                    labels[rows] = self._assign_batch(vectors[rows], touched)
+
+                new_assignments = dict((fir_numbers[i], int(labels[i])) for i in fresh if fir_numbers[i] is not None)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO clusters (cluster_id, size, vector_sum) VALUES (?, ?, ?)",
+                    [(cid, int(self._sizes[cid]), self._sums[cid].tobytes()) for cid in sorted(touched)])
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO assignments (fir_number, cluster_id) VALUES (?, ?)", new_assignments.items())
+                if touched:
+                    self._revision = str(int(self._revision) + 1)
+                    self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('revision', ?)",
+                                     (self._revision,))
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                # In-memory centroids may be ahead of the file now; reload on next use
+                self._revision = None
+                raise
+            # Our own rows are picked up by rowid like anyone else's
+            self._sync()
+            self._db.commit()
+        return labels.tolist()
+
+    def stats(self):
+        self.refresh()
+        sizes = self.cluster_sizes()
+        return {
+            'clusters': int(self._count),
+            'patterns': int((sizes >= MO_MIN_CLUSTER_SIZE).sum()),
+            'assigned_firs': len(self.assignments),
+            'largest_cluster': int(sizes.max()) if len(sizes) else 0,
+            'similarity': self.similarity,
+        }
+
+
+def _synthetic_cases(n, dimension=384, n_patterns=200, noise=0.35, seed=0):
+    """Unit vectors scattered around `n_patterns` MO centres, with their true pattern ids"""
+    rng = np.random.default_rng(seed)
+    centres = normalize_rows(rng.normal(size=(n_patterns, dimension)))
+    truth = rng.integers(0, n_patterns, size=n)
+    vectors = centres[truth] + noise * rng.normal(size=(n, dimension)).astype(np.float32) / np.sqrt(dimension)
+    return normalize_rows(vectors), truth
+
+
+def benchmark(sizes=(1000, 10000, 100000), dimension=384, n_patterns=200):
+    """Runtime vs case count: full build, incremental arrival of 100 new FIRs, and all-pairs DBSCAN where feasible"""
+    try:
+        from sklearn.cluster import DBSCAN
+    except ImportError:
+        DBSCAN = None
+
+    print(f"{'cases':>8} {'build s':>9} {'+100 new ms':>12} {'clusters':>9} {'purity':>7} {'dbscan s':>9}")
+    for n in sizes:
+        vectors, truth = _synthetic_cases(n + 100, dimension, n_patterns)
+        index = MOClusterIndex(path=None)
+        fir_numbers = [f"BENCH/{i}" for i in range(n + 100)]
+
+        start = time.perf_counter()
+        labels = np.asarray(index.assign(fir_numbers[:n], vectors[:n]))
+        build_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index.assign(fir_numbers[n:], vectors[n:])
+        arrival_ms = 1000 * (time.perf_counter() - start)
+
+        # Share of cases whose cluster's majority pattern is their own pattern
+        majority = {}
+        for label, pattern in zip(labels.tolist(), truth[:n].tolist()):
+            majority.setdefault(label, {}).setdefault(pattern, 0)
+            majority[label][pattern] += 1
+        purity = sum(max(counts.values()) for counts in majority.values()) / n
+
+        dbscan = "-"
+        if DBSCAN is not None and n <= 10000:
+            start = time.perf_counter()
+            DBSCAN(eps=0.5, min_samples=2).fit(vectors[:n])
+            dbscan = f"{time.perf_counter() - start:.2f}"
+        print(f"{n:>8} {build_seconds:>9.2f} {arrival_ms:>12.1f} {index.n_clusters:>9} {purity:>7.3f} {dbscan:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark incremental MO clustering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--patterns", type=int, default=200)
+    args = parser.parse_args()
+    benchmark(sizes=args.sizes, n_patterns=args.patterns)
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import inspect
+import argparse
+import numpy as np
+
+# Exported model layout (one directory per model):
+#   model.onnx       - transformer exported from SentenceTransformer (token embeddings out)
+#   model_int8.onnx  - dynamically quantized copy (int8 weights)
+#   tokenizer.json   - fast tokenizer, run with the `tokenizers` package (no torch import)
+#   config.json      - max_seq_length, pooling and normalization of the original model
+ONNX_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join("models", "onnx"))
+FP32_FILE = "model.onnx"
+INT8_FILE = "model_int8.onnx"
+CONFIG_FILE = "config.json"
+
+
+def model_dir(model_name, root=ONNX_DIR):
+    return os.path.join(root, model_name.replace("/", "__"))
+
+
+def export_onnx(model_name, output_dir=None, quantize=True, opset=14):
+    """Export a SentenceTransformer's transformer to ONNX (plus an int8 copy); needs torch once"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    try:  # sentence-transformers >= 6; the models package is a deprecated alias there
+        from sentence_transformers.sentence_transformer.modules import Pooling, Normalize
+    except ImportError:
+        from sentence_transformers.models import Pooling, Normalize
+
+    output_dir = output_dir or model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0]
+    pooling = next((m for m in st_model if isinstance(m, Pooling)), None)
+    # sentence-transformers < 6 exposes the mode via get_pooling_mode_str(), later versions as pooling_mode
+    pooling_mode = (pooling.get_pooling_mode_str() if hasattr(pooling, "get_pooling_mode_str")
+                    else pooling.pooling_mode) if pooling is not None else "mean"
+    if pooling_mode != "mean":
+        raise ValueError(f"Only mean pooling is supported, {model_name} uses {pooling_mode}")
+    # get_sentence_embedding_dimension() is deprecated in favour of get_embedding_dimension()
+    dimension = (st_model.get_embedding_dimension() if hasattr(st_model, "get_embedding_dimension")
+                 else st_model.get_sentence_embedding_dimension())
+
+    tokenizer = transformer.tokenizer
+    tokenizer.save_pretrained(output_dir)
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            return self.auto_model(**dict(zip(input_names, inputs)))[0]
+
+    print(f"[INFO] Exporting {model_name} to {output_dir}")
+    module = TokenEmbeddings(transformer.auto_model).eval()
+    # torch >= 2.9 defaults to the dynamo exporter (needs onnxscript); keep the TorchScript one for dynamic_axes
+    exporter = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+    with torch.no_grad():
+        torch.onnx.export(module, tuple(sample[name] for name in input_names),
+                          os.path.join(output_dir, FP32_FILE), input_names=input_names,
+                          output_names=["token_embeddings"], dynamic_axes=dynamic_axes, opset_version=opset,
+                          **exporter)
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(os.path.join(output_dir, FP32_FILE), os.path.join(output_dir, INT8_FILE),
+                         weight_type=QuantType.QInt8)
+        print(f"[INFO] Wrote dynamically quantized int8 model {INT8_FILE}")
+
+    config = {
+        'model_name': model_name,
+        'max_seq_length': st_model.max_seq_length,
+        'dimension': dimension,
+        'pooling': "mean",
+        'normalize': any(isinstance(m, Normalize) for m in st_model),
+        'input_names': input_names,
+    }
+    with open(os.path.join(output_dir, CONFIG_FILE), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    return output_dir
+
+
+class OnnxEncoder:
+    """Sentence encoder running an exported transformer on ONNX Runtime (CPU)
+
+    Tokenization uses the `tokenizers` package and pooling is done in numpy,
+    so neither torch nor sentence-transformers is imported at serving time.
+    """
+
+    def __init__(self, path, quantized=False, threads=None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(path, CONFIG_FILE), encoding="utf-8") as f:
+            self.config = json.load(f)
+        self.model_file = os.path.join(path, INT8_FILE if quantized else FP32_FILE)
+        self.dimension = self.config['dimension']
+        self.input_names = self.config['input_names']
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.config['max_seq_length'])
+        self.tokenizer.enable_padding()
+
+        # ONNX_THREADS=0 (default) leaves the thread count to onnxruntime
+        threads = int(os.getenv("ONNX_THREADS", "0")) if threads is None else threads
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(self.model_file, options, providers=["CPUExecutionProvider"])
+
+    @property
+    def weight_bytes(self):
+        return os.path.getsize(self.model_file)
+
+    def encode(self, texts, batch_size=64, normalize=False):
+        """Mean-pooled sentence vectors for a list of texts, float32 (n, dimension)"""
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(list(texts[start:start + batch_size]))
+            feeds = {
+                'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+                'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                'token_type_ids': np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            token_embeddings = self.session.run(None, {name: feeds[name] for name in self.input_names})[0]
+            mask = feeds['attention_mask'][..., None].astype(np.float32)
+            out[start:start + len(encodings)] = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        if normalize or self.config['normalize']:
+            norms = np.linalg.norm(out, axis=1, keepdims=True)
+            out /= np.clip(norms, 1e-12, None)
+        return out
+
+
+PARITY_QUERIES = [
+    "Someone stole my phone",
+    "A person threatened me with a knife",
+    "I received a fake job offer",
+    "what is anticipatory bail",
+    "IPC 302",
+    "how to file an FIR online",
+]
+# Minimum cosine similarity between torch and ONNX vectors of the same text
+PARITY_TOLERANCE = {'fp32': 0.9999, 'int8': 0.98}
+
+
+def parity(torch_model, onnx_model, queries, corpus):
+    """Cosine similarity between backends per text set, plus top-5 corpus neighbour agreement for the queries"""
+    results = {}
+    for label, texts in (("queries", queries), ("corpus", corpus)):
+        start = time.perf_counter()
+        reference = np.asarray(torch_model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+        torch_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        candidate = onnx_model.encode(texts, normalize=True)
+        onnx_seconds = time.perf_counter() - start
+        cosine = np.sum(reference * candidate, axis=1)
+        results[label] = {
+            'reference': reference, 'candidate': candidate, 'n': len(texts),
+            'min_cosine': float(cosine.min()), 'mean_cosine': float(cosine.mean()),
+            'max_abs_diff': float(np.abs(reference - candidate).max()),
+            'torch_ms_per_text': 1000 * torch_seconds / len(texts),
+            'onnx_ms_per_text': 1000 * onnx_seconds / len(texts),
+        }
+
+    ref_top = np.argsort(-(results['queries']['reference'] @ results['corpus']['reference'].T), axis=1)[:, :5]
+    cand_top = np.argsort(-(results['queries']['candidate'] @ results['corpus']['candidate'].T), axis=1)[:, :5]
+    results['top5_overlap'] = float(np.mean([len(set(a) & set(b)) / 5 for a, b in zip(ref_top.tolist(), cand_top.tolist())]))
+    results['min_cosine'] = min(results[label]['min_cosine'] for label in ("queries", "corpus"))
+    return results
+
+
+def parity_check(model_name=None, quantized=False, n_texts=200, tolerance=None):
+    """Compare ONNX vectors with the current PyTorch SentenceTransformer vectors
+
+    Uses short queries plus rows of combined_knowledge.csv; reports cosine
+    similarity between backends and whether top-5 knowledge-base neighbours
+    agree. Returns True when the minimum cosine is within tolerance.
+    """
+    from sentence_transformers import SentenceTransformer
+    import pandas as pd
+    from scripts.embedding_service import MODEL_NAME
+
+    model_name = model_name or MODEL_NAME
+    tolerance = tolerance if tolerance is not None else PARITY_TOLERANCE['int8' if quantized else 'fp32']
+    corpus = pd.read_csv("combined_knowledge.csv", dtype=str, na_filter=False)["content"].head(n_texts).tolist()
+
+    results = parity(SentenceTransformer(model_name, device="cpu"),
+                     OnnxEncoder(model_dir(model_name), quantized=quantized), PARITY_QUERIES, corpus)
+    for label in ("queries", "corpus"):
+        r = results[label]
+        print(f"{label:<8} n={r['n']:<4} min cos={r['min_cosine']:.6f} mean cos={r['mean_cosine']:.6f} "
+              f"max |diff|={r['max_abs_diff']:.2e} "
+              f"torch {r['torch_ms_per_text']:.2f} ms/text, onnx {r['onnx_ms_per_text']:.2f} ms/text")
+    print(f"top-5 neighbour overlap: {results['top5_overlap']:.3f}")
+
+    ok = results['min_cosine'] >= tolerance
+    print(f"{'✅' if ok else '❌'} parity {'passed' if ok else 'failed'}: "
+          f"min cosine {results['min_cosine']:.6f} (tolerance {tolerance})")
+    return ok
+
+
+if __name__ == "__main__":
+    from scripts.embedding_service import MODEL_NAME
+
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX and check parity")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_cmd = sub.add_parser("export", help="export model.onnx (and model_int8.onnx)")
+    export_cmd.add_argument("--model", default=MODEL_NAME)
+    export_cmd.add_argument("--no-quantize", action="store_true")
+    parity_cmd = sub.add_parser("parity", help="compare ONNX vectors with SentenceTransformer vectors")
+    parity_cmd.add_argument("--model", default=MODEL_NAME)
+    parity_cmd.add_argument("--int8", action="store_true", help="check model_int8.onnx")
+    parity_cmd.add_argument("--tolerance", type=float, default=None, help="minimum cosine similarity")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_onnx(args.model, quantize=not args.no_quantize)
+    else:
+        raise SystemExit(0 if parity_check(args.model, quantized=args.int8, tolerance=args.tolerance) else 1)
@@ -1,60 +1,64 @@
-import pandas as pd
-import os
-
-# Use BASE_DIR as project root
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_DIR = os.path.join(BASE_DIR, "data")
-OUTPUT_FILE = os.path.join(BASE_DIR, "combined_knowledge.csv")
-
-def preprocess():
-    print(f"[INFO] Loading CSVs from: {DATA_DIR}")
-    
-    sections = pd.read_csv(os.path.join(DATA_DIR, "section.csv"))
-    acts = pd.read_csv(os.path.join(DATA_DIR, "acts.csv"))
-    terms = pd.read_csv(os.path.join(DATA_DIR, "legal_terms.csv"))
-    faqs = pd.read_csv(os.path.join(DATA_DIR, "faqs.csv"))
-    procedures = pd.read_csv(os.path.join(DATA_DIR, "procedure.csv"))
-
-    kb = []
-
-    for _, row in sections.iterrows():
-        kb.append({
-            "type": "section",
-            "title": f"Section {row['section_number']} - {row['section_title']}",
-            "content": f"{row['description']}. Punishment: {row['punishment']}"
-        })
-
-    for _, row in acts.iterrows():
-        kb.append({
-            "type": "act",
-            "title": row['act_name'],
-            "content": f"{row['description']}. Important Sections: {row['important_sections']}"
-        })
-
-    for _, row in terms.iterrows():
-        kb.append({
-            "type": "legal_term",
-            "title": row['term'],
-            "content": f"{row['definition']}. Example: {row['example']}"
-        })
-
-    for _, row in faqs.iterrows():
-        kb.append({
-            "type": "faq",
-            "title": row['question'],
-            "content": row['answer']
-        })
-
-    for _, row in procedures.iterrows():
-        kb.append({
-            "type": "procedure",
-            "title": row['process_name'],
-            "content": f"{row['description']}\nSteps: {row['step_by_step']}\nTips: {row['tips']}"
-        })
-
-    df = pd.DataFrame(kb)
-    df.to_csv(OUTPUT_FILE, index=False)
-    print(f"[INFO] Combined knowledge base saved to {OUTPUT_FILE}")
-
-if __name__ == "__main__":
-    preprocess()
+import pandas as pd
+import os
+
+# Use BASE_DIR as project root
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+OUTPUT_FILE = os.path.join(BASE_DIR, "combined_knowledge.csv")
+
+# Rows read per source chunk; bounds memory for large bare acts / judgments
+CHUNK_ROWS = int(os.getenv("PREPROCESS_CHUNK_ROWS", "5000"))
+
+# (file, type, title, content) - title/content build whole columns of a chunk at once
+SOURCES = [
+    ("section.csv", "section",
+     lambda c: "Section " + c['section_number'] + " - " + c['section_title'],
+     lambda c: c['description'] + ". Punishment: " + c['punishment']),
+    ("acts.csv", "act",
+     lambda c: c['act_name'],
+     lambda c: c['description'] + ". Important Sections: " + c['important_sections']),
+    ("legal_terms.csv", "legal_term",
+     lambda c: c['term'],
+     lambda c: c['definition'] + ". Example: " + c['example']),
+    ("faqs.csv", "faq",
+     lambda c: c['question'],
+     lambda c: c['answer']),
+    ("procedure.csv", "procedure",
+     lambda c: c['process_name'],
+     lambda c: c['description'] + "\nSteps: " + c['step_by_step'] + "\nTips: " + c['tips']),
+]
+
+
+def source_files(data_dir=DATA_DIR):
+    return [os.path.join(data_dir, filename) for filename, *_ in SOURCES]
+
+
+def iter_knowledge_chunks(data_dir=DATA_DIR, chunk_rows=CHUNK_ROWS):
+    """Yield (type, title, content) DataFrames, one source chunk at a time"""
+    for filename, kind, title, content in SOURCES:
+        # Every field as text; empty cells stay "" instead of becoming NaN
+        reader = pd.read_csv(os.path.join(data_dir, filename), dtype=str, na_filter=False, chunksize=chunk_rows)
+        for chunk in reader:
+            yield pd.DataFrame({
+                "type": kind,
+                "title": title(chunk),
+                "content": content(chunk),
+            })
+
+
+def tee_csv(chunks, path):
+    """Pass chunks through while appending them to `path` (replaced once the stream is exhausted)"""
+    tmp_file = path + ".tmp"
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(tmp_file, index=False, mode="w" if i == 0 else "a", header=(i == 0))
+        yield chunk
+    os.replace(tmp_file, path)
+
+
+def preprocess():
+    print(f"[INFO] Loading CSVs from: {DATA_DIR}")
+    rows = sum(len(chunk) for chunk in tee_csv(iter_knowledge_chunks(), OUTPUT_FILE))
+    print(f"[INFO] Combined knowledge base ({rows} rows) saved to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    preprocess()
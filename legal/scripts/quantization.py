@@ -0,0 +1,113 @@
+import os
+import time
+import numpy as np
+from scripts.vector_search import normalize_rows, top_k_indices, cosine_top_k_batch
+
+# Representation used for scoring stored embeddings: "float32" (exact) or a
+# quantized copy written next to vectors.npy. Quantized scores are only used
+# to pick candidates; the best ones are rescored against the float32 vectors.
+EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "float32")
+QUANTIZED_DTYPES = ("float16", "int8")
+# Candidates rescored in full precision = RESCORE_FACTOR * k
+RESCORE_FACTOR = int(os.getenv("QUANTIZED_RESCORE_FACTOR", "4"))
+BLOCK_ROWS = 16384
+
+
+def int8_scales(vectors, block_rows=BLOCK_ROWS):
+    """Per-dimension scale mapping the largest |value| of each dimension to 127"""
+    absmax = np.zeros(vectors.shape[1], dtype=np.float32)
+    for start in range(0, len(vectors), block_rows):
+        np.maximum(absmax, np.abs(vectors[start:start + block_rows]).max(axis=0), out=absmax)
+    absmax[absmax == 0] = 1.0
+    return absmax / 127.0
+
+
+def quantize_block(block, dtype, scales=None):
+    if dtype == "float16":
+        return np.asarray(block, dtype=np.float16)
+    if dtype == "int8":
+        return np.clip(np.rint(block / scales), -127, 127).astype(np.int8)
+    raise ValueError(f"Unknown quantized dtype '{dtype}'. Expected one of {QUANTIZED_DTYPES}")
+
+
+def rescore_top_k(full, query_vectors, candidates, k):
+    """Exact float32 scores for candidate rows (-1 = padding); returns the best k (indices, scores)"""
+    query_vectors = normalize_rows(query_vectors)
+    valid = candidates >= 0
+    rows = np.where(valid, candidates, 0)
+    candidate_vectors = np.asarray(full[rows.ravel()], dtype=np.float32).reshape(*rows.shape, -1)
+    exact = np.einsum("qd,qcd->qc", query_vectors, candidate_vectors)
+    exact[~valid] = -np.inf
+    order = top_k_indices(exact, k)
+    return np.take_along_axis(candidates, order, axis=-1), np.take_along_axis(exact, order, axis=-1)
+
+
+class QuantizedMatrix:
+    """float16 / int8 copy of a normalized embedding matrix with full-precision rescoring
+
+    Approximate scores come from the compact codes (decoded block by block,
+    with int8 scales folded into the query). The float32 matrix stays
+    memory-mapped, so only the rows being rescored are paged in. Exposes
+    ntotal / search() like a FAISS index, so index_search() accepts it.
+    """
+
+    def __init__(self, codes, full, scales=None, rescore_factor=RESCORE_FACTOR):
+        self.codes = codes
+        self.full = full
+        self.scales = None if scales is None else np.asarray(scales, dtype=np.float32)
+        self.rescore_factor = rescore_factor
+
+    @property
+    def ntotal(self):
+        return self.codes.shape[0]
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def approximate_scores(self, query_vectors):
+        query_vectors = normalize_rows(query_vectors)
+        if self.scales is not None:
+            query_vectors = query_vectors * self.scales
+        scores = np.empty((len(query_vectors), self.ntotal), dtype=np.float32)
+        for start in range(0, self.ntotal, BLOCK_ROWS):
+            block = np.asarray(self.codes[start:start + BLOCK_ROWS], dtype=np.float32)
+            scores[:, start:start + len(block)] = query_vectors @ block.T
+        return scores
+
+    def scores(self, query_vectors, k):
+        """All-row scores: exact for each query's top rescore_factor * k rows, approximate elsewhere"""
+        scores = self.approximate_scores(query_vectors)
+        candidates = top_k_indices(scores, max(k, self.rescore_factor * k))
+        idx, exact = rescore_top_k(self.full, query_vectors, candidates, candidates.shape[-1])
+        np.put_along_axis(scores, idx, exact, axis=-1)
+        return scores
+
+    def search(self, query_vectors, k):
+        """FAISS-style (scores, indices) of the k best rows after rescoring"""
+        candidates = top_k_indices(self.approximate_scores(query_vectors), max(k, self.rescore_factor * k))
+        idx, scores = rescore_top_k(self.full, query_vectors, candidates, k)
+        return scores, idx
+
+
+def recall_report(vectors, searchers, k=10, n_queries=200, seed=0):
+    """Recall@k (vs exact float32 search) and latency of each `searchers[name](queries, k) -> indices`
+
+    Queries are a random sample of the stored rows themselves.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.sort(rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False))
+    queries = np.asarray(vectors[rows], dtype=np.float32)
+    exact_idx, _ = cosine_top_k_batch(vectors, queries, k)
+
+    report = {}
+    for name, search in searchers.items():
+        start = time.perf_counter()
+        idx = search(queries, k)
+        elapsed = time.perf_counter() - start
+        hits = [len(set(a) & set(b)) / len(a) for a, b in zip(exact_idx.tolist(), np.asarray(idx).tolist())]
+        report[name] = {
+            'recall_at_k': round(float(np.mean(hits)), 4),
+            'ms_per_query': round(1000 * elapsed / len(queries), 3),
+        }
+    return report
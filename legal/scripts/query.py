@@ -1,125 +1,433 @@
-import os
-import re
-import pickle
-import numpy as np
-from sentence_transformers import SentenceTransformer
-from google import genai
-from google.genai.types import GenerateContentConfig
-from dotenv import load_dotenv
-
-# Load .env (for GEMINI_API_KEY)
-load_dotenv()
-
-# Paths
-EMB_FILE = os.path.join("embeddings.pkl")
-
-# Load data + embeddings
-with open(EMB_FILE, "rb") as f:
-    df, embeddings = pickle.load(f)
-
-# Load same embedding model for query encoding
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
-
-# Gemini client
-client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
-
-# -------------------------
-# 🔎 Direct Section Lookup
-# -------------------------
-def direct_section_lookup(query):
-    """Extract IPC/Section number from query and fetch directly from CSV if available."""
-    match = re.search(r"(ipc|section)\s*(\d+)", query.lower())
-    if match:
-        sec_num = match.group(2)
-        hits = df[df["title"].str.contains(
-            rf"(^|\b)(Section|IPC)\s*{sec_num}(\b|$)",
-            case=False, na=False, regex=True
-        )]
-        if not hits.empty:
-            return "\n\n".join(hits["title"] + " - " + hits["content"])
-    return None
-
-# -------------------------
-# 🔎 Embedding Search
-# -------------------------
-def search(query, top_k=5):
-    """Search embeddings across ALL types (sections, faq, procedure, legalterm, act)."""
-    q_emb = embedder.encode([query], convert_to_numpy=True)[0]
-    scores = np.dot(embeddings, q_emb) / (
-        np.linalg.norm(embeddings, axis=1) * np.linalg.norm(q_emb)
-    )
-    top_idx = np.argsort(scores)[::-1][:top_k]
-    results = [(df.iloc[i]["title"], df.iloc[i]["content"], scores[i]) for i in top_idx]
-    return results
-
-# -------------------------
-# 🌐 Gemini Fallback
-# -------------------------
-def web_fallback(query):
-    prompt = f"""
-You are a legal assistant. 
-The knowledge base did not contain the answer.
-Determine if the query is about law, rights, procedures, legal terms, or courts.
-
-- If it is NOT legal → reply exactly: "Not a legal question."
-- If it IS legal → provide a clear and correct explanation, using your own legal knowledge and, if needed, search the internet.
-
-Query:
-{query}
-"""
-    resp = client.models.generate_content(
-        model="models/gemini-1.5-flash",
-        contents=prompt,
-        config=GenerateContentConfig(temperature=0.3),
-    )
-    return resp.text
-
-# -------------------------
-# 🧠 Main Answer Logic
-# -------------------------
-def answer_query(query):
-    # 1️⃣ Try direct section lookup
-    direct_context = direct_section_lookup(query)
-    if direct_context:
-        context = direct_context
-    else:
-        # 2️⃣ Embedding search across all entries
-        results = search(query, top_k=5)
-        best_title, best_match, best_score = results[0]
-
-        if best_score < 0.40:  # threshold
-            return web_fallback(query)
-
-        context = "\n\n".join([f"{r[0]} - {r[1]}" for r in results])
-
-    # 3️⃣ Build prompt for Gemini (KB mode)
-    prompt = f"""
-You are a legal assistant. Use the knowledge base context provided below.
-
-Rules:
-- If the context contains a legal answer, explain it clearly.
-- If context is EMPTY, reply exactly: "Not found in knowledge base."
-- Do NOT say "I will search", just use the context to explain.
-
-Context:
-{context}
-
-Query:
-{query}
-"""
-    resp = client.models.generate_content(
-        model="models/gemini-2.5-flash",
-        contents=prompt,
-        config=GenerateContentConfig(temperature=0.2),
-    )
-    return resp.text
-
-# -------------------------
-# 🔄 CLI Loop
-# -------------------------
-if __name__ == "__main__":
-    while True:
-        q = input("\nAsk a legal question (or 'quit'): ")
-        if q.lower() in ["quit", "exit"]:
-            break
-        print("\n[ANSWER]:", answer_query(q))
+import os
+import re
+import time
+import threading
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+from scripts.embedding_service import get_embedding_service
+from scripts.embedding_store import (
+    AUTO_REBUILD, KNOWLEDGE_STORE_DIR, load_store, migrate_pickle, dataframe_columns, store_fingerprint, is_stale, store_lock,
+)
+from scripts import build_embeddings
+from scripts.ann_index import INDEX_FILE, load_index, index_search
+from scripts.quantization import EMBEDDING_DTYPE
+from scripts.answer_cache import AnswerCache
+from scripts.section_index import find_section_reference, build_title_index
+from scripts.bm25_index import BM25_DIR, BM25Index
+from scripts.vector_search import normalize_vector, top_k_indices
+
+# Load .env (for GEMINI_API_KEY)
+load_dotenv()
+
+# Paths
+STORE_DIR = KNOWLEDGE_STORE_DIR
+LEGACY_EMB_FILE = os.path.join("embeddings.pkl")
+
+# Retrieval: "dense" = embeddings only, "hybrid" = BM25 + dense fused with
+# reciprocal rank fusion, plus a lexical-only fast path that skips encoding
+# when BM25 is confident (all query terms hit and a clear winner).
+SEARCH_MODE = os.getenv("SEARCH_MODE", "hybrid")
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "50"))
+RRF_K = 60
+LEXICAL_FAST_PATH_COVERAGE = float(os.getenv("LEXICAL_FAST_PATH_COVERAGE", "1.0"))
+LEXICAL_FAST_PATH_MARGIN = float(os.getenv("LEXICAL_FAST_PATH_MARGIN", "1.3"))
+# Raw BM25 score the best hit needs for the fast path. Fast-path scores are
+# reported relative to that hit, so they would always clear the KB/web
+# threshold in retrieve(); weak or common-term matches ("court", "law")
+# must go through the dense path, whose cosine scores the threshold is for.
+LEXICAL_FAST_PATH_MIN_SCORE = float(os.getenv("LEXICAL_FAST_PATH_MIN_SCORE", "6.0"))
+
+# Populated by warm_up(); nothing heavy happens at import time so the
+# API process can bind its port immediately.
+df = None
+embeddings = None
+kb_manifest = None
+section_contexts = None
+ann_index = None
+kb_quantized = None
+bm25 = None
+embedder = None
+client = None
+answer_cache = None
+
+# -------------------------
+# ♻️ Lifecycle / Warm-up
+# -------------------------
+_ready = threading.Event()
+_warm_up_lock = threading.Lock()
+_status = {
+    'state': 'not_started',  # not_started | loading | ready | failed
+    'stage': None,
+    'completed_stages': [],
+    'timings': {},
+    'error': None,
+    'started_at': None,
+    'ready_at': None,
+}
+
+def _refresh_if_stale(store):
+    """Re-encode new/changed rows if combined_knowledge.csv no longer matches the store"""
+    kb_df, text_column = build_embeddings.load_knowledge()
+    texts = kb_df[text_column].astype(str).tolist()
+    if not is_stale(store, texts, store.manifest.get('text_column', text_column)):
+        return store
+    print("⚠️ combined_knowledge.csv changed since the last build; updating embeddings")
+    store = None  # release the memory map so build() can prune its version
+    with store_lock(STORE_DIR):
+        # Another worker may have rebuilt it while we waited for the lock
+        store = load_store(STORE_DIR)
+        if not is_stale(store, texts, store.manifest.get('text_column', text_column)):
+            return store
+        store = None
+        try:
+            build_embeddings.build()
+        except Exception as e:
+            print(f"❌ Incremental rebuild failed, using the existing store: {e}")
+    return load_store(STORE_DIR)
+
+def _load_knowledge_store():
+    """Memory-mapped vectors + metadata. Rows are stored L2-normalized float32."""
+    global df, embeddings, kb_manifest, kb_quantized, section_contexts
+    store = load_store(STORE_DIR)
+    if store is None:
+        store = migrate_pickle(LEGACY_EMB_FILE, STORE_DIR, dataframe_columns)
+    if store is None:
+        raise FileNotFoundError(f"No embedding store at {STORE_DIR}. Run: python -m scripts.build_embeddings")
+    if AUTO_REBUILD and os.path.exists(build_embeddings.DATA_FILE):
+        store = _refresh_if_stale(store)
+    df = pd.DataFrame(store.metadata)
+    embeddings = store.vectors
+    kb_manifest = store.manifest
+    # EMBEDDING_DTYPE=float16/int8: scan the compact copy, rescore candidates in float32
+    kb_quantized = store.quantized_matrix(EMBEDDING_DTYPE)
+
+    # Section id -> pre-joined "title - content" context, so direct lookups are O(1)
+    titles, contents = store.column("title"), store.column("content")
+    section_contexts = {
+        section_id: "\n\n".join(f"{titles[i]} - {contents[i]}" for i in rows)
+        for section_id, rows in build_title_index(titles).items()
+    }
+
+def _load_ann_index():
+    """ANN index built by build_embeddings.py (falls back to a quantized or float32 scan if absent/stale)"""
+    global ann_index
+    ann_index = load_index(INDEX_FILE, expected_size=len(embeddings), kb_version=store_fingerprint(kb_manifest))
+    if ann_index is None:
+        ann_index = kb_quantized
+
+def _load_bm25_index():
+    """BM25 index built by build_embeddings.py; rebuilt in memory if missing or stale"""
+    global bm25
+    bm25 = BM25Index.load(BM25_DIR)
+    kb_version = store_fingerprint(kb_manifest)
+    if bm25 is None or bm25.meta.get('kb_version') != kb_version:
+        print("⚠️ BM25 index missing or stale; building it in memory")
+        bm25 = BM25Index.from_titles_and_contents(df["title"], df["content"], meta={'kb_version': kb_version})
+
+def _load_answer_cache():
+    """Persistent Gemini answer cache; entries from an older KB build are dropped"""
+    global answer_cache
+    answer_cache = AnswerCache(kb_version=store_fingerprint(kb_manifest))
+
+def _load_embedder():
+    global embedder
+    embedder = get_embedding_service()
+
+def _load_gemini_client():
+    global client
+    from google import genai
+    client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+
+_WARM_UP_STAGES = [
+    ('knowledge_store', _load_knowledge_store),
+    ('ann_index', _load_ann_index),
+    ('bm25_index', _load_bm25_index),
+    ('answer_cache', _load_answer_cache),
+    ('embedding_model', _load_embedder),
+    ('gemini_client', _load_gemini_client),
+]
+
+def warm_up():
+    """Load the knowledge base, index, model and Gemini client. Safe to call repeatedly."""
+    if _ready.is_set():
+        return
+    with _warm_up_lock:
+        if _ready.is_set():
+            return
+        _status.update(state='loading', error=None, completed_stages=[], timings={},
+                       started_at=time.time())
+        try:
+            for stage, loader in _WARM_UP_STAGES:
+                _status['stage'] = stage
+                stage_start = time.perf_counter()
+                loader()
+                _status['timings'][stage] = round(time.perf_counter() - stage_start, 3)
+                _status['completed_stages'].append(stage)
+        except Exception as e:
+            _status.update(state='failed', error=f"{_status['stage']}: {e}")
+            raise
+        _status.update(state='ready', stage=None, ready_at=time.time())
+        _ready.set()
+
+def start_warm_up():
+    """Run warm_up() in a daemon thread; returns immediately."""
+    if _ready.is_set() or _status['state'] == 'loading':
+        return None
+
+    def _run():
+        try:
+            warm_up()
+        except Exception as e:
+            print(f"❌ RAG warm-up failed: {e}")
+
+    thread = threading.Thread(target=_run, name="rag-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+def is_ready():
+    return _ready.is_set()
+
+def get_status():
+    """Snapshot of warm-up progress and per-stage timings (seconds)."""
+    status = dict(_status, completed_stages=list(_status['completed_stages']),
+                  timings=dict(_status['timings']))
+    status['progress'] = round(len(status['completed_stages']) / len(_WARM_UP_STAGES), 2)
+    status['total_seconds'] = (round(status['ready_at'] - status['started_at'], 3)
+                               if status['ready_at'] and status['started_at'] else None)
+    return status
+
+def _generation_config(temperature):
+    from google.genai.types import GenerateContentConfig
+    return GenerateContentConfig(temperature=temperature)
+
+# -------------------------
+# 🔎 Direct Section Lookup
+# -------------------------
+def direct_section_lookup(query):
+    """Extract IPC/Section number (e.g. 302, 66C) from query and fetch it from the section index."""
+    warm_up()
+    section_id = find_section_reference(query)
+    if section_id:
+        return section_contexts.get(section_id)
+    return None
+
+# -------------------------
+# 🔎 Embedding Search
+# -------------------------
+def _rows_to_results(row_idx, row_scores):
+    # ANN indexes pad with -1 when fewer than top_k neighbours are found
+    return [(df.iloc[i]["title"], df.iloc[i]["content"], float(score))
+            for i, score in zip(row_idx, row_scores) if i >= 0]
+
+def _lexical_fast_path(query, lexical_scores, top_k):
+    """BM25-only results when the lexical match is unambiguous, else None.
+
+    Scores are relative to the best BM25 hit (top = 1.0), which must reach
+    LEXICAL_FAST_PATH_MIN_SCORE on its own.
+    """
+    top = top_k_indices(lexical_scores, max(top_k, 2))
+    best = lexical_scores[top[0]] if len(top) else 0.0
+    if best <= 0 or best < LEXICAL_FAST_PATH_MIN_SCORE:
+        return None
+    runner_up = lexical_scores[top[1]] if len(top) > 1 else 0.0
+    if runner_up > 0 and best < LEXICAL_FAST_PATH_MARGIN * runner_up:
+        return None
+    if bm25.coverage(query, int(top[0])) < LEXICAL_FAST_PATH_COVERAGE:
+        return None
+    top = [i for i in top[:top_k] if lexical_scores[i] > 0]
+    return _rows_to_results(top, [lexical_scores[i] / best for i in top])
+
+def _search(query, top_k=5, mode=None):
+    """Returns (results, q_emb); q_emb is None when the lexical fast path answered."""
+    mode = mode or SEARCH_MODE
+    term_ids = []
+
+    if mode == "hybrid" and bm25 is not None:
+        lexical_scores, term_ids = bm25.score(query)
+        if term_ids:
+            fast = _lexical_fast_path(query, lexical_scores, top_k)
+            if fast:
+                return fast, None
+
+    q_emb = embedder.encode_query(query)
+    if not term_ids:
+        top_idx, top_scores = index_search(ann_index, embeddings, q_emb, top_k)
+        return _rows_to_results(top_idx[0], top_scores[0]), q_emb
+
+    # Reciprocal rank fusion of dense and BM25 candidate lists
+    dense_idx, _ = index_search(ann_index, embeddings, q_emb, HYBRID_CANDIDATES)
+    lexical_idx = [i for i in top_k_indices(lexical_scores, HYBRID_CANDIDATES) if lexical_scores[i] > 0]
+    fused = {}
+    for ranking in (dense_idx[0], lexical_idx):
+        for rank, i in enumerate(ranking):
+            if i >= 0:
+                fused[int(i)] = fused.get(int(i), 0.0) + 1.0 / (RRF_K + rank + 1)
+    top = sorted(fused, key=fused.get, reverse=True)[:top_k]
+
+    # Report dense cosine scores so the KB/web threshold keeps its meaning
+    dense_scores = embeddings[top] @ normalize_vector(q_emb) if top else []
+    return _rows_to_results(top, dense_scores), q_emb
+
+def search(query, top_k=5, mode=None):
+    """Search ALL types (sections, faq, procedure, legalterm, act); mode is "dense" or "hybrid"."""
+    warm_up()
+    return _search(query, top_k, mode)[0]
+
+def search_many(queries, top_k=5):
+    """Batched dense search: encode all queries at once and score them in one index call."""
+    warm_up()
+    q_embs = embedder.encode_queries(list(queries))
+    top_idx, top_scores = index_search(ann_index, embeddings, q_embs, top_k)
+    return [_rows_to_results(row_idx, row_scores)
+            for row_idx, row_scores in zip(top_idx, top_scores)]
+
+# -------------------------
+# 🌐 Gemini Fallback
+# -------------------------
+WEB_MODEL = "models/gemini-1.5-flash"
+KB_MODEL = "models/gemini-2.5-flash"
+
+def _web_prompt(query):
+    return f"""
+You are a legal assistant. 
+The knowledge base did not contain the answer.
+Determine if the query is about law, rights, procedures, legal terms, or courts.
+
+- If it is NOT legal → reply exactly: "Not a legal question."
+- If it IS legal → provide a clear and correct explanation, using your own legal knowledge and, if needed, search the internet.
+
+Query:
+{query}
+"""
+
+def web_fallback(query):
+    resp = client.models.generate_content(
+        model=WEB_MODEL,
+        contents=_web_prompt(query),
+        config=_generation_config(0.3),
+    )
+    return resp.text
+
+# -------------------------
+# 🧠 Main Answer Logic
+# -------------------------
+def _kb_prompt(query, context):
+    return f"""
+You are a legal assistant. Use the knowledge base context provided below.
+
+Rules:
+- If the context contains a legal answer, explain it clearly.
+- If context is EMPTY, reply exactly: "Not found in knowledge base."
+- Do NOT say "I will search", just use the context to explain.
+
+Context:
+{context}
+
+Query:
+{query}
+"""
+
+def kb_answer(query, context):
+    """Ask Gemini to explain the retrieved knowledge base context."""
+    resp = client.models.generate_content(
+        model=KB_MODEL,
+        contents=_kb_prompt(query, context),
+        config=_generation_config(0.2),
+    )
+    return resp.text
+
+def _cached_answer(query, context, mode, q_emb, generate):
+    """Serve from the exact/semantic answer cache, otherwise call Gemini and cache."""
+    if answer_cache is not None:
+        cached, tier = answer_cache.lookup(query, context, mode, query_embedding=q_emb)
+        if cached is not None:
+            print(f"⚡ Answer cache hit ({tier})")
+            return cached
+    answer = generate()
+    if answer_cache is not None:
+        answer_cache.store(query, context, mode, answer, query_embedding=q_emb)
+    return answer
+
+def retrieve(query):
+    """Retrieval step shared by answer_query and stream_answer.
+
+    Returns (mode, context, titles, q_emb) where mode is "kb" or "web".
+    """
+    # Only set on the embedding path: section-number queries differ by a few
+    # tokens and must not be matched semantically.
+    q_emb = None
+
+    # 1️⃣ Try direct section lookup
+    direct_context = direct_section_lookup(query)
+    if direct_context:
+        titles = [block.split(" - ", 1)[0] for block in direct_context.split("\n\n")]
+        return "kb", direct_context, titles, q_emb
+
+    # 2️⃣ Hybrid (BM25 + embedding) search across all entries
+    results, q_emb = _search(query, top_k=5)
+
+    if not results or max(r[2] for r in results) < 0.40:  # threshold
+        return "web", "", [], q_emb
+
+    context = "\n\n".join([f"{r[0]} - {r[1]}" for r in results])
+    return "kb", context, [r[0] for r in results], q_emb
+
+def answer_query(query):
+    # Loads synchronously on first use (CLI); the API gates on is_ready() instead
+    warm_up()
+
+    mode, context, _, q_emb = retrieve(query)
+    if mode == "web":
+        return _cached_answer(query, context, mode, q_emb, lambda: web_fallback(query))
+
+    # 3️⃣ Gemini (KB mode)
+    return _cached_answer(query, context, mode, q_emb, lambda: kb_answer(query, context))
+
+def stream_answer(query):
+    """Yield (event, payload) pairs: one "context" event, then "token" chunks, then "done".
+
+    The context event is emitted right after retrieval, before Gemini is called,
+    so clients can render sources while the answer is generated.
+    """
+    warm_up()
+
+    mode, context, titles, q_emb = retrieve(query)
+    yield "context", {'mode': mode, 'titles': titles}
+
+    if answer_cache is not None:
+        cached, tier = answer_cache.lookup(query, context, mode, query_embedding=q_emb)
+        if cached is not None:
+            yield "token", cached
+            yield "done", {'cached': tier}
+            return
+
+    if mode == "web":
+        model, prompt, temperature = WEB_MODEL, _web_prompt(query), 0.3
+    else:
+        model, prompt, temperature = KB_MODEL, _kb_prompt(query, context), 0.2
+
+    chunks = []
+    for chunk in client.models.generate_content_stream(
+        model=model,
+        contents=prompt,
+        config=_generation_config(temperature),
+    ):
+        if chunk.text:
+            chunks.append(chunk.text)
+            yield "token", chunk.text
+
+    answer = "".join(chunks)
+    if answer_cache is not None:
+        answer_cache.store(query, context, mode, answer, query_embedding=q_emb)
+    yield "done", {'cached': None}
+
+# -------------------------
+# 🔄 CLI Loop
+# -------------------------
+if __name__ == "__main__":
+    while True:
+        q = input("\nAsk a legal question (or 'quit'): ")
+        if q.lower() in ["quit", "exit"]:
+            break
+        print("\n[ANSWER]:", answer_query(q))
@@ -0,0 +1,27 @@
+import re
+
+# "Section 379", "IPC 66C", "section 171E" - number plus optional letter suffix
+SECTION_REFERENCE = re.compile(r"\b(?:section|ipc)\s*(\d+[a-z]*)\b", re.IGNORECASE)
+
+
+def normalize_section_id(value):
+    """Canonical key for a section id: '66c ' -> '66C', 379.0 -> '379'"""
+    key = str(value).strip().upper()
+    if key.endswith(".0") and key[:-2].isdigit():
+        key = key[:-2]
+    return key
+
+
+def find_section_reference(text):
+    """First section id referenced in free text, normalized, or None"""
+    match = SECTION_REFERENCE.search(text)
+    return normalize_section_id(match.group(1)) if match else None
+
+
+def build_title_index(titles):
+    """Map each section id mentioned in a title to the row positions that mention it"""
+    index = {}
+    for row, title in enumerate(titles):
+        for section_id in {normalize_section_id(m) for m in SECTION_REFERENCE.findall(str(title))}:
+            index.setdefault(section_id, []).append(row)
+    return index
@@ -1,126 +1,317 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
-import json
-from datetime import datetime
-
-load_dotenv()
-
-class SupabaseFIRClient:
-    def __init__(self):
-        self.url = os.getenv("SUPABASE_URL")
-        # Prefer service role key if available, otherwise fall back to anon key
-        self.key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
-        
-        if not self.url or not self.key:
-            raise ValueError("Supabase URL and Key must be set in environment variables")
-        
-        self.supabase: Client = create_client(self.url, self.key)
-    
-    def store_fir_record(self, fir_data):
-        """Store FIR record in Supabase"""
-        try:
-            response = self.supabase.table("fir_records").insert(fir_data).execute()
-            
-            if response.data:
-                return {"success": True, "id": response.data[0]['id']}
-            else:
-                return {"success": False, "error": str(response.error)}
-                
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    def search_fir_records(self, filters=None):
-        """Search FIR records with various filters"""
-        try:
-            query = self.supabase.table("fir_records").select("*")
-            
-            if filters:
-                if filters.get('start_date') and filters.get('end_date'):
-                    query = query.gte('incident_date', filters['start_date'])\
-                                .lte('incident_date', filters['end_date'])
-                
-                if filters.get('date'):
-                    query = query.eq('incident_date', filters['date'])
-                
-                if filters.get('incident_type'):
-                    query = query.eq('incident_type', filters['incident_type'])
-                
-                if filters.get('police_station'):
-                    query = query.eq('police_station', filters['police_station'])
-                
-                if filters.get('district'):
-                    query = query.eq('district', filters['district'])
-                
-                if filters.get('ipc_section'):
-                    query = query.ilike('ipc_sections', f'%{filters["ipc_section"]}%')
-                
-                if filters.get('search_text'):
-                    query = query.ilike('incident_description', f'%{filters["search_text"]}%')
-            
-            query = query.order('created_at', desc=True)
-            response = query.execute()
-            return {"success": True, "data": response.data}
-            
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    def get_fir_by_number(self, fir_number):
-        """Get specific FIR by FIR number"""
-        try:
-            response = self.supabase.table("fir_records")\
-                .select("*")\
-                .eq("fir_number", fir_number)\
-                .execute()
-            
-            if response.data:
-                return {"success": True, "data": response.data[0]}
-            else:
-                return {"success": False, "error": "FIR not found"}
-                
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    def get_monthly_report(self, year, month):
-        """Get monthly FIR report"""
-        try:
-            start_date = f"{year}-{month:02d}-01"
-            next_month = month + 1 if month < 12 else 1
-            next_year = year if month < 12 else year + 1
-            end_date = f"{next_year}-{next_month:02d}-01"
-            
-            response = self.supabase.table("fir_records")\
-                .select("*")\
-                .gte('incident_date', start_date)\
-                .lt('incident_date', end_date)\
-                .order('incident_date')\
-                .execute()
-            
-            return {"success": True, "data": response.data}
-            
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-    
-    def get_crime_statistics(self, start_date, end_date):
-        """Get crime statistics for dashboard"""
-        try:
-            response = self.supabase.table("fir_records")\
-                .select("incident_type")\
-                .gte('incident_date', start_date)\
-                .lte('incident_date', end_date)\
-                .execute()
-            
-            type_counts = {}
-            for record in response.data:
-                incident_type = record['incident_type']
-                type_counts[incident_type] = type_counts.get(incident_type, 0) + 1
-            
-            return {
-                "success": True,
-                "type_counts": type_counts,
-                "total_records": len(response.data),
-                "date_range": {"start": start_date, "end": end_date}
-            }
-            
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+import os
+import time
+import base64
+import threading
+from collections import OrderedDict
+from supabase import create_client, Client
+from dotenv import load_dotenv
+import json
+from datetime import datetime
+from scripts.fir_rollups import WEEKDAYS
+
+load_dotenv()
+
+# Grouped counts come from the SQL functions in supabase/migrations; set to 0
+# on a database where the migration has not been applied yet
+SQL_AGGREGATES = os.getenv("SUPABASE_SQL_AGGREGATES", "1") != "0"
+
+# Listing / search pages are keyset-paginated on (created_at, id), newest first
+FIR_COLUMNS = {
+    'id', 'fir_number', 'police_station', 'district', 'state', 'incident_type', 'incident_date',
+    'incident_time', 'incident_location', 'incident_description', 'victim_name', 'victim_contact',
+    'victim_address', 'victim_age', 'victim_gender', 'accused_name', 'accused_description',
+    'ipc_sections', 'investigating_officer', 'additional_comments', 'pdf_path', 'status',
+    'investigation_notes', 'created_at', 'updated_at'
+}
+CURSOR_COLUMNS = ['id', 'fir_number', 'created_at']
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+# count=cached reuses an exact count per filter set for this many seconds
+COUNT_CACHE_TTL = int(os.getenv("FIR_COUNT_CACHE_TTL", "60"))
+# Filter sets kept (LRU); keys include free-text search, so the cache must be bounded
+COUNT_CACHE_SIZE = int(os.getenv("FIR_COUNT_CACHE_SIZE", "256"))
+COUNT_MODES = ('estimated', 'cached', 'exact')
+
+
+def encode_cursor(record):
+    """Opaque cursor pointing just past `record` (needs its created_at and id)"""
+    payload = json.dumps([record['created_at'], record['id']]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """(created_at, id) from a cursor; created_at is re-serialized from a parsed timestamp
+    
+    The values end up inside a PostgREST or=() filter, so nothing from the
+    client-supplied cursor is passed through verbatim.
+    """
+    try:
+        created_at, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(created_at).isoformat(), int(record_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def projection(fields=None):
+    """select() column list for `fields` (comma string or list); cursor columns are always included"""
+    if not fields:
+        return "*"
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    fields = [field.strip() for field in fields if field.strip()]
+    unknown = [field for field in fields if field not in FIR_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return ",".join(dict.fromkeys(CURSOR_COLUMNS + fields))
+
+class SupabaseFIRClient:
+    def __init__(self):
+        self.url = os.getenv("SUPABASE_URL")
+        # Prefer service role key if available, otherwise fall back to anon key
+        self.key = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY")
+        
+        if not self.url or not self.key:
+            raise ValueError("Supabase URL and Key must be set in environment variables")
+        
+        self.supabase: Client = create_client(self.url, self.key)
+        self._count_cache = OrderedDict()
+        self._count_lock = threading.Lock()
+    
+    def store_fir_record(self, fir_data):
+        """Store FIR record in Supabase"""
+        try:
+            response = self.supabase.table("fir_records").insert(fir_data).execute()
+            
+            if response.data:
+                return {"success": True, "id": response.data[0]['id']}
+            else:
+                return {"success": False, "error": str(response.error)}
+                
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def _apply_filters(self, query, filters):
+        """Apply search filters to a fir_records query"""
+        if filters.get('start_date') and filters.get('end_date'):
+            query = query.gte('incident_date', filters['start_date'])\
+                        .lte('incident_date', filters['end_date'])
+        
+        if filters.get('date'):
+            query = query.eq('incident_date', filters['date'])
+        
+        if filters.get('incident_type'):
+            query = query.eq('incident_type', filters['incident_type'])
+        
+        if filters.get('police_station'):
+            query = query.eq('police_station', filters['police_station'])
+        
+        if filters.get('district'):
+            query = query.eq('district', filters['district'])
+        
+        if filters.get('ipc_section'):
+            query = query.ilike('ipc_sections', f'%{filters["ipc_section"]}%')
+        
+        if filters.get('search_text'):
+            query = query.ilike('incident_description', f'%{filters["search_text"]}%')
+        
+        return query
+    
+    def count_fir_records(self, filters=None, mode='estimated'):
+        """Number of matching FIRs: planner estimate, exact, or exact cached for COUNT_CACHE_TTL seconds"""
+        if mode not in COUNT_MODES:
+            raise ValueError(f"Unknown count mode '{mode}'. Expected one of {COUNT_MODES}")
+        filters = filters or {}
+        
+        key = json.dumps(filters, sort_keys=True, default=str)
+        if mode == 'cached':
+            with self._count_lock:
+                cached = self._count_cache.get(key)
+                if cached and time.monotonic() - cached[1] < COUNT_CACHE_TTL:
+                    self._count_cache.move_to_end(key)
+                    return cached[0]
+        
+        query = self.supabase.table("fir_records")\
+            .select("id", count='estimated' if mode == 'estimated' else 'exact')
+        response = self._apply_filters(query, filters).limit(1).execute()
+        total = response.count or 0
+        
+        if mode == 'cached':
+            now = time.monotonic()
+            with self._count_lock:
+                self._count_cache[key] = (total, now)
+                self._count_cache.move_to_end(key)
+                # Drop expired entries (oldest first), then anything over the size cap
+                while self._count_cache:
+                    oldest_key, (_, stored_at) = next(iter(self._count_cache.items()))
+                    if now - stored_at < COUNT_CACHE_TTL and len(self._count_cache) <= COUNT_CACHE_SIZE:
+                        break
+                    del self._count_cache[oldest_key]
+        return total
+    
+    def search_fir_records(self, filters=None, cursor=None, limit=DEFAULT_PAGE_SIZE, fields=None, count=None):
+        """One page of matching FIRs, newest first, keyset-paginated on (created_at, id)
+        
+        Pass the returned next_cursor to get the following page. `fields`
+        limits the columns returned; `count` ('estimated', 'cached' or 'exact')
+        adds a total for the first page only.
+        """
+        try:
+            filters = filters or {}
+            limit = max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+            query = self._apply_filters(self.supabase.table("fir_records").select(projection(fields)), filters)
+            
+            if cursor:
+                created_at, record_id = decode_cursor(cursor)
+                query = query.or_(f'created_at.lt."{created_at}",'
+                                  f'and(created_at.eq."{created_at}",id.lt.{record_id})')
+            
+            # One extra row tells whether another page exists
+            response = query.order('created_at', desc=True)\
+                .order('id', desc=True)\
+                .limit(limit + 1)\
+                .execute()
+            
+            records = response.data[:limit]
+            has_more = len(response.data) > limit
+            result = {
+                "success": True,
+                "data": records,
+                "next_cursor": encode_cursor(records[-1]) if has_more else None,
+                "has_more": has_more
+            }
+            if count and not cursor:
+                result["total"] = self.count_fir_records(filters, count)
+                result["total_is_estimate"] = count == 'estimated'
+            return result
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def get_fir_by_number(self, fir_number):
+        """Get specific FIR by FIR number"""
+        try:
+            response = self.supabase.table("fir_records")\
+                .select("*")\
+                .eq("fir_number", fir_number)\
+                .execute()
+            
+            if response.data:
+                return {"success": True, "data": response.data[0]}
+            else:
+                return {"success": False, "error": "FIR not found"}
+                
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def get_monthly_report(self, year, month):
+        """Get monthly FIR report"""
+        try:
+            start_date = f"{year}-{month:02d}-01"
+            next_month = month + 1 if month < 12 else 1
+            next_year = year if month < 12 else year + 1
+            end_date = f"{next_year}-{next_month:02d}-01"
+            
+            response = self.supabase.table("fir_records")\
+                .select("*")\
+                .gte('incident_date', start_date)\
+                .lt('incident_date', end_date)\
+                .order('incident_date')\
+                .execute()
+            
+            return {"success": True, "data": response.data}
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def get_grouped_counts(self, start_date=None, end_date=None):
+        """Counts by type, location, hour and weekday for a date range (rpc fir_grouped_counts)"""
+        try:
+            response = self.supabase.rpc("fir_grouped_counts", {
+                "start_date": start_date,
+                "end_date": end_date
+            }).execute()
+            
+            counts = {
+                "total": 0,
+                "incident_type": {},
+                "incident_location": {},
+                "hour": {},
+                "weekday": {},
+                "older_than_30_days": 0
+            }
+            for row in response.data:
+                dimension, value, count = row['dimension'], row['value'], row['count']
+                if dimension == 'total':
+                    counts['total'] = count
+                elif dimension == 'older_than_30_days':
+                    if value == 'true':
+                        counts['older_than_30_days'] = count
+                elif dimension == 'hour':
+                    if value is not None:
+                        counts['hour'][int(value)] = count
+                elif dimension == 'weekday':
+                    if value is not None:
+                        counts['weekday'][WEEKDAYS[int(value)]] = count
+                else:
+                    counts[dimension][value if value is not None else 'Unknown'] = count
+            
+            for dimension in ("incident_type", "incident_location", "hour", "weekday"):
+                counts[dimension] = dict(sorted(counts[dimension].items(), key=lambda x: x[1], reverse=True))
+            
+            return {"success": True, "counts": counts}
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def get_location_counts(self, start_date=None, end_date=None, min_count=1, limit=None):
+        """Locations with at least min_count FIRs, most frequent first (rpc fir_location_counts)"""
+        try:
+            response = self.supabase.rpc("fir_location_counts", {
+                "start_date": start_date,
+                "end_date": end_date,
+                "min_count": min_count,
+                "max_rows": limit
+            }).execute()
+            
+            return {
+                "success": True,
+                "locations": {row['incident_location']: row['count'] for row in response.data}
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def get_crime_statistics(self, start_date, end_date):
+        """Get crime statistics for dashboard"""
+        try:
+            if SQL_AGGREGATES:
+                result = self.get_grouped_counts(start_date, end_date)
+                if not result['success']:
+                    return result
+                return {
+                    "success": True,
+                    "type_counts": result['counts']['incident_type'],
+                    "total_records": result['counts']['total'],
+                    "date_range": {"start": start_date, "end": end_date}
+                }
+            
+            response = self.supabase.table("fir_records")\
+                .select("incident_type")\
+                .gte('incident_date', start_date)\
+                .lte('incident_date', end_date)\
+                .execute()
+            
+            type_counts = {}
+            for record in response.data:
+                incident_type = record['incident_type']
+                type_counts[incident_type] = type_counts.get(incident_type, 0) + 1
+            
+            return {
+                "success": True,
+                "type_counts": type_counts,
+                "total_records": len(response.data),
+                "date_range": {"start": start_date, "end": end_date}
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
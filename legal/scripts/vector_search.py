@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def normalize_rows(matrix):
+    """Return a C-contiguous float32 copy of `matrix` with L2-normalized rows"""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # Zero vectors stay zero instead of turning into NaNs
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+def normalize_vector(vector):
+    """L2-normalize a single query vector as float32"""
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, best first, without a full sort"""
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        part = np.broadcast_to(np.arange(n), scores.shape).copy()
+    part_scores = np.take_along_axis(scores, part, axis=-1)
+    order = np.argsort(-part_scores, axis=-1, kind="stable")
+    return np.take_along_axis(part, order, axis=-1)
+
+
+def cosine_top_k(matrix, query_vector, k):
+    """Score one query against a pre-normalized matrix; returns (indices, scores)"""
+    scores = matrix @ normalize_vector(query_vector)
+    idx = top_k_indices(scores, k)
+    return idx, scores[idx]
+
+
+def cosine_top_k_batch(matrix, query_vectors, k):
+    """Score many queries with one matrix multiply; returns (indices, scores) of shape (q, k)"""
+    scores = normalize_rows(query_vectors) @ matrix.T
+    idx = top_k_indices(scores, k)
+    return idx, np.take_along_axis(scores, idx, axis=-1)
@@ -0,0 +1,40 @@
+-- Minimal stand-in for the hosted database, for running migrations against a
+-- plain local Postgres (scripts/sql_aggregates.py, tests/test_sql_aggregates.py). Only the columns the
+-- FIR service reads and writes are declared.
+
+do $$
+begin
+  -- Roles Supabase provides; the migrations grant to them
+  if not exists (select from pg_roles where rolname = 'anon') then create role anon nologin; end if;
+  if not exists (select from pg_roles where rolname = 'authenticated') then create role authenticated nologin; end if;
+  if not exists (select from pg_roles where rolname = 'service_role') then create role service_role nologin; end if;
+end
+$$;
+
+create table if not exists public.fir_records (
+  id bigint generated by default as identity primary key,
+  fir_number text unique not null,
+  police_station text,
+  district text,
+  state text,
+  incident_type text,
+  incident_date date,
+  incident_time text,
+  incident_location text,
+  incident_description text,
+  victim_name text,
+  victim_contact text,
+  victim_address text,
+  victim_age integer,
+  victim_gender text,
+  accused_name text,
+  accused_description text,
+  ipc_sections text,
+  investigating_officer text,
+  additional_comments text,
+  pdf_path text,
+  status text,
+  investigation_notes text,
+  created_at timestamptz not null default now(),
+  updated_at timestamptz not null default now()
+);
@@ -0,0 +1,84 @@
+-- Grouped FIR counts computed in Postgres, called from SupabaseFIRClient via rpc().
+-- Dashboards receive one row per distinct value instead of one row per FIR.
+-- fir_records.incident_date may be a date or 'YYYY-MM-DD' text (the app writes
+-- ISO strings); fir_incident_day() resolves to the matching overload either way.
+-- incident_time may be text ('HH:MM') or time; created_at is cast to timestamptz.
+
+create index if not exists fir_records_incident_date_idx on public.fir_records (incident_date);
+create index if not exists fir_records_incident_location_idx on public.fir_records (incident_location);
+
+-- date column: inlined as the column itself, so the incident_date index still applies
+create or replace function public.fir_incident_day(value date)
+returns date
+language sql
+immutable
+as $$ select value $$;
+
+-- text column: rows without a leading ISO date count as having no date instead of failing the query
+create or replace function public.fir_incident_day(value text)
+returns date
+language sql
+stable
+as $$ select case when value ~ '^\s*\d{4}-\d{2}-\d{2}' then left(trim(value), 10)::date end $$;
+
+-- Counts by type, location, hour, weekday (0 = Sunday) and age in one scan.
+-- dimension is one of: total, incident_type, incident_location, hour, weekday, older_than_30_days.
+create or replace function public.fir_grouped_counts(start_date date default null, end_date date default null)
+returns table (dimension text, value text, count bigint)
+language sql
+stable
+as $$
+  with scoped as (
+    select
+      incident_type,
+      incident_location,
+      case when incident_time::text ~ '^\s*\d{1,2}:'
+           then split_part(trim(incident_time::text), ':', 1)::int end as hour,
+      extract(dow from public.fir_incident_day(incident_date))::int as weekday,
+      created_at::timestamptz < now() - interval '30 days' as older_than_30_days
+    from public.fir_records
+    where (fir_grouped_counts.start_date is null or public.fir_incident_day(incident_date) >= fir_grouped_counts.start_date)
+      and (fir_grouped_counts.end_date is null or public.fir_incident_day(incident_date) <= fir_grouped_counts.end_date)
+  )
+  select
+    case
+      when grouping(incident_type) = 0 then 'incident_type'
+      when grouping(incident_location) = 0 then 'incident_location'
+      when grouping(hour) = 0 then 'hour'
+      when grouping(weekday) = 0 then 'weekday'
+      when grouping(older_than_30_days) = 0 then 'older_than_30_days'
+      else 'total'
+    end,
+    coalesce(incident_type, incident_location, hour::text, weekday::text, older_than_30_days::text),
+    count(*)
+  from scoped
+  group by grouping sets ((incident_type), (incident_location), (hour), (weekday), (older_than_30_days), ())
+$$;
+
+-- Locations with at least min_count FIRs, most frequent first (hotspots).
+create or replace function public.fir_location_counts(
+  start_date date default null,
+  end_date date default null,
+  min_count integer default 1,
+  max_rows integer default null
+)
+returns table (incident_location text, count bigint)
+language sql
+stable
+as $$
+  select r.incident_location, count(*) as count
+  from public.fir_records r
+  where r.incident_location is not null
+    and r.incident_location <> ''
+    and (fir_location_counts.start_date is null or public.fir_incident_day(r.incident_date) >= fir_location_counts.start_date)
+    and (fir_location_counts.end_date is null or public.fir_incident_day(r.incident_date) <= fir_location_counts.end_date)
+  group by r.incident_location
+  having count(*) >= fir_location_counts.min_count
+  order by count(*) desc, r.incident_location
+  limit fir_location_counts.max_rows
+$$;
+
+grant execute on function public.fir_incident_day(date) to anon, authenticated, service_role;
+grant execute on function public.fir_incident_day(text) to anon, authenticated, service_role;
+grant execute on function public.fir_grouped_counts(date, date) to anon, authenticated, service_role;
+grant execute on function public.fir_location_counts(date, date, integer, integer) to anon, authenticated, service_role;
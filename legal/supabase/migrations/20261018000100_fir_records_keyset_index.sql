@@ -0,0 +1,4 @@
+-- Backs keyset pagination of FIR listing / search: order by created_at desc, id desc,
+-- resuming after (created_at, id) of the previous page's last row.
+
+create index if not exists fir_records_created_at_id_idx on public.fir_records (created_at desc, id desc);
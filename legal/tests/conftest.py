@@ -0,0 +1,40 @@
+import os
+import sys
+import pytest
+
+# Tests import the service modules the way the apps do (`from scripts.x import ...`),
+# which resolves relative to the legal/ directory
+LEGAL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if LEGAL_DIR not in sys.path:
+    sys.path.insert(0, LEGAL_DIR)
+
+
+@pytest.fixture(scope="session")
+def fir_api(tmp_path_factory):
+    """fir_api imported with its local sqlite stores in a temp dir (skipped without Flask)"""
+    pytest.importorskip("flask")
+    pytest.importorskip("flask_cors")
+    models = tmp_path_factory.mktemp("models")
+    for name, filename in (("FIR_VECTOR_DB", "fir_vectors.sqlite3"), ("MO_CLUSTER_DB", "mo_clusters.sqlite3"),
+                           ("FIR_ROLLUP_DB", "fir_rollups.sqlite3")):
+        os.environ.setdefault(name, str(models / filename))
+    cwd = os.getcwd()
+    os.chdir(LEGAL_DIR)  # data/ and models/ paths are relative to legal/
+    try:
+        import fir_api
+    finally:
+        os.chdir(cwd)
+    return fir_api
+
+
+@pytest.fixture(scope="session")
+def chatbot_api():
+    """chatbot_api imported without starting warm-up (skipped without Flask); tests stub rag's readiness"""
+    pytest.importorskip("flask")
+    pytest.importorskip("flask_cors")
+    pytest.importorskip("dotenv")
+    from scripts import query
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(query, "start_warm_up", lambda: None)
+        import chatbot_api
+    return chatbot_api
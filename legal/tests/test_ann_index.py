@@ -0,0 +1,34 @@
+import os
+import numpy as np
+import pytest
+from scripts import ann_index
+
+pytest.importorskip("faiss")
+
+
+def _vectors(seed, n=200, dimension=16):
+    return np.random.default_rng(seed).normal(size=(n, dimension)).astype(np.float32)
+
+
+@pytest.mark.parametrize("index_type", ["flat", "sq8"])
+def test_index_from_another_store_version_is_rejected(tmp_path, index_type):
+    path = str(tmp_path / "faiss_index.bin")
+    ann_index.save_index(ann_index.build_index(_vectors(0), index_type=index_type), path,
+                         meta={'kb_version': 'v1', 'index_type': index_type})
+
+    # Rows replaced in place: same count, different store
+    assert ann_index.load_index(path, expected_size=200, kb_version='v2') is None
+    index = ann_index.load_index(path, expected_size=200, kb_version='v1')
+    assert index is not None and index.ntotal == 200
+
+    # Codes are mapped from the file rather than copied into each worker
+    if os.path.exists("/proc/self/maps"):
+        with open("/proc/self/maps") as f:
+            assert any(path in line for line in f)
+
+
+def test_index_without_meta_is_rejected(tmp_path):
+    path = str(tmp_path / "faiss_index.bin")
+    ann_index.faiss.write_index(ann_index.build_index(_vectors(0)), path)
+    assert ann_index.load_index(path, expected_size=200, kb_version='v1') is None
+    assert ann_index.load_index(path, expected_size=200) is not None
@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def warm_up_failed(chatbot_api, monkeypatch):
+    retries = []
+    monkeypatch.setattr(chatbot_api.rag, "is_ready", lambda: False)
+    monkeypatch.setattr(chatbot_api.rag, "get_status", lambda: {'state': 'failed', 'error': 'no store'})
+    monkeypatch.setattr(chatbot_api.rag, "start_warm_up", lambda: retries.append(1))
+    return retries
+
+
+def test_failed_warm_up_looks_the_same_on_both_endpoints(chatbot_api, warm_up_failed):
+    client = chatbot_api.app.test_client()
+    plain = client.post("/api/chat", json={'message': "What is section 420?"})
+    stream = client.post("/api/chat/stream", json={'message': "What is section 420?"})
+
+    assert plain.status_code == stream.status_code == 500
+    assert plain.get_json() == stream.get_json() == {
+        'success': False,
+        'error': "RAG system failed to load: no store",
+        'response': 'System error: Legal database not available.',
+    }
+    assert 'Retry-After' not in stream.headers
+    assert len(warm_up_failed) == 2
+
+
+def test_loading_is_a_retryable_503(chatbot_api, monkeypatch):
+    monkeypatch.setattr(chatbot_api.rag, "is_ready", lambda: False)
+    monkeypatch.setattr(chatbot_api.rag, "get_status", lambda: {'state': 'loading', 'error': None})
+
+    response = chatbot_api.app.test_client().get("/api/chat/stream?message=bail")
+    assert response.status_code == 503 and response.headers['Retry-After'] == '5'
@@ -0,0 +1,77 @@
+import os
+import time
+import multiprocessing
+import numpy as np
+from scripts.embedding_store import StoreWriter, content_hashes, load_store, save_store, store_lock
+
+
+def _rebuild(path, worker, events):
+    with store_lock(path):
+        with store_lock(path):  # re-entrant within a process
+            events.put(('start', worker, time.time()))
+            time.sleep(0.1)
+            save_store(path, np.random.rand(5, 4).astype(np.float32), {'text': [str(worker)] * 5})
+            events.put(('end', worker, time.time()))
+
+
+def test_concurrent_rebuilds_are_serialized(tmp_path):
+    path = str(tmp_path / "knowledge")
+    events = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_rebuild, args=(path, i, events)) for i in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+
+    order = [event[:2] for event in sorted((events.get() for _ in range(6)), key=lambda event: event[2])]
+    for i in range(0, 6, 2):
+        assert order[i][0] == 'start' and order[i + 1] == ('end', order[i][1])
+
+    store = load_store(path)
+    assert len(store) == 5 and len(set(store.column('text'))) == 1
+    assert not [name for name in os.listdir(path) if name.endswith(".tmp")]
+
+
+def _rebuild_repeatedly(path, builds):
+    for k in range(builds):
+        # Build k: 5 + k % 3 rows, every vector e_(k % 4), every text str(k)
+        vectors = np.zeros((5 + k % 3, 4), dtype=np.float32)
+        vectors[:, k % 4] = 1
+        save_store(path, vectors, {'text': [str(k)] * len(vectors)}, arrays={'build': np.full(len(vectors), k)})
+
+
+def test_readers_never_see_a_mix_of_two_builds(tmp_path):
+    path = str(tmp_path / "knowledge")
+    _rebuild_repeatedly(path, 1)
+    writer = multiprocessing.Process(target=_rebuild_repeatedly, args=(path, 40))
+    writer.start()
+    loads = 0
+    while writer.is_alive() or not loads:
+        store = load_store(path)
+        build = int(store.column('text')[0])
+        assert len(store.column('text')) == len(store) == len(store.arrays['build']) == 5 + build % 3
+        assert int(np.argmax(store.vectors[0])) == build % 4 and int(store.arrays['build'][-1]) == build
+        loads += 1
+    writer.join()
+    assert writer.exitcode == 0
+
+    assert load_store(path).column('text')[0] == '39'
+    assert len(os.listdir(os.path.join(path, "versions"))) == 2
+
+
+def test_finalize_publishes_a_new_version_without_touching_the_open_one(tmp_path):
+    path = str(tmp_path / "knowledge")
+    save_store(path, np.eye(4, dtype=np.float32), {'text': list("abcd")})
+    before = load_store(path)
+
+    writer = StoreWriter(path, ['text'], signature={'sources': []})
+    writer.append(np.eye(4, dtype=np.float32)[:2], [("x",), ("y",)], content_hashes(["x", "y"]))
+    writer.append(np.eye(4, dtype=np.float32)[2:3], [("z",)], content_hashes(["z"]))
+    writer.finalize()
+
+    after = load_store(path)
+    assert after.column('text') == ["x", "y", "z"] and len(after) == 3
+    assert after.path != before.path and not os.path.exists(os.path.join(path, StoreWriter.PARTIAL_DIR))
+    # The store opened earlier still reads its own, unchanged files
+    assert before.column('text') == list("abcd") and np.array_equal(before.vectors, np.eye(4))
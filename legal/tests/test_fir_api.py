@@ -0,0 +1,182 @@
+import base64
+import json
+import pytest
+
+
+def _cursor(created_at, record_id):
+    return base64.urlsafe_b64encode(json.dumps([created_at, record_id]).encode("utf-8")).decode("ascii")
+
+
+class FakeQuery:
+    """PostgREST query builder returning the same rows whatever the filters"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        return type("Response", (), {'data': list(self.rows), 'count': len(self.rows)})()
+
+
+class FakeFIRClient:
+    """Stands in for SupabaseFIRClient; returns canned pages and records the calls"""
+
+    def __init__(self, rows=()):
+        self.calls = []
+        self.supabase = type("Supabase", (), {'table': lambda _, name: FakeQuery(rows)})()
+
+    def count_fir_records(self, filters=None, mode='estimated'):
+        return 42
+
+    def search_fir_records(self, filters=None, cursor=None, limit=20, fields=None, count=None):
+        self.calls.append({'filters': filters, 'cursor': cursor, 'limit': limit})
+        return {'success': True, 'data': [{'id': 1, 'fir_number': 'FIR/1', 'created_at': '2024-05-01T10:00:00+00:00'}],
+                'next_cursor': None, 'has_more': False}
+
+
+@pytest.fixture
+def client(fir_api, monkeypatch):
+    monkeypatch.setattr(fir_api, "supabase_client", FakeFIRClient())
+    return fir_api.app.test_client()
+
+
+@pytest.mark.parametrize("limit", ["abc", 0, -5, [3], True])
+def test_search_rejects_bad_limit(client, fir_api, limit):
+    response = client.post("/api/fir/search", json={'limit': limit})
+    assert response.status_code == 400
+    assert "limit" in response.get_json()['error']
+    assert not fir_api.supabase_client.calls
+
+
+def test_list_rejects_bad_limit(client):
+    assert client.get("/api/fir/list?limit=ten").status_code == 400
+    assert client.get("/api/fir/list?limit=5").status_code == 200
+
+
+def test_search_rejects_cursor_with_injected_filter(client, fir_api):
+    cursor = _cursor('2024",id.gt.0,created_at.eq."x', 7)
+    response = client.post("/api/fir/search", json={'cursor': cursor})
+    assert response.status_code == 400
+    assert not fir_api.supabase_client.calls
+
+
+def test_cursor_filter_uses_reserialized_timestamp():
+    from scripts.supabase_client import SupabaseFIRClient
+
+    class Query:
+        def __init__(self):
+            self.or_filters = []
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: self
+
+        def or_(self, condition):
+            self.or_filters.append(condition)
+            return self
+
+        def execute(self):
+            return type("Response", (), {'data': []})()
+
+    query = Query()
+    fir_client = SupabaseFIRClient.__new__(SupabaseFIRClient)
+    fir_client.supabase = type("Supabase", (), {'table': lambda self, name: query})()
+
+    result = fir_client.search_fir_records(cursor=_cursor("2024-05-01T10:00:00Z", 7))
+    assert result['success']
+    assert query.or_filters == ['created_at.lt."2024-05-01T10:00:00+00:00",'
+                                'and(created_at.eq."2024-05-01T10:00:00+00:00",id.lt.7)']
+
+
+def test_count_cache_is_bounded(monkeypatch):
+    import threading
+    from collections import OrderedDict
+    from scripts import supabase_client
+
+    class Query:
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: self
+
+        def execute(self):
+            return type("Response", (), {'count': 3})()
+
+    monkeypatch.setattr(supabase_client, "COUNT_CACHE_SIZE", 4)
+    fir_client = supabase_client.SupabaseFIRClient.__new__(supabase_client.SupabaseFIRClient)
+    fir_client.supabase = type("Supabase", (), {'table': lambda self, name: Query()})()
+    fir_client._count_cache, fir_client._count_lock = OrderedDict(), threading.Lock()
+
+    for i in range(20):
+        assert fir_client.count_fir_records({'search_text': f"text {i}"}, mode='cached') == 3
+    assert len(fir_client._count_cache) == 4
+    assert json.loads(next(reversed(fir_client._count_cache)))['search_text'] == "text 19"
+
+
+def test_dashboard_bundle_shape(fir_api, monkeypatch):
+    now = "2024-05-01T10:00:00+00:00"
+    rows = [{'id': i, 'fir_number': f"FIR/{i}", 'incident_type': 'Theft', 'incident_date': '2024-05-01',
+             'investigating_officer': 'SI Rao', 'created_at': now, 'updated_at': now} for i in range(3)]
+    monkeypatch.setattr(fir_api, "supabase_client", FakeFIRClient(rows))
+    monkeypatch.setattr(fir_api, "case_analyzer", None)  # hotspots panel fails on its own
+
+    response = fir_api.app.test_client().get("/api/police/dashboard/bundle")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['success'] is True
+    panels = body['panels']
+    assert set(panels) == {'overview', 'pending_cases', 'case_updates', 'hotspots', 'legal_resources'}
+
+    assert panels['overview'] == {'success': True, 'overview': {
+        'today_cases': 3, 'pending_cases': 3, 'total_cases': 42, 'recent_activity': rows}}
+    assert panels['pending_cases']['success'] and panels['pending_cases']['count'] == 3
+    assert panels['case_updates']['success'] and panels['case_updates']['last_week_count'] == 3
+    assert panels['case_updates']['updates'][0]['officer'] == 'SI Rao'
+    assert panels['hotspots'] == {'success': False, 'error': 'Analytics service not available'}
+    assert set(panels['legal_resources']['resources']) == {'ipc_sections', 'procedures', 'templates'}
+
+    assert {'overview.today_cases', 'pending_cases', 'hotspots'} <= set(body['timings_ms'])
+    assert body['elapsed_ms'] >= 0
+
+
+def test_dashboard_bundle_reports_failed_panels(fir_api, monkeypatch):
+    fir_client = FakeFIRClient()
+    fir_client.count_fir_records = lambda *args, **kwargs: 1 / 0
+    monkeypatch.setattr(fir_api, "supabase_client", fir_client)
+
+    panels = fir_api.app.test_client().get("/api/police/dashboard/bundle").get_json()['panels']
+    assert panels['overview'] == {'success': False, 'error': 'division by zero'}
+    assert panels['case_updates']['success']
+
+
+class Recorder:
+    """Stands in for FIRVectorStore / MOClusterIndex; records what was filed"""
+
+    def __init__(self):
+        self.calls = []
+
+    def put(self, fir_number, *args):
+        self.calls.append(fir_number)
+
+    def assign(self, fir_numbers, vectors):
+        self.calls.extend(fir_numbers)
+
+
+@pytest.mark.parametrize("stored", [True, False])
+def test_generate_pdf_indexes_the_description_only_once_stored(fir_api, monkeypatch, tmp_path, stored):
+    pdf = tmp_path / "fir.pdf"
+    pdf.write_bytes(b"%PDF")
+    fir_client = FakeFIRClient()
+    fir_client.store_fir_record = lambda data: {'success': stored, 'id': 1, 'error': None if stored else 'down'}
+    vectors, clusters = Recorder(), Recorder()
+    monkeypatch.setattr(fir_api, "supabase_client", fir_client)
+    monkeypatch.setattr(fir_api, "generate_fir_pdf", lambda fir_data: str(pdf))
+    monkeypatch.setattr(fir_api, "fir_vectors", vectors)
+    monkeypatch.setattr(fir_api, "mo_clusters", clusters)
+    monkeypatch.setattr(fir_api, "get_embedding_service",
+                        lambda: type("Encoder", (), {'encode': lambda self, text: [1.0, 0.0]})())
+
+    body = fir_api.app.test_client().post("/api/fir/generate-pdf",
+                                          json={'incident_description': "Phone snatched at the bus stop"}).get_json()
+    assert body['success'] and body['stored_in_db'] is stored
+    expected = [body['fir_number']] if stored else []
+    assert vectors.calls == expected and clusters.calls == expected
@@ -0,0 +1,93 @@
+import multiprocessing
+from datetime import datetime, timedelta
+from scripts.fir_rollups import FIRRollups
+
+
+class FakeSupabase:
+    """fir_records table supporting the calls backfill() makes"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def table(self, name):
+        return FakeQuery(self.rows)
+
+
+class FakeQuery:
+    def __init__(self, rows):
+        self.rows, self.after, self.size = rows, None, None
+
+    def select(self, columns):
+        return self
+
+    def gt(self, column, value):
+        self.after = value
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, size):
+        self.size = size
+        return self
+
+    def execute(self):
+        rows = sorted((r for r in self.rows if self.after is None or r['id'] > self.after), key=lambda r: r['id'])
+        return type("Response", (), {'data': rows[:self.size]})()
+
+
+def _fir(i, incident_type='Theft', status=None):
+    return {'id': i, 'fir_number': f"FIR/{i}", 'incident_date': '2024-05-01', 'incident_time': '10:30',
+            'police_station': 'Central', 'district': 'North', 'incident_type': incident_type,
+            'incident_location': 'Market', 'status': status}
+
+
+def _record_rounds(path, worker, rounds, firs):
+    rollups = FIRRollups(path)
+    for round_ in range(rounds):
+        status = 'Closed' if (round_ + worker) % 2 else 'Open'
+        for i in range(1, firs + 1):
+            rollups.record(_fir(i, status=status))
+
+
+def test_workers_recording_the_same_firs_count_each_once(tmp_path):
+    path = str(tmp_path / "rollups.sqlite3")
+    workers = [multiprocessing.Process(target=_record_rounds, args=(path, i, 20, 10)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=120)
+        assert worker.exitcode == 0
+
+    rollups = FIRRollups(path)
+    assert rollups.total() == 10
+    assert sum(rollups.grouped_counts('status').values()) == 10
+    assert sum(rollups.location_counts().values()) == 10
+
+
+def test_backfill_reconciles_edits_and_deletes(tmp_path):
+    rows = [_fir(i) for i in range(1, 6)]
+    rollups = FIRRollups(str(tmp_path / "rollups.sqlite3"))
+    rollups.backfill(FakeSupabase(rows), page_size=2)
+    assert rollups.ready and rollups.total() == 5
+
+    # Edited and deleted directly in the database; FIR/99 was counted here but never stored
+    rows[0]['incident_type'] = 'Assault'
+    del rows[1]
+    rollups.record(_fir(99))
+    rollups.backfill(FakeSupabase(rows), page_size=2)
+
+    assert rollups.grouped_counts('incident_type') == {'Theft': 3, 'Assault': 1}
+    assert rollups.total() == 4
+
+
+def test_rollups_stop_being_ready_when_reconciliation_is_overdue(tmp_path):
+    rollups = FIRRollups(str(tmp_path / "rollups.sqlite3"), max_age=60)
+    assert not rollups.ready
+    rollups.backfill(FakeSupabase([_fir(1)]))
+    assert rollups.ready
+
+    with rollups._lock:
+        rollups._db.execute("UPDATE meta SET value = ? WHERE key = 'backfilled_at'",
+                            ((datetime.now() - timedelta(minutes=5)).isoformat(),))
+    assert not rollups.ready
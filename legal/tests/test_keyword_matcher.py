@@ -0,0 +1,41 @@
+import os
+import pytest
+from scripts.keyword_matcher import KeywordMatcher
+
+KEYWORD_CSV = os.path.join(os.path.dirname(__file__), os.pardir, "data", "keyword_sections.csv")
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return KeywordMatcher.from_csv(KEYWORD_CSV)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("He was killed by his brother over a land dispute.", {'302', '304'}),
+    ("The victim was killed in a road accident near the highway.", {'304A'}),
+    ("A speeding truck ran over and killed the pedestrian.", {'304A'}),
+    ("Someone killed our neighbour's dog with poison.", {'428', '429'}),
+    ("The accused hacked him with a sword during the fight.", {'324', '326'}),
+    ("He stabbed me with a knife.", {'324', '326'}),
+    ("There was a stabbing with a knife outside the bar.", {'324', '326'}),
+    ("My Instagram account was hacked and messages were sent to friends.", {'66C', '66D'}),
+    ("The shopkeeper was murdered at night.", {'300', '302'}),
+])
+def test_killed_and_hacked_need_context(matcher, text, expected):
+    assert set(matcher.match_sections(text)) == expected
+
+
+def test_threat_to_kill_is_not_homicide(matcher):
+    assert set(matcher.match_sections("He threatened to kill me")) == {'503', '506'}
+
+
+def test_context_is_scoped_to_the_sentence(matcher):
+    text = "There was an accident on the highway last week. Today the accused killed his neighbour."
+    assert set(matcher.match_sections(text)) == {'302', '304'}
+
+
+def test_longest_term_wins_at_the_same_position():
+    matcher = KeywordMatcher({'theft': ['379'], 'identity theft': ['66C']},
+                             {'theft': ['stole'], 'identity theft': []})
+    assert [hit['keyword'] for hit in matcher.find("Identity theft after they stole my wallet")] == \
+        ['identity theft', 'theft']
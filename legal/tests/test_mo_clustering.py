@@ -0,0 +1,25 @@
+import numpy as np
+from scripts.mo_clustering import MOClusterIndex
+
+
+def _unit(i, dimension=8):
+    vector = np.zeros(dimension, dtype=np.float32)
+    vector[i] = 1
+    return vector
+
+
+def test_workers_sharing_a_file_do_not_reuse_cluster_ids(tmp_path):
+    path = str(tmp_path / "mo_clusters.sqlite3")
+    first, second = MOClusterIndex(path), MOClusterIndex(path)
+
+    assert first.assign(['F1'], [_unit(0)]) == [0]
+    # Unrelated FIR through another worker opens a new cluster instead of overwriting cluster 0
+    assert second.assign(['F2'], [_unit(1)]) == [1]
+    # Each worker sees the other's clusters and assignments
+    assert first.assign(['F3'], [_unit(1)]) == [1]
+    assert second.assign(['F1'], [_unit(1)]) == [0]
+
+    reloaded = MOClusterIndex(path)
+    assert reloaded.assignments == {'F1': 0, 'F2': 1, 'F3': 1}
+    assert reloaded.cluster_sizes().tolist() == [1, 2]
+    assert np.allclose(reloaded._centroids[0], _unit(0))
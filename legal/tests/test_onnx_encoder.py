@@ -0,0 +1,69 @@
+import os
+import pytest
+import pandas as pd
+
+for module in ("onnxruntime", "tokenizers", "onnx", "torch", "sentence_transformers"):
+    pytest.importorskip(module)
+
+from sentence_transformers import SentenceTransformer
+from scripts.embedding_service import MODEL_NAME
+from scripts.onnx_encoder import PARITY_QUERIES, PARITY_TOLERANCE, OnnxEncoder, export_onnx, parity
+
+KNOWLEDGE_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "combined_knowledge.csv")
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return pd.read_csv(KNOWLEDGE_CSV, dtype=str, na_filter=False)["content"].head(50).tolist()
+
+
+@pytest.fixture(scope="module")
+def small_model(tmp_path_factory, corpus):
+    """Randomly initialised 2-layer BERT sentence model saved locally, so the export path runs offline"""
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+    try:
+        from sentence_transformers.sentence_transformer import modules as models
+    except ImportError:
+        from sentence_transformers import models
+
+    root = tmp_path_factory.mktemp("small_model")
+    words = sorted({word.strip(".,:;()'\"").lower() for text in PARITY_QUERIES + corpus for word in text.split()} - {""})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"] + words
+    (root / "vocab.txt").write_text("\n".join(vocab), encoding="utf-8")
+
+    transformer_dir = str(root / "transformer")
+    tokenizer = BertTokenizerFast(vocab_file=str(root / "vocab.txt"))
+    tokenizer.save_pretrained(transformer_dir)
+    BertModel(BertConfig(vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+                         intermediate_size=64, max_position_embeddings=256)).save_pretrained(transformer_dir)
+
+    model_dir = str(root / "sentence_model")
+    SentenceTransformer(modules=[models.Transformer(transformer_dir, max_seq_length=128),
+                                 models.Pooling(32, "mean"), models.Normalize()], device="cpu").save(model_dir)
+    return model_dir
+
+
+@pytest.fixture(scope="module")
+def configured_model():
+    """MODEL_NAME from the local cache; skipped where it cannot be loaded offline"""
+    try:
+        return SentenceTransformer(MODEL_NAME, device="cpu", local_files_only=True)
+    except Exception as e:
+        pytest.skip(f"{MODEL_NAME} not available offline: {e}")
+
+
+@pytest.mark.parametrize("quantized", [False, True], ids=["fp32", "int8"])
+def test_exported_small_model_matches_torch(small_model, corpus, tmp_path, quantized):
+    exported = export_onnx(small_model, str(tmp_path), quantize=True)
+    results = parity(SentenceTransformer(small_model, device="cpu"), OnnxEncoder(exported, quantized=quantized),
+                     PARITY_QUERIES, corpus)
+    assert results['min_cosine'] >= PARITY_TOLERANCE['int8' if quantized else 'fp32']
+
+
+@pytest.mark.parametrize("quantized", [False, True], ids=["fp32", "int8"])
+def test_exported_embedding_model_matches_torch(configured_model, corpus, tmp_path, quantized):
+    exported = export_onnx(MODEL_NAME, str(tmp_path), quantize=True)
+    results = parity(configured_model, OnnxEncoder(exported, quantized=quantized), PARITY_QUERIES, corpus)
+    assert results['min_cosine'] >= PARITY_TOLERANCE['int8' if quantized else 'fp32']
+    if not quantized:
+        assert results['top5_overlap'] == 1.0
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scripts import query
+from scripts.bm25_index import BM25Index
+
+DOCS = pd.DataFrame({
+    'title': ["Section 438 - Anticipatory bail", "Court fees", "Court procedure", "Court records"],
+    'content': ["Direction for grant of bail to person apprehending arrest",
+                "Fees payable in a court", "How a court hears a case", "Records kept by the court"],
+})
+
+
+@pytest.fixture
+def lexical_index(monkeypatch):
+    monkeypatch.setattr(query, "df", DOCS)
+    monkeypatch.setattr(query, "bm25", BM25Index.from_titles_and_contents(DOCS['title'], DOCS['content']))
+    return query.bm25
+
+
+def test_fast_path_needs_a_strong_raw_score(lexical_index, monkeypatch):
+    scores, _ = lexical_index.score("anticipatory bail")
+    monkeypatch.setattr(query, "LEXICAL_FAST_PATH_MIN_SCORE", float(scores.max()))
+    results = query._lexical_fast_path("anticipatory bail", scores, top_k=3)
+    assert results and results[0][0] == "Section 438 - Anticipatory bail" and results[0][2] == 1.0
+
+    # Same unambiguous match, but below the raw floor: left to the dense path and its threshold
+    monkeypatch.setattr(query, "LEXICAL_FAST_PATH_MIN_SCORE", float(scores.max()) + 0.01)
+    assert query._lexical_fast_path("anticipatory bail", scores, top_k=3) is None
+
+
+def test_fast_path_skips_common_terms_at_default_floor(lexical_index):
+    scores, _ = lexical_index.score("court")
+    assert np.max(scores) < query.LEXICAL_FAST_PATH_MIN_SCORE
+    assert query._lexical_fast_path("court", scores, top_k=3) is None
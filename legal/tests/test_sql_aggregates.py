@@ -0,0 +1,59 @@
+import os
+import pytest
+from scripts.sql_aggregates import LOCAL_DATABASE_URL, apply_migrations, expected_counts, rpc_counts, seed
+
+psycopg2 = pytest.importorskip("psycopg2")
+from psycopg2.extensions import make_dsn, ISOLATION_LEVEL_AUTOCOMMIT
+
+SUPABASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "supabase")
+TEST_DATABASE = "fir_aggregates_test"
+START_DATE, END_DATE = '2024-03-01', '2024-08-31'
+
+
+@pytest.fixture(scope="module")
+def database():
+    """Scratch database on LOCAL_DATABASE_URL's server (seed() truncates fir_records)"""
+    try:
+        admin = psycopg2.connect(LOCAL_DATABASE_URL)
+    except psycopg2.OperationalError as e:
+        pytest.skip(f"No local Postgres at LOCAL_DATABASE_URL: {e}")
+    admin.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE}")
+        cur.execute(f"CREATE DATABASE {TEST_DATABASE}")
+    yield make_dsn(LOCAL_DATABASE_URL, dbname=TEST_DATABASE)
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE}")
+    admin.close()
+
+
+# The hosted column type is not pinned down; the app writes ISO strings either way
+@pytest.mark.parametrize("incident_date_type", ["date", "text"])
+def test_rpc_counts_match_pandas(database, incident_date_type):
+    conn = psycopg2.connect(database)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("DROP TABLE IF EXISTS public.fir_records")
+        apply_migrations(conn, root=SUPABASE_DIR)
+        with conn.cursor() as cur:
+            cur.execute(f"ALTER TABLE public.fir_records ALTER COLUMN incident_date TYPE {incident_date_type}")
+        conn.commit()
+
+        frame = seed(conn, 5000)
+        if incident_date_type == "text":
+            with conn.cursor() as cur:
+                cur.execute("INSERT INTO public.fir_records (fir_number, incident_date, incident_type) "
+                            "VALUES ('FIR/NO-DATE', '', 'Theft'), ('FIR/UNKNOWN-DATE', 'unknown', 'Theft')")
+            conn.commit()
+
+        counts, locations, _ = rpc_counts(conn, START_DATE, END_DATE)
+        expected, expected_locations, _ = expected_counts(frame, START_DATE, END_DATE)
+        for dimension, values in expected.items():
+            assert counts.get(dimension) == values, dimension
+        assert locations == expected_locations
+
+        # Unbounded range counts every row, undated ones included
+        counts, _, _ = rpc_counts(conn, None, None)
+        assert counts['total'][None] == len(frame) + (2 if incident_date_type == "text" else 0)
+    finally:
+        conn.close()